@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='featured_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='AVIF/WebP genişlik varyantları (otomatik)', verbose_name='Görsel Varyantları'),
+        ),
+    ]
@@ -1,7 +1,13 @@
+import logging
+
 from django.db import models
 from django.utils.text import slugify
 from django.urls import reverse
 
+from website.responsive_images import process_upload
+
+logger = logging.getLogger(__name__)
+
 
 class BlogPost(models.Model):
     """Blog yazısı modeli - SEO için"""
@@ -14,9 +20,18 @@ class BlogPost(models.Model):
     meta_keywords = models.CharField('Anahtar Kelimeler', max_length=200, blank=True,
                                     help_text='Virgülle ayrılmış anahtar kelimeler')
 
+    STATUS_CHOICES = [
+        ('draft', 'Taslak'),
+        ('published', 'Yayında'),
+        ('archived', 'Arşivlendi'),
+    ]
+
     # SEO ve yayın ayarları
+    status = models.CharField('Durum', max_length=20, choices=STATUS_CHOICES, default='draft')
     is_published = models.BooleanField('Yayında', default=True)
     featured_image = models.ImageField('Öne Çıkan Görsel', upload_to='blog/', blank=True, null=True)
+    featured_image_variants = models.JSONField('Görsel Varyantları', default=dict, blank=True, editable=False,
+                                               help_text='AVIF/WebP genişlik varyantları (otomatik)')
 
     # Tarihler
     created_at = models.DateTimeField('Oluşturulma Tarihi', auto_now_add=True)
@@ -39,6 +54,23 @@ class BlogPost(models.Model):
         if not self.slug:
             self.slug = slugify(self.title, allow_unicode=True)
         super().save(*args, **kwargs)
+        self.update_image_variants()
+
+    def update_image_variants(self):
+        """Öne çıkan görsel değiştiyse responsive varyantları üret"""
+        name = self.featured_image.name if self.featured_image else ''
+        if name == (self.featured_image_variants or {}).get('fallback', ''):
+            return
+
+        try:
+            variants = process_upload(self.featured_image) if name else {}
+        except Exception as e:
+            logger.error(f"Blog görsel varyantları üretilemedi ({name}): {e}")
+            return
+
+        # save() tekrar çağrılmaz (updated_at ve sinyaller etkilenmesin)
+        BlogPost.objects.filter(pk=self.pk).update(featured_image_variants=variants)
+        self.featured_image_variants = variants
 
     def get_absolute_url(self):
         return reverse('blog:detail', kwargs={'slug': self.slug})
@@ -1,10 +1,11 @@
 from django.urls import path, re_path
+from website.http_cache import public_page
 from . import views
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.BlogListView.as_view(), name='list'),
+    path('', public_page(views.BlogListView.as_view()), name='list'),
     # Unicode slug support for Turkish characters
     re_path(r'^(?P<slug>[\w-]+)/$', views.blog_detail, name='detail'),
 ]
@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404
 from django.http import HttpResponse
 from django.views.generic import ListView
+from website.http_cache import public_page
 from .models import BlogPost
 
 
@@ -15,6 +16,7 @@ class BlogListView(ListView):
         return BlogPost.objects.filter(is_published=True).order_by('-created_at')
 
 
+@public_page
 def blog_detail(request, slug):
     """Blog yazısı detay sayfası - SEO optimize"""
     post = get_object_or_404(BlogPost, slug=slug, is_published=True)
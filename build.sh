@@ -4,8 +4,10 @@ set -o errexit
 
 pip install -r requirements.txt
 
+python manage.py build_responsive_images
 python manage.py collectstatic --no-input
 python manage.py migrate --no-input
+python manage.py build_responsive_images --uploads
 
 # Create/update superuser for ekremmozcan@gmail.com
 python manage.py shell <<EOF
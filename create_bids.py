@@ -7,7 +7,6 @@ import os
 import sys
 import django
 from datetime import timedelta
-import uuid
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nakliyenet.settings')
@@ -63,7 +62,6 @@ for i, shipment in enumerate(shipments[:6]):  # First 6 shipments
         offered_price = float(shipment.suggested_price) * price_factor
 
         bid = Bid.objects.create(
-            bid_id=str(uuid.uuid4()),
             shipment=shipment,
             tracking_number=shipment.tracking_number,
             carrier_uid=carrier.firebase_uid,
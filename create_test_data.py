@@ -12,6 +12,7 @@ django.setup()
 
 from django.contrib.auth.models import User
 from website.models import UserProfile, Shipment, Bid, Payment
+from website.tracking_numbers import next_tracking_number
 from django.utils import timezone
 from decimal import Decimal
 from datetime import timedelta
@@ -122,8 +123,7 @@ def create_stage_1_pending_payment(shipper, carrier):
     """Aşama 1: Teklif kabul edildi, ödeme bekliyor"""
 
     shipment = Shipment.objects.create(
-        shipment_id=str(uuid.uuid4()),
-        tracking_number=f'YN-2025-{uuid.uuid4().hex[:6].upper()}',
+        tracking_number=next_tracking_number(),
         shipper=shipper,
         shipper_uid=shipper.firebase_uid,
         shipper_email=shipper.user.email,
@@ -147,7 +147,6 @@ def create_stage_1_pending_payment(shipper, carrier):
     )
 
     bid = Bid.objects.create(
-        bid_id=str(uuid.uuid4()),
         shipment=shipment,
         tracking_number=shipment.tracking_number,
         carrier_uid=carrier.firebase_uid,
@@ -179,8 +178,7 @@ def create_stage_2_paid(shipper, carrier):
     """Aşama 2: Ödeme yapıldı, taşıyıcı yükü alacak"""
 
     shipment = Shipment.objects.create(
-        shipment_id=str(uuid.uuid4()),
-        tracking_number=f'YN-2025-{uuid.uuid4().hex[:6].upper()}',
+        tracking_number=next_tracking_number(),
         shipper=shipper,
         shipper_uid=shipper.firebase_uid,
         shipper_email=shipper.user.email,
@@ -204,7 +202,6 @@ def create_stage_2_paid(shipper, carrier):
     )
 
     bid = Bid.objects.create(
-        bid_id=str(uuid.uuid4()),
         shipment=shipment,
         tracking_number=shipment.tracking_number,
         carrier_uid=carrier.firebase_uid,
@@ -239,8 +236,7 @@ def create_stage_3_in_transit(shipper, carrier):
     """Aşama 3: Yük yolda, teslim bekliyor"""
 
     shipment = Shipment.objects.create(
-        shipment_id=str(uuid.uuid4()),
-        tracking_number=f'YN-2025-{uuid.uuid4().hex[:6].upper()}',
+        tracking_number=next_tracking_number(),
         shipper=shipper,
         shipper_uid=shipper.firebase_uid,
         shipper_email=shipper.user.email,
@@ -263,7 +259,6 @@ def create_stage_3_in_transit(shipper, carrier):
     )
 
     bid = Bid.objects.create(
-        bid_id=str(uuid.uuid4()),
         shipment=shipment,
         tracking_number=shipment.tracking_number,
         carrier_uid=carrier.firebase_uid,
@@ -300,8 +295,7 @@ def create_stage_4_delivered(shipper, carrier):
     """Aşama 4: Her iki taraf onayladı, admin transfer edecek"""
 
     shipment = Shipment.objects.create(
-        shipment_id=str(uuid.uuid4()),
-        tracking_number=f'YN-2025-{uuid.uuid4().hex[:6].upper()}',
+        tracking_number=next_tracking_number(),
         shipper=shipper,
         shipper_uid=shipper.firebase_uid,
         shipper_email=shipper.user.email,
@@ -326,7 +320,6 @@ def create_stage_4_delivered(shipper, carrier):
     )
 
     bid = Bid.objects.create(
-        bid_id=str(uuid.uuid4()),
         shipment=shipment,
         tracking_number=shipment.tracking_number,
         carrier_uid=carrier.firebase_uid,
@@ -375,8 +368,7 @@ def create_stage_5_completed(shipper, carrier):
         )
 
     shipment = Shipment.objects.create(
-        shipment_id=str(uuid.uuid4()),
-        tracking_number=f'YN-2025-{uuid.uuid4().hex[:6].upper()}',
+        tracking_number=next_tracking_number(),
         shipper=shipper,
         shipper_uid=shipper.firebase_uid,
         shipper_email=shipper.user.email,
@@ -401,7 +393,6 @@ def create_stage_5_completed(shipper, carrier):
     )
 
     bid = Bid.objects.create(
-        bid_id=str(uuid.uuid4()),
         shipment=shipment,
         tracking_number=shipment.tracking_number,
         carrier_uid=carrier.firebase_uid,
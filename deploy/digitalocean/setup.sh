@@ -58,8 +58,8 @@ DEBUG=False
 SECRET_KEY=your-secret-key-here
 ALLOWED_HOSTS=nakliyenet.com,www.nakliyenet.com,206.81.16.220
 
-# Database (using SQLite for now)
-DATABASE_URL=sqlite:///db.sqlite3
+# Database: PostgreSQL (db) behind pgbouncer, see docker-compose.yml
+DB_PASSWORD=change-me
 
 # Firebase Credentials (Base64 encoded)
 FIREBASE_CREDENTIALS_BASE64=your-base64-credentials-here
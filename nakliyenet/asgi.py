@@ -0,0 +1,27 @@
+"""
+ASGI config for nakliyenet project.
+
+Async view'lar (ör. Google OAuth callback) dış HTTP çağrılarını beklerken
+worker thread'i bloklamaz. Sync view'lar Django tarafından thread'lerde
+çalıştırılır.
+
+Çalıştırma:
+    gunicorn nakliyenet.asgi:application -k uvicorn.workers.UvicornWorker --workers 2
+
+Sadece veritabanı önünde bağlantı havuzu (pgbouncer) olan kurulumlarda
+kullanın (deploy/digitalocean/docker-compose.yml). Havuz olmayan yerlerde
+(Render/Heroku, Procfile) WSGI + gthread ve DB_CONN_MAX_AGE ile kalıcı
+bağlantılar kullanılır.
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nakliyenet.settings')
+
+# ASGI'de sync kod istek başına farklı thread'lerde çalışır; thread'e bağlı
+# kalıcı bağlantılar birikir. Havuzu pgbouncer tutar; DB_CONN_MAX_AGE ortam
+# değişkeni ile yine de değiştirilebilir.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+application = get_asgi_application()
@@ -4,7 +4,7 @@ Django settings for nakliyenet project.
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
@@ -35,7 +35,7 @@ INSTALLED_APPS = [
     'django_filters',
     'corsheaders',
     'allauth',
-    'allauth.account',
+    'website.apps.AllauthAccountConfig',  # allauth.account (ASGI uyumlu middleware kontrolü)
     'allauth.socialaccount',
     'allauth.socialaccount.providers.google',
 
@@ -49,15 +49,18 @@ SITE_ID = 1
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files
+    'website.middleware.WhiteNoiseMiddleware',  # Serve static files (ASGI uyumlu)
+    'website.http_cache.CompressionMiddleware',  # HTML/JSON için Brotli/gzip
+    'website.http_cache.CachePolicyMiddleware',  # View bazlı Cache-Control/Vary
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS for API
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'website.user_cache.CachedAuthenticationMiddleware',  # User + profil tek sorgu, önbellekli
+    'website.db_routers.ReplicaRoutingMiddleware',  # Read replica routing
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'allauth.account.middleware.AccountMiddleware',
+    'website.middleware.AccountMiddleware',  # allauth (ASGI uyumlu)
 ]
 
 ROOT_URLCONF = 'nakliyenet.urls'
@@ -80,6 +83,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'nakliyenet.wsgi.application'
+ASGI_APPLICATION = 'nakliyenet.asgi.application'
 
 # Database - SQLite for local development, PostgreSQL for production
 DATABASES = {
@@ -90,9 +94,67 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        # Kalıcı bağlantılar: gthread worker'ındaki her thread bağlantısını
+        # DB_CONN_MAX_AGE saniye boyunca yeniden kullanır (0 = her istekte yeni bağlantı)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        # Yeniden kullanmadan önce bağlantı canlı mı kontrol et (DB restart / idle timeout)
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        # pgbouncer transaction pooling arkasında True olmalı (deploy/digitalocean).
+        # Bu durumda iterator() tüm sonucu belleğe alır; büyük okumalar website.keyset kullanır.
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
     }
 }
 
+# Admin changelist'lerinde bu satır sayısının üstündeki filtresiz tablolar
+# için COUNT(*) yerine planner tahmini gösterilir (website.admin_tables)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+
+# Read replicas - virgülle ayrılmış liste (PostgreSQL: host[:port], SQLite: dosya yolu)
+# Örnek: DB_REPLICAS=replica1.internal,replica2.internal:5433
+# Lokal test: DB_REPLICAS=db_replica.sqlite3 (db.sqlite3 dosyasının kopyası)
+for _index, _replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    _settings = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if _settings['ENGINE'].endswith('sqlite3'):
+        _settings['NAME'] = _replica
+    else:
+        _settings['HOST'], _, _port = _replica.partition(':')
+        _settings['PORT'] = _port or _settings['PORT']
+    DATABASES[f'replica{_index}'] = _settings
+
+DATABASE_ROUTERS = ['website.db_routers.ReadReplicaRouter']
+
+# Yazma yapan kullanıcı bu süre boyunca primary'den okur (replica gecikmesine karşı)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Cache - Redis (tüm worker'lar arasında paylaşılır) veya süreç içi bellek
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Önbellekli User + profil süresi (saniye). LocMem'de invalidation sadece
+# kaydı yapan worker'da olur, bu yüzden diğer worker'lar için süre kısa tutulur.
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=300 if REDIS_URL else 30, cast=int)
+
+# Sessions - Redis varsa cache'ten okunur, değişiklikler DB'ye de yazılır.
+# LocMem worker'lar arası paylaşılmadığı için (logout diğer worker'da
+# görünmez) Redis yoksa veritabanı engine'i kullanılır.
+SESSION_ENGINE = 'website.session_store' if REDIS_URL else 'django.contrib.sessions.backends.db'
+# Kayan süre: her istek oturum süresini uzatır; website.session_store
+# değişmeyen oturumu sadece kalan süre SESSION_TOUCH_THRESHOLD altına inince yazar
+SESSION_SAVE_EVERY_REQUEST = config('SESSION_SAVE_EVERY_REQUEST', default=bool(REDIS_URL), cast=bool)
+SESSION_TOUCH_THRESHOLD = config('SESSION_TOUCH_THRESHOLD', default=60 * 60 * 24 * 7, cast=int)  # 1 hafta
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',  # Django default
@@ -160,6 +222,8 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
 # WhiteNoise configuration
+# collectstatic her dosyanın .gz ve (Brotli kuruluysa) .br kopyasını üretir;
+# WhiteNoise Accept-Encoding'e göre uygun olanı sunar
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # WhiteNoise cache optimization (1 year cache for static files)
@@ -168,10 +232,61 @@ WHITENOISE_MAX_AGE = 31536000  # 1 year in seconds
 # Immutable files (with content hash in filename) get forever cache
 WHITENOISE_IMMUTABLE_FILE_TEST = lambda path, url: True
 
+# HTML önbellek politikası (website.http_cache.public_page ile işaretli sayfalar)
+# Tarayıcı max-age, CDN/proxy s-maxage saniye saklar; giriş yapmış kullanıcıya private
+PUBLIC_PAGE_MAX_AGE = config('PUBLIC_PAGE_MAX_AGE', default=60, cast=int)
+PUBLIC_PAGE_S_MAXAGE = config('PUBLIC_PAGE_S_MAXAGE', default=300, cast=int)
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
+# Kimlik belgeleri ve teslimat kanıtları (website.private_media) - /media/ dışında,
+# web sunucusu bu dizini sunmaz; dosyalar sadece yetki kontrollü görünümlerden okunur
+PRIVATE_MEDIA_ROOT = config('PRIVATE_MEDIA_ROOT', default=str(BASE_DIR / 'privatefiles'))
+
+# Taşıyıcı ödeme partileri - banka dosyasındaki borçlu (platform) hesabı
+PAYOUT_DEBTOR_NAME = config('PAYOUT_DEBTOR_NAME', default='NAKLIYE NET')
+PAYOUT_DEBTOR_IBAN = config('PAYOUT_DEBTOR_IBAN', default='')
+
+# Sanal POS bildirimleri (website.payment_webhooks) - anahtarı boş sağlayıcının bildirimleri reddedilir
+IYZICO_SECRET_KEY = config('IYZICO_SECRET_KEY', default='')
+PAYTR_MERCHANT_KEY = config('PAYTR_MERCHANT_KEY', default='')
+PAYTR_MERCHANT_SALT = config('PAYTR_MERCHANT_SALT', default='')
+# Bildirimleri işleyen arka plan thread sayısı ve komutla tekrar deneme sınırı
+PAYMENT_WEBHOOK_WORKERS = config('PAYMENT_WEBHOOK_WORKERS', default=4, cast=int)
+PAYMENT_WEBHOOK_MAX_ATTEMPTS = config('PAYMENT_WEBHOOK_MAX_ATTEMPTS', default=5, cast=int)
+# True: olay istek içinde işlenir (test / simülatör)
+PAYMENT_WEBHOOK_INLINE = config('PAYMENT_WEBHOOK_INLINE', default=False, cast=bool)
+
+# Dashboard özet tabloları (website.rollups, refresh_rollups komutu)
+# Son ROLLUP_LAG_SECONDS saniyedeki satırlar bir sonraki çalıştırmaya bırakılır
+ROLLUP_LAG_SECONDS = config('ROLLUP_LAG_SECONDS', default=120, cast=int)
+# İlk hesaplamada geçmiş bu kadar günlük pencerelerle işlenir
+ROLLUP_WINDOW_DAYS = config('ROLLUP_WINDOW_DAYS', default=7, cast=int)
+# Özetler bundan eskiyse (cron yok/durmuş) dashboard sayıları canlı sorgudan gelir
+ROLLUP_STALE_SECONDS = config('ROLLUP_STALE_SECONDS', default=3600, cast=int)
+
+# Güzergah fiyat endeksi (website.pricing, refresh_price_index komutu)
+# Eski fiyatların ağırlığı bu kadar günde yarıya iner
+PRICE_INDEX_HALF_LIFE_DAYS = config('PRICE_INDEX_HALF_LIFE_DAYS', default=180, cast=float)
+# Öneri için gereken en az gözlem; azsa bir üst seviyeye (tüm ağırlıklar / yük tipleri) bakılır
+PRICE_INDEX_MIN_SAMPLES = config('PRICE_INDEX_MIN_SAMPLES', default=5, cast=int)
+PRICE_SUGGESTION_CACHE_SECONDS = config('PRICE_SUGGESTION_CACHE_SECONDS', default=600, cast=int)
+
+# Güzergah sayfaları (website.route_stats, refresh_route_stats komutu)
+# İstatistikler son ROUTE_STATS_DAYS gündeki ilanlardan hesaplanır
+ROUTE_STATS_DAYS = config('ROUTE_STATS_DAYS', default=365, cast=int)
+# Önceden oluşturulan sayfa içeriğinin cache süresi; refresh değişen güzergahları yeniler
+ROUTE_PAGE_CACHE_SECONDS = config('ROUTE_PAGE_CACHE_SECONDS', default=60 * 60 * 24, cast=int)
+
+# Küçük resim servisi sadece bu hostlardan (https) kaynak indirir
+THUMBNAIL_ALLOWED_HOSTS = config(
+    'THUMBNAIL_ALLOWED_HOSTS',
+    default='firebasestorage.googleapis.com,storage.googleapis.com',
+    cast=Csv(),
+)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -7,13 +7,16 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.sitemaps.views import sitemap
 from django.views.generic import TemplateView
-from website.sitemaps import ShipmentSitemap, StaticViewSitemap, CitySitemap, BlogSitemap
+from website.sitemaps import ShipmentSitemap, StaticViewSitemap, CitySitemap, RouteSitemap, BlogSitemap
 from website.admin import admin_site  # Import custom admin site
+from website.db_routers import read_replica
+from website.http_cache import public_page
 
 sitemaps = {
     'shipments': ShipmentSitemap,
     'static': StaticViewSitemap,
     'cities': CitySitemap,  # Şehir sayfaları için
+    'routes': RouteSitemap,  # Güzergah sayfaları için
     'blog': BlogSitemap,  # Blog yazıları için
 }
 
@@ -23,8 +26,8 @@ urlpatterns = [
     path('api-auth/', include('rest_framework.urls')),  # DRF login/logout
     path('accounts/', include('allauth.urls')),  # Google OAuth endpoints
     path('blog/', include('blog.urls')),  # Blog app
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
-    path('robots.txt', TemplateView.as_view(template_name='robots.txt', content_type='text/plain'), name='robots'),
+    path('sitemap.xml', public_page(read_replica(sitemap), max_age=3600), {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('robots.txt', public_page(TemplateView.as_view(template_name='robots.txt', content_type='text/plain'), max_age=86400), name='robots'),
     path('', include('website.urls')),
 ]
 
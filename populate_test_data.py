@@ -7,7 +7,6 @@ import os
 import sys
 import django
 from datetime import datetime, timedelta
-import uuid
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nakliyenet.settings')
@@ -15,6 +14,7 @@ django.setup()
 
 from django.contrib.auth.models import User
 from website.models import UserProfile, Shipment, Bid, ShipmentTracking, DeliveryProof, Review
+from website.tracking_numbers import next_tracking_number
 from django.utils import timezone
 from decimal import Decimal
 
@@ -151,16 +151,14 @@ def create_test_shipments():
     for i, data in enumerate(shipments_data):
         shipper = shippers[i % len(shippers)]
 
-        shipment_id = str(uuid.uuid4())
-        tracking_number = f'YN-2025-TEST{str(i+2).zfill(2)}'
-
         # Check if already exists
-        if Shipment.objects.filter(tracking_number=tracking_number).exists():
-            print(f'Skipping {tracking_number} - already exists')
+        if Shipment.objects.filter(shipper=shipper, title=data['title']).exists():
+            print(f'Skipping {data["title"]} - already exists')
             continue
 
+        tracking_number = next_tracking_number()
+
         shipment = Shipment.objects.create(
-            shipment_id=shipment_id,
             tracking_number=tracking_number,
             shipper=shipper,
             shipper_email=shipper.user.email or f'{shipper.user.username}@test.com',
@@ -222,7 +220,6 @@ def create_test_bids():
             offered_price = int(shipment.suggested_price * price_factor)
 
             bid = Bid.objects.create(
-                bid_id=str(uuid.uuid4()),
                 shipment=shipment,
                 tracking_number=shipment.tracking_number,
                 carrier=carrier,
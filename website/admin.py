@@ -3,14 +3,25 @@ Django Admin Configuration for NAKLIYE NET
 Admin panel for document verification, shipment approvals, and monitoring
 """
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils.html import format_html
 from django.utils import timezone
-from django.urls import reverse
-from django.db.models import Count, Q
+from django.urls import path, reverse
+from django.db.models import Count, F, Max, Min, Q
+from django.db import transaction
 from .models import (
     UserDocument, AdminActivity, UserProfile, Bid,
-    Vehicle, Shipment, Payment
+    Vehicle, Shipment, Payment, ShipmentImport, PayoutBatch,
+    LedgerAccount, JournalEntry, LedgerLine, PaymentWebhookEvent, refresh_document_summaries,
 )
+from .admin_tables import LargeTableAdminMixin
+from .exports import stream_csv
+from .payment_webhooks import process_event
+from .payouts import create_payout_batch, eligible_payments
+from .private_media import file_url
+from .thumbnails import thumbnail_url
 
 
 @admin.register(UserDocument)
@@ -25,6 +36,7 @@ class UserDocumentAdmin(admin.ModelAdmin):
         'verified_by',
         'document_preview'
     ]
+    list_select_related = ['verified_by']
 
     list_filter = [
         'status',
@@ -96,58 +108,30 @@ class UserDocumentAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Durum'
 
     def document_preview(self, obj):
-        """Show preview link"""
+        """Show small thumbnail linking to the original"""
+        if not obj.document_url:
+            return '-'
         return format_html(
-            '<a href="{}" target="_blank" style="color: #3498db;">Görüntüle</a>',
-            obj.document_url
+            '<a href="{}" target="_blank"><img src="{}" loading="lazy" style="height: 48px; border-radius: 3px;" alt="Görüntüle"/></a>',
+            file_url(obj),
+            thumbnail_url(obj, 'sm')
         )
     document_preview.short_description = 'Belge'
 
     def document_image_preview(self, obj):
-        """Show full image preview in detail view"""
+        """Show large thumbnail in detail view, linking to the original"""
         if obj.document_url:
             return format_html(
-                '<img src="{}" style="max-width: 600px; max-height: 800px; border: 1px solid #ddd; border-radius: 4px; padding: 5px;"/>',
-                obj.document_url
+                '<a href="{}" target="_blank"><img src="{}" style="max-width: 600px; max-height: 800px; border: 1px solid #ddd; border-radius: 4px; padding: 5px;"/></a>',
+                file_url(obj),
+                thumbnail_url(obj, 'lg')
             )
         return "Belge yok"
     document_image_preview.short_description = 'Belge Önizleme'
 
     def approve_documents(self, request, queryset):
         """Bulk approve documents"""
-        from website.models import UserProfile
-        count = 0
-        updated_profiles = set()
-
-        for doc in queryset.filter(status='pending'):
-            doc.status = 'approved'
-            doc.verified_at = timezone.now()
-            doc.verified_by = request.user
-            doc.save()
-
-            # Log activity
-            AdminActivity.objects.create(
-                admin_user=request.user,
-                action_type='document_approved',
-                target_type='document',
-                target_id=str(doc.id),
-                description=f"{doc.get_document_type_display()} onaylandı - {doc.user_email}",
-                ip_address=self.get_client_ip(request)
-            )
-            count += 1
-
-            # Check if all documents are approved for this user
-            try:
-                user = User.objects.get(email=doc.user_email)
-                profile = user.profile
-
-                # Check if all required documents are approved
-                if profile.check_documents_verified():
-                    profile.documents_verified = True
-                    profile.save()
-                    updated_profiles.add(doc.user_email)
-            except (User.DoesNotExist, UserProfile.DoesNotExist):
-                pass
+        count, updated_profiles = self._bulk_verify(request, queryset, 'approved')
 
         message = f"✅ {count} belge başarıyla onaylandı!"
         if updated_profiles:
@@ -157,27 +141,60 @@ class UserDocumentAdmin(admin.ModelAdmin):
 
     def reject_documents(self, request, queryset):
         """Bulk reject documents"""
-        count = 0
-        for doc in queryset.filter(status='pending'):
-            doc.status = 'rejected'
-            doc.verified_at = timezone.now()
-            doc.verified_by = request.user
-            doc.save()
-
-            # Log activity
-            AdminActivity.objects.create(
-                admin_user=request.user,
-                action_type='document_rejected',
-                target_type='document',
-                target_id=str(doc.id),
-                description=f"{doc.get_document_type_display()} reddedildi - {doc.user_email}",
-                ip_address=self.get_client_ip(request)
-            )
-            count += 1
-
+        count, _ = self._bulk_verify(request, queryset, 'rejected')
         self.message_user(request, f"❌ {count} belge reddedildi.", level='warning')
     reject_documents.short_description = "❌ Seçili belgeleri REDDET"
 
+    def _bulk_verify(self, request, queryset, new_status):
+        """
+        Bekleyen belgeleri tek UPDATE ile onayla/reddet, aktivite kayıtlarını
+        bulk_create ile yaz ve etkilenen profilleri toplu yeniden hesapla.
+        (belge sayısı, yeni doğrulanan profiller) döndürür.
+        """
+        now = timezone.now()
+        ip_address = self.get_client_ip(request)
+        type_labels = dict(UserDocument.DOCUMENT_TYPES)
+        action_type, verb = (
+            ('document_approved', 'onaylandı') if new_status == 'approved' else ('document_rejected', 'reddedildi')
+        )
+
+        with transaction.atomic():
+            # Satırları kilitle; eşzamanlı aynı aksiyon iki kez log yazmasın
+            docs = list(
+                queryset.filter(status='pending')
+                .select_for_update()
+                .values_list('id', 'document_type', 'user_email')
+            )
+            if not docs:
+                return 0, []
+
+            UserDocument.objects.filter(id__in=[doc_id for doc_id, _, _ in docs]).update(
+                status=new_status,
+                verified_at=now,
+                verified_by=request.user,
+            )
+
+            AdminActivity.objects.bulk_create([
+                AdminActivity(
+                    admin_user=request.user,
+                    action_type=action_type,
+                    target_type='document',
+                    target_id=str(doc_id),
+                    description=f"{type_labels.get(document_type, document_type)} {verb} - {user_email}",
+                    timestamp=now,
+                    ip_address=ip_address,
+                )
+                for doc_id, document_type, user_email in docs
+            ], batch_size=500)
+
+            # update() signal göndermez; profilleri tek GROUP BY ile güncelle
+            updated_profiles = refresh_document_summaries(
+                {user_email for _, _, user_email in docs},
+                mark_verified=new_status == 'approved',
+            )
+
+        return len(docs), updated_profiles
+
     def get_client_ip(self, request):
         """Get client IP address"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -210,7 +227,7 @@ class UserDocumentAdmin(admin.ModelAdmin):
 
 
 @admin.register(AdminActivity)
-class AdminActivityAdmin(admin.ModelAdmin):
+class AdminActivityAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for activity log"""
 
     list_display = [
@@ -221,6 +238,7 @@ class AdminActivityAdmin(admin.ModelAdmin):
         'target_type',
         'ip_address',
     ]
+    list_select_related = ['admin_user']
 
     list_filter = [
         'action_type',
@@ -235,6 +253,10 @@ class AdminActivityAdmin(admin.ModelAdmin):
         'admin_user__username',
         'admin_user__email',
     ]
+    exact_search_fields = {
+        'email': ['admin_user__email__iexact'],
+        'uuid': ['target_id'],
+    }
 
     readonly_fields = [
         'admin_user',
@@ -279,7 +301,7 @@ class AdminActivityAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for user profiles"""
 
     list_display = [
@@ -289,8 +311,11 @@ class UserProfileAdmin(admin.ModelAdmin):
         'iban_masked',
         'profile_status',
         'documents_status',
+        'document_count_display',
+        'approved_document_count_display',
         'created_at',
     ]
+    list_select_related = ['user']
 
     list_filter = [
         'profile_completed',
@@ -303,6 +328,9 @@ class UserProfileAdmin(admin.ModelAdmin):
         'user__username',
         'phone_number',
     ]
+    exact_search_fields = {
+        'email': ['user__email__iexact'],
+    }
 
     readonly_fields = [
         'created_at',
@@ -457,7 +485,7 @@ class BidInline(admin.StackedInline):
 
 
 @admin.register(Shipment)
-class ShipmentAdmin(admin.ModelAdmin):
+class ShipmentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Comprehensive admin interface for shipments"""
 
     list_display = [
@@ -472,6 +500,7 @@ class ShipmentAdmin(admin.ModelAdmin):
         'view_count',
         'created_at',
     ]
+    list_select_related = ['shipper__user']
 
     list_filter = [
         'status',
@@ -491,6 +520,11 @@ class ShipmentAdmin(admin.ModelAdmin):
         'from_address_city',
         'to_address_city',
     ]
+    exact_search_fields = {
+        'tracking_number': ['tracking_number'],
+        'email': ['shipper_email__iexact'],
+        'uuid': ['pk'],
+    }
 
     readonly_fields = [
         'shipment_id',
@@ -571,7 +605,7 @@ class ShipmentAdmin(admin.ModelAdmin):
 
     inlines = [BidInline]
 
-    actions = ['mark_as_active', 'mark_as_assigned', 'mark_as_completed', 'mark_as_cancelled']
+    actions = ['mark_as_active', 'mark_as_assigned', 'mark_as_completed', 'mark_as_cancelled', 'export_csv']
 
     def title_short(self, obj):
         """Show shortened title"""
@@ -656,31 +690,30 @@ class ShipmentAdmin(admin.ModelAdmin):
 
     def bid_summary(self, obj):
         """Show detailed bid summary"""
-        bids = obj.bids.all()
-        if not bids:
+        # Sayılar ve fiyat aralığı tek aggregate sorgusuyla
+        summary = obj.bids.aggregate(
+            total=Count('pk'),
+            pending=Count('pk', filter=Q(status='pending')),
+            accepted=Count('pk', filter=Q(status='accepted')),
+            rejected=Count('pk', filter=Q(status='rejected')),
+            min_price=Min('offered_price'),
+            max_price=Max('offered_price'),
+        )
+        if not summary['total']:
             return "Henüz teklif yok"
 
-        pending = bids.filter(status='pending').count()
-        accepted = bids.filter(status='accepted').count()
-        rejected = bids.filter(status='rejected').count()
-
-        # Get price range
-        prices = [bid.offered_price for bid in bids]
-        min_price = min(prices)
-        max_price = max(prices)
-
         return format_html(
             '<strong>Toplam:</strong> {} teklif<br>'
             '<strong>Beklemede:</strong> {} | '
             '<strong>Kabul:</strong> {} | '
             '<strong>Red:</strong> {}<br>'
             '<strong>Fiyat Aralığı:</strong> {} ₺ - {} ₺',
-            len(bids),
-            pending,
-            accepted,
-            rejected,
-            min_price,
-            max_price
+            summary['total'],
+            summary['pending'],
+            summary['accepted'],
+            summary['rejected'],
+            summary['min_price'],
+            summary['max_price']
         )
     bid_summary.short_description = 'Teklif Özeti'
 
@@ -708,9 +741,14 @@ class ShipmentAdmin(admin.ModelAdmin):
         self.message_user(request, f"❌ {count} ilan iptal edildi!", 'warning')
     mark_as_cancelled.short_description = "❌ İptal edildi olarak işaretle"
 
+    def export_csv(self, request, queryset):
+        """Export selected shipments as streaming CSV"""
+        return stream_csv(queryset, 'shipments')
+    export_csv.short_description = "📥 CSV olarak dışa aktar"
+
 
 @admin.register(Bid)
-class BidAdmin(admin.ModelAdmin):
+class BidAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for bids/offers"""
 
     list_display = [
@@ -735,6 +773,11 @@ class BidAdmin(admin.ModelAdmin):
         'shipper_email',
         'bid_id',
     ]
+    exact_search_fields = {
+        'tracking_number': ['tracking_number'],
+        'email': ['carrier_email__iexact', 'shipper_email__iexact'],
+        'uuid': ['pk', 'shipment_id'],
+    }
 
     readonly_fields = [
         'bid_id',
@@ -748,7 +791,7 @@ class BidAdmin(admin.ModelAdmin):
         'updated_at',
     ]
 
-    actions = ['accept_bids', 'reject_bids']
+    actions = ['accept_bids', 'reject_bids', 'export_csv']
 
     fieldsets = (
         ('Teklif Bilgileri', {
@@ -805,6 +848,11 @@ class BidAdmin(admin.ModelAdmin):
         self.message_user(request, f"❌ {count} teklif reddedildi!", 'warning')
     reject_bids.short_description = "❌ Seçili teklifleri REDDET"
 
+    def export_csv(self, request, queryset):
+        """Export selected bids as streaming CSV"""
+        return stream_csv(queryset, 'bids')
+    export_csv.short_description = "📥 CSV olarak dışa aktar"
+
 
 @admin.register(Vehicle)
 class VehicleAdmin(admin.ModelAdmin):
@@ -819,6 +867,7 @@ class VehicleAdmin(admin.ModelAdmin):
         'is_active',
         'created_at',
     ]
+    list_select_related = ['carrier_profile__user']
 
     list_filter = [
         'vehicle_type',
@@ -918,7 +967,7 @@ class VehicleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for payment management and transfers"""
 
     list_display = [
@@ -932,6 +981,7 @@ class PaymentAdmin(admin.ModelAdmin):
         'admin_transferred',
         'created_at',
     ]
+    list_select_related = ['shipper__user', 'carrier__user']
 
     list_filter = [
         'status',
@@ -949,6 +999,11 @@ class PaymentAdmin(admin.ModelAdmin):
         'carrier__user__email',
         'transaction_id',
     ]
+    exact_search_fields = {
+        'tracking_number': ['shipment__tracking_number'],
+        'email': ['shipper__user__email__iexact', 'carrier__user__email__iexact'],
+        'uuid': ['pk', 'shipment_id', 'bid_id'],
+    }
 
     readonly_fields = [
         'payment_id',
@@ -1026,20 +1081,26 @@ class PaymentAdmin(admin.ModelAdmin):
         }),
     )
 
-    actions = ['transfer_to_carrier']
+    actions = ['transfer_to_carrier', 'transfer_to_carrier_xml', 'export_csv']
+
+    def get_queryset(self, request):
+        # Takip no için shipment satırının tamamını join'lemek yerine tek kolon
+        return super().get_queryset(request).annotate(
+            shipment_tracking_number=F('shipment__tracking_number'),
+        )
 
     def payment_id_short(self, obj):
         """Display short payment ID"""
-        return obj.payment_id[:13] + '...'
+        return str(obj.payment_id)[:13] + '...'
     payment_id_short.short_description = 'Ödeme ID'
 
     def tracking_number_link(self, obj):
         """Display tracking number with link to shipment"""
-        url = reverse('admin:website_shipment_change', args=[obj.shipment.shipment_id])
+        url = reverse('admin:website_shipment_change', args=[obj.shipment_id])
         return format_html(
             '<a href="{}" style="color: #3498db; font-weight: bold;">{}</a>',
             url,
-            obj.shipment.tracking_number
+            obj.shipment_tracking_number
         )
     tracking_number_link.short_description = 'Takip No'
 
@@ -1143,55 +1204,59 @@ class PaymentAdmin(admin.ModelAdmin):
     delivery_confirmation_display.short_description = 'Teslim Onay Özeti'
 
     def transfer_to_carrier(self, request, queryset):
-        """Admin action to transfer money to carrier"""
-        count = 0
-        errors = []
-
-        for payment in queryset:
-            if payment.can_transfer_to_carrier():
-                payment.status = 'completed'
-                payment.admin_transferred = True
-                payment.admin_transferred_by = request.user
-                payment.admin_transferred_at = timezone.now()
-                payment.completed_at = timezone.now()
-                payment.save()
-                count += 1
-
-                # Log activity
-                AdminActivity.objects.create(
-                    admin_user=request.user,
-                    action_type='document_approved',  # TODO: Add payment_transferred type
-                    target_type='payment',
-                    target_id=payment.payment_id,
-                    description=f"Ödeme taşıyıcıya transfer edildi - {payment.carrier_amount} ₺ - {payment.carrier.user.email}",
-                    ip_address=self.get_client_ip(request)
-                )
-            else:
-                reason = []
-                if payment.status != 'delivered':
-                    reason.append(f"Durum 'Teslim Edildi' değil ({payment.get_status_display()})")
-                if not payment.is_delivery_confirmed():
-                    reason.append("Her iki taraf teslim onayı vermemiş")
-                if payment.admin_transferred:
-                    reason.append("Zaten transfer edilmiş")
-
-                errors.append(f"{payment.payment_id[:8]}: {', '.join(reason)}")
+        """Admin action to transfer money to carriers (CSV bank file)"""
+        self._create_payout_batch(request, queryset, 'csv')
+    transfer_to_carrier.short_description = "💰 Seçili ödemeleri taşıyıcıya transfer et (CSV)"
+
+    def transfer_to_carrier_xml(self, request, queryset):
+        """Admin action to transfer money to carriers (pain.001 XML bank file)"""
+        self._create_payout_batch(request, queryset, 'xml')
+    transfer_to_carrier_xml.short_description = "💰 Seçili ödemeleri taşıyıcıya transfer et (XML)"
+
+    def _create_payout_batch(self, request, queryset, file_format):
+        """Uygun ödemeleri tek partide transfer et, uygun olmayanları raporla"""
+        selected = queryset.count()
+        result = create_payout_batch(
+            request.user, queryset, file_format=file_format, ip_address=self.get_client_ip(request),
+        )
+        batch = result.batch
 
-        if count > 0:
+        if batch:
+            url = reverse('admin:website_payoutbatch_download', args=[batch.pk])
             self.message_user(
                 request,
-                f"✅ {count} ödeme taşıyıcıya başarıyla transfer edildi! ({count * list(queryset)[0].carrier_amount if count == 1 else 'toplam'} ₺)",
+                format_html(
+                    '✅ {} ödeme taşıyıcıya transfer edildi ({} IBAN, toplam {} ₺). '
+                    '<a href="{}">Banka dosyasını indir ({})</a>',
+                    batch.payment_count, batch.transfer_count, batch.total_amount, url, batch.file_name,
+                ),
                 'success'
             )
 
-        if errors:
-            error_msg = "Bazı ödemeler transfer edilemedi:<br>" + "<br>".join(errors)
-            self.message_user(request, format_html(error_msg), 'warning')
+        if result.skipped_no_iban:
+            self.message_user(
+                request,
+                f"⚠️ IBAN bilgisi olmayan taşıyıcıların ödemeleri atlandı: {', '.join(result.skipped_no_iban)}",
+                'warning'
+            )
 
-        if count == 0 and not errors:
+        # Partiden sonra hâlâ uygun görünenler IBAN'ı eksik olanlardır
+        not_eligible = selected - (batch.payment_count if batch else 0) - eligible_payments(queryset).count()
+        if not_eligible > 0:
+            self.message_user(
+                request,
+                f"{not_eligible} ödeme transfer edilemedi: durum 'Teslim Edildi' değil, "
+                f"her iki taraf teslim onayı vermemiş veya zaten transfer edilmiş.",
+                'warning'
+            )
+
+        if not batch and not result.skipped_no_iban and not_eligible <= 0:
             self.message_user(request, "Hiçbir ödeme transfer edilemedi. Lütfen ödeme durumunu kontrol edin.", 'error')
 
-    transfer_to_carrier.short_description = "💰 Seçili ödemeleri taşıyıcıya transfer et"
+    def export_csv(self, request, queryset):
+        """Export selected payments as streaming CSV"""
+        return stream_csv(queryset, 'payments')
+    export_csv.short_description = "📥 CSV olarak dışa aktar"
 
     def get_client_ip(self, request):
         """Get client IP address"""
@@ -1203,10 +1268,171 @@ class PaymentAdmin(admin.ModelAdmin):
         return ip
 
 
+@admin.register(ShipmentImport)
+class ShipmentImportAdmin(admin.ModelAdmin):
+    """Shipment Import Admin - Toplu ilan yükleme geçmişi"""
+    list_display = [
+        'file_name',
+        'shipper',
+        'status',
+        'total_rows',
+        'created_count',
+        'error_count',
+        'created_at',
+        'finished_at',
+    ]
+
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name', 'shipper__user__email']
+    list_select_related = ['shipper__user']
+    readonly_fields = [
+        'shipper', 'file_name', 'status', 'total_rows', 'created_count',
+        'error_count', 'error_report', 'error_message', 'created_at', 'finished_at',
+    ]
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(PayoutBatch)
+class PayoutBatchAdmin(admin.ModelAdmin):
+    """Payout Batch Admin - Taşıyıcı ödeme partileri ve banka dosyaları"""
+    list_display = [
+        'reference',
+        'created_at',
+        'created_by',
+        'payment_count',
+        'transfer_count',
+        'total_amount',
+        'file_format',
+        'download_link',
+    ]
+
+    list_filter = ['file_format', 'created_at']
+    search_fields = ['=reference']
+    list_select_related = ['created_by']
+    readonly_fields = [
+        'reference', 'created_by', 'created_at', 'payment_count', 'transfer_count',
+        'total_amount', 'file_format', 'file_name', 'download_link',
+    ]
+    exclude = ['file_content']
+    date_hierarchy = 'created_at'
+
+    def get_queryset(self, request):
+        # Dosya içeriği listede gereksiz ve büyük olabilir
+        return super().get_queryset(request).defer('file_content')
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:batch_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='website_payoutbatch_download',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, batch_id):
+        """Banka dosyasını indir (sadece parti görme yetkisi olan adminler)"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        batch = get_object_or_404(PayoutBatch, pk=batch_id)
+        content_type = 'application/xml' if batch.file_format == 'xml' else 'text/csv'
+        response = HttpResponse(batch.file_content, content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{batch.file_name}"'
+        return response
+
+    def download_link(self, obj):
+        """Link to download the bank file"""
+        url = reverse('admin:website_payoutbatch_download', args=[obj.pk])
+        return format_html('<a href="{}">📥 {}</a>', url, obj.file_name)
+    download_link.short_description = 'Banka Dosyası'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class ReadOnlyLedgerMixin:
+    """Defter sadece ledger.post_entry ile yazılır; admin'den değiştirilemez"""
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LedgerAccount)
+class LedgerAccountAdmin(ReadOnlyLedgerMixin, admin.ModelAdmin):
+    """Ledger Account Admin - Önceden hesaplanmış hesap bakiyeleri"""
+    list_display = ['code', 'name', 'account_type', 'parent', 'balance', 'debit_total', 'credit_total', 'updated_at']
+    list_filter = ['account_type', 'parent']
+    search_fields = ['=code', 'name', 'profile__user__email']
+    list_select_related = ['parent']
+
+
+class LedgerLineInline(ReadOnlyLedgerMixin, admin.TabularInline):
+    model = LedgerLine
+    fields = ['account', 'debit', 'credit', 'balance_after']
+    readonly_fields = fields
+    extra = 0
+
+
+@admin.register(JournalEntry)
+class JournalEntryAdmin(ReadOnlyLedgerMixin, admin.ModelAdmin):
+    """Journal Entry Admin - Ödeme geçişlerinin yevmiye kayıtları"""
+    list_display = ['posted_at', 'entry_type', 'amount', 'description', 'payment', 'payout_batch']
+    list_filter = ['entry_type', 'posted_at']
+    search_fields = ['description', 'payment__shipment__tracking_number']
+    list_select_related = ['payment__shipment', 'payout_batch']
+    date_hierarchy = 'posted_at'
+    inlines = [LedgerLineInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('payout_batch__file_content')
+
+
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(admin.ModelAdmin):
+    """Payment Webhook Event Admin - Sanal POS bildirimleri ve işleme durumu"""
+    list_display = ['received_at', 'provider', 'event_id', 'event_type', 'succeeded', 'amount', 'status', 'attempts', 'payment']
+    list_filter = ['status', 'provider', 'succeeded']
+    search_fields = ['=event_id', '=payment_reference', '=transaction_id']
+    list_select_related = ['payment__shipment']
+    readonly_fields = [field.name for field in PaymentWebhookEvent._meta.fields]
+    date_hierarchy = 'received_at'
+    actions = ['reprocess']
+
+    def reprocess(self, request, queryset):
+        """Kuyrukta kalan / hata alan olayları şimdi işle"""
+        results = {}
+        for event_id in queryset.filter(status__in=['received', 'failed']).values_list('pk', flat=True):
+            event = process_event(event_id)
+            status = event.get_status_display() if event else 'Atlandı'
+            results[status] = results.get(status, 0) + 1
+        summary = ', '.join(f'{status}: {count}' for status, count in results.items()) or 'işlenecek olay yok'
+        self.message_user(request, f'Bildirimler işlendi ({summary})')
+    reprocess.short_description = "🔁 Seçili bildirimleri tekrar işle"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # Custom admin index view with dashboard
 from django.contrib.admin import AdminSite
 from django.template.response import TemplateResponse
 from .admin_dashboard import AdminDashboard
+from .db_routers import replica_reads
 
 
 class NakliyeNetAdminSite(AdminSite):
@@ -1217,8 +1443,9 @@ class NakliyeNetAdminSite(AdminSite):
 
     def index(self, request, extra_context=None):
         """Custom admin index with statistics dashboard"""
-        # Get dashboard statistics
-        stats = AdminDashboard.get_dashboard_stats()
+        # Get dashboard statistics (read replica, unless pinned after a write)
+        with replica_reads(request):
+            stats = AdminDashboard.get_dashboard_stats()
         dashboard_html = AdminDashboard.render_dashboard_html(stats)
 
         extra_context = extra_context or {}
@@ -1238,14 +1465,30 @@ admin_site.register(Shipment, ShipmentAdmin)
 admin_site.register(Bid, BidAdmin)
 admin_site.register(Vehicle, VehicleAdmin)
 admin_site.register(Payment, PaymentAdmin)
+admin_site.register(ShipmentImport, ShipmentImportAdmin)
+admin_site.register(PayoutBatch, PayoutBatchAdmin)
+admin_site.register(LedgerAccount, LedgerAccountAdmin)
+admin_site.register(JournalEntry, JournalEntryAdmin)
+admin_site.register(PaymentWebhookEvent, PaymentWebhookEventAdmin)
 
 # Register django.contrib.sites and allauth models for OAuth configuration
 from django.contrib.sites.models import Site
+from allauth.socialaccount.admin import SocialAccountAdmin, SocialAppAdmin, SocialTokenAdmin
 from allauth.socialaccount.models import SocialApp, SocialAccount, SocialToken
 
+
+class SocialAccountListAdmin(SocialAccountAdmin):
+    # __str__ kullanıcıyı gösterir
+    list_select_related = ['user']
+
+
+class SocialTokenListAdmin(SocialTokenAdmin):
+    list_select_related = ['app', 'account__user']
+
+
 admin_site.register(Site)
-admin_site.register(SocialApp)
-admin_site.register(SocialAccount)
-admin_site.register(SocialToken)
+admin_site.register(SocialApp, SocialAppAdmin)
+admin_site.register(SocialAccount, SocialAccountListAdmin)
+admin_site.register(SocialToken, SocialTokenListAdmin)
 
 # Register new models with admin site
@@ -2,10 +2,11 @@
 """
 Custom Admin Dashboard with Statistics
 """
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 from django.db.models import Count, Sum, Avg
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from . import distances, ledger, rollups
 from .models import Shipment, Bid, UserProfile, Vehicle
 
 
@@ -16,13 +17,21 @@ class AdminDashboard:
     def get_dashboard_stats():
         """Get comprehensive statistics for dashboard"""
         today = timezone.now()
-        last_7_days = today - timedelta(days=7)
+
+        # Zaman serileri özet tablolarından (refresh_rollups), ham tablolar taranmaz
+        series = rollups.daily_series(days=90)
 
         # Shipment statistics
         total_shipments = Shipment.objects.count()
         active_shipments = Shipment.objects.filter(status='active').count()
         completed_shipments = Shipment.objects.filter(status='completed').count()
-        shipments_last_7_days = Shipment.objects.filter(created_at__gte=last_7_days).count()
+        refreshed_at = rollups.last_refreshed()
+        if rollups.is_stale(refreshed_at, today):
+            # Özetler güncel değil (refresh_rollups çalışmıyor); created_at index'i ile say
+            week_start = timezone.make_aware(datetime.combine(timezone.localdate(today) - timedelta(days=6), time.min))
+            shipments_last_7_days = Shipment.objects.filter(created_at__gte=week_start).count()
+        else:
+            shipments_last_7_days = sum(day['shipments'] for day in series[-7:])
 
         # Bid statistics
         total_bids = Bid.objects.count()
@@ -34,9 +43,9 @@ class AdminDashboard:
         total_carriers = UserProfile.objects.filter(user_type=1).count()
         verified_carriers = UserProfile.objects.filter(user_type=1, documents_verified=True).count()
 
-        # Financial statistics
-        total_suggested_value = Shipment.objects.aggregate(total=Sum('suggested_price'))['total'] or 0
-        total_final_value = Shipment.objects.filter(final_price__isnull=False).aggregate(total=Sum('final_price'))['total'] or 0
+        # Financial statistics - önceden hesaplanmış defter bakiyeleri (ödeme tablosu taranmaz)
+        accounts = ledger.balances()
+        month_start = timezone.localdate(today).replace(day=1)
 
         return {
             'shipments': {
@@ -56,8 +65,17 @@ class AdminDashboard:
                 'verified_carriers': verified_carriers,
             },
             'financial': {
-                'total_suggested': total_suggested_value,
-                'total_final': total_final_value,
+                'collected': accounts[ledger.ESCROW].credit_total,
+                'escrow': accounts[ledger.ESCROW].balance,
+                'carrier_payable': accounts[ledger.CARRIER_PAYABLE].balance,
+                'paid_out': accounts[ledger.CARRIER_PAYABLE].debit_total,
+                'platform_revenue': accounts[ledger.PLATFORM_REVENUE].balance,
+                'platform_revenue_month': ledger.period_movement(ledger.PLATFORM_REVENUE, month_start),
+            },
+            'trends': {
+                'series': series,
+                'top_routes': rollups.top_routes(days=90),
+                'refreshed_at': refreshed_at,
             },
         }
 
@@ -91,16 +109,26 @@ class AdminDashboard:
                 </div>
 
                 <div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); border-left: 4px solid #3498db;">
-                    <div style="font-size: 14px; color: #7f8c8d;">TOPLAM ILAN DEGERI</div>
-                    <div style="font-size: 32px; font-weight: bold; color: #2c3e50; margin: 10px 0;">{stats['financial']['total_suggested']:,.0f} TL</div>
+                    <div style="font-size: 14px; color: #7f8c8d;">TAHSIL EDILEN</div>
+                    <div style="font-size: 32px; font-weight: bold; color: #2c3e50; margin: 10px 0;">{stats['financial']['collected']:,.0f} TL</div>
+                    <div style="font-size: 12px; color: #7f8c8d;">{stats['financial']['escrow']:,.0f} TL emanette</div>
+                </div>
+
+                <div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); border-left: 4px solid #e67e22;">
+                    <div style="font-size: 14px; color: #7f8c8d;">TASIYICILARA BORC</div>
+                    <div style="font-size: 32px; font-weight: bold; color: #2c3e50; margin: 10px 0;">{stats['financial']['carrier_payable']:,.0f} TL</div>
+                    <div style="font-size: 12px; color: #7f8c8d;">{stats['financial']['paid_out']:,.0f} TL transfer edildi</div>
                 </div>
 
                 <div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); border-left: 4px solid #27ae60;">
-                    <div style="font-size: 14px; color: #7f8c8d;">KESINLESEN DEGER</div>
-                    <div style="font-size: 32px; font-weight: bold; color: #2c3e50; margin: 10px 0;">{stats['financial']['total_final']:,.0f} TL</div>
+                    <div style="font-size: 14px; color: #7f8c8d;">PLATFORM GELIRI</div>
+                    <div style="font-size: 32px; font-weight: bold; color: #2c3e50; margin: 10px 0;">{stats['financial']['platform_revenue']:,.0f} TL</div>
+                    <div style="font-size: 12px; color: #27ae60;">+{stats['financial']['platform_revenue_month']:,.0f} TL bu ay</div>
                 </div>
             </div>
 
+            {{trends}}
+
             <div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 20px;">
                 <h2 style="color: #2c3e50; margin-top: 0;">Hizli Islemler</h2>
                 <div style="display: flex; gap: 10px; flex-wrap: wrap;">
@@ -112,4 +140,88 @@ class AdminDashboard:
             </div>
         </div>
         """
-        return format_html(html)
+        return format_html(html, trends=AdminDashboard.render_trends_html(stats['trends']))
+
+    # (metrik, başlık, renk, para birimi mi)
+    TREND_CHARTS = [
+        ('shipments', 'ILANLAR', '#3498db', False),
+        ('bids', 'TEKLIFLER', '#f39c12', False),
+        ('accepted_bids', 'KABUL EDILEN TEKLIFLER', '#27ae60', False),
+        ('payments', 'ODEMELER', '#9b59b6', False),
+        ('gmv', 'TAHSILAT (GMV)', '#16a085', True),
+        ('platform_fees', 'KOMISYON', '#e67e22', True),
+    ]
+
+    @staticmethod
+    def render_trends_html(trends):
+        """Son 90 günün günlük çubuk grafikleri (SVG) ve en yoğun şehir çiftleri"""
+        series = trends['series']
+        bar_width = 10
+        chart_height = 80
+
+        charts = []
+        for metric, label, color, is_money in AdminDashboard.TREND_CHARTS:
+            values = [day[metric] for day in series]
+            peak = max(values) or 1
+            bars = format_html_join(
+                '',
+                '<rect x="{}" y="{}" width="{}" height="{}" fill="{}"><title>{}: {}</title></rect>',
+                (
+                    (
+                        index * bar_width, chart_height - round(value / peak * chart_height),
+                        bar_width - 2, round(value / peak * chart_height), color,
+                        day['date'].strftime('%d.%m.%Y'), f'{value:,.0f}',
+                    )
+                    for index, (day, value) in enumerate(zip(series, values))
+                ),
+            )
+            total = sum(values)
+            charts.append(format_html(
+                '<div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">'
+                '<div style="font-size: 14px; color: #7f8c8d;">{}</div>'
+                '<div style="font-size: 22px; font-weight: bold; color: #2c3e50; margin: 6px 0 10px;">{}{}</div>'
+                '<svg viewBox="0 0 {} {}" preserveAspectRatio="none" style="width: 100%; height: 80px;">{}</svg>'
+                '</div>',
+                label, f'{total:,.0f}', ' TL' if is_money else '',
+                len(series) * bar_width, chart_height, bars,
+            ))
+
+        route_rows = []
+        for route in trends['top_routes']:
+            km = distances.distance_km(route['from_city'], route['to_city'])
+            # Ödeme başına ortalama tutarın km'ye oranı
+            average = route['gmv'] / route['payments'] if route['payments'] else None
+            per_km = distances.price_per_km(average, km)
+            route_rows.append((
+                route['from_city'], route['to_city'], f'{km:,}' if km is not None else '-',
+                route['shipments'], route['accepted_bids'], f"{route['gmv']:,.0f}",
+                f'{per_km:,.2f}' if per_km is not None else '-',
+            ))
+        routes = format_html_join(
+            '',
+            '<tr><td style="padding: 6px 8px;">{} → {}</td><td style="padding: 6px 8px; text-align: right;">{}</td>'
+            '<td style="padding: 6px 8px; text-align: right;">{}</td><td style="padding: 6px 8px; text-align: right;">{}</td>'
+            '<td style="padding: 6px 8px; text-align: right;">{} TL</td><td style="padding: 6px 8px; text-align: right;">{}</td></tr>',
+            route_rows,
+        )
+
+        refreshed_at = trends['refreshed_at']
+        refreshed = timezone.localtime(refreshed_at).strftime('%d.%m.%Y %H:%M') if refreshed_at else 'henuz hesaplanmadi'
+        if rollups.is_stale(refreshed_at):
+            refreshed += ' (guncel degil - refresh_rollups calismiyor)'
+
+        return format_html(
+            '<div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 20px;">'
+            '<h2 style="color: #2c3e50; margin-top: 0;">Son 90 Gun</h2>'
+            '<div style="font-size: 12px; color: #7f8c8d; margin-bottom: 15px;">Ozet tablolarindan, {} itibariyla</div>'
+            '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-bottom: 20px;">{}</div>'
+            '<h3 style="color: #2c3e50;">En Yogun Guzergahlar</h3>'
+            '<table style="width: 100%; border-collapse: collapse;">'
+            '<tr style="color: #7f8c8d; text-align: left;"><th style="padding: 6px 8px;">Guzergah</th>'
+            '<th style="padding: 6px 8px; text-align: right;">Km</th>'
+            '<th style="padding: 6px 8px; text-align: right;">Ilan</th><th style="padding: 6px 8px; text-align: right;">Kabul</th>'
+            '<th style="padding: 6px 8px; text-align: right;">Tahsilat</th><th style="padding: 6px 8px; text-align: right;">TL/km</th></tr>'
+            '{}</table>'
+            '</div>',
+            refreshed, format_html_join('', '{}', ((chart,) for chart in charts)), routes,
+        )
@@ -0,0 +1,144 @@
+"""
+Büyük tablolar için admin changelist yardımcıları
+
+Django admin her changelist'te tam COUNT(*) çalıştırır ve search_fields'ı
+çok kolonlu icontains OR sorgusuna çevirir; Shipment/Bid/AdminActivity
+milyonlarca satıra ulaştığında ikisi de saniyeler sürer.
+
+- EstimatedCountPaginator: filtresiz listede tablo threshold'dan büyükse
+  planner tahminini kullanır (PostgreSQL pg_class.reltuples, SQLite
+  sqlite_stat1 / MAX(rowid)). Filtreli listeler tam sayılır.
+- LargeTableAdminMixin.exact_search_fields: arama terimi takip numarası,
+  e-posta veya UUID ise önce index'li eşitlik sorgusu yapılır; eşleşme
+  yoksa (kısmi numara, eski formatta id) search_fields ile aranır.
+  search_fields kolonları 0023 migration'ındaki UPPER(kolon) trigram
+  (pg_trgm) index'leriyle desteklenir; Django icontains'i bu ifadeyle yazar.
+  Alanlar farklı tablolardaysa (shipper__user__email) tek OR sorgusu
+  join'den sonra süzülür ve index kullanamaz; her terim için alan başına
+  pk sorgularının UNION'ı kullanılır, her kol kendi tablosunun index'ini
+  kullanır.
+"""
+import re
+import uuid
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.text import smart_split, unescape_string_literal
+from django.utils.functional import cached_property
+
+TRACKING_NUMBER_RE = re.compile(r'^YN-\d{4}-[0-9A-Z]+$', re.IGNORECASE)
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Tablonun yaklaşık satır sayısı; istatistik yoksa None.
+    Tahmin ANALYZE/autovacuum ile güncellenir, birkaç yüzde sapabilir.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)', [table])
+            row = cursor.fetchone()
+            # Hiç analiz edilmemiş tabloda reltuples -1 (PG14+) veya 0
+            if row and row[0] > 0:
+                return row[0]
+            return None
+
+        if connection.vendor == 'sqlite':
+            # Her satırın ilk sayısı tablonun satır sayısıdır
+            try:
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [model._meta.db_table])
+                row = cursor.fetchone()
+            except DatabaseError:  # ANALYZE hiç çalışmadıysa sqlite_stat1 yok
+                row = None
+            if row:
+                return int(row[0].split()[0])
+            # rowid index'in sonundan okunur; silinen satırlar kadar fazla sayar
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+            row = cursor.fetchone()
+            return row[0] if row and row[0] else None
+
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Filtresiz büyük tablolarda COUNT(*) yerine planner tahmini kullanan paginator"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            threshold = settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+        return super().count
+
+
+def classify_search_term(term):
+    """Arama terimini 'tracking_number', 'email', 'uuid' veya None olarak sınıflandır"""
+    if TRACKING_NUMBER_RE.match(term):
+        return 'tracking_number'
+    if EMAIL_RE.match(term):
+        return 'email'
+    try:
+        uuid.UUID(term)
+    except ValueError:
+        return None
+    return 'uuid'
+
+
+class LargeTableAdminMixin:
+    """
+    Tahmini sayım ve kısayollu arama
+
+    exact_search_fields: terim türü -> lookup listesi, örn.
+    {'email': ['shipper_email__iexact'], 'uuid': ['pk']}. Eşitlik sorgusu
+    satır döndürmezse terim search_fields ile (icontains) aranır.
+    Önekli alan (=, ^, @) varsa Django'nun varsayılan araması kullanılır.
+    """
+    paginator = EstimatedCountPaginator
+    # Filtreli listede ikinci bir tam COUNT(*) çalıştırma
+    show_full_result_count = False
+    exact_search_fields = {}
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        kind = classify_search_term(term) if term else None
+        lookups = self.exact_search_fields.get(kind)
+        if lookups:
+            if kind == 'tracking_number':
+                term = term.upper()
+            elif kind == 'uuid':
+                term = uuid.UUID(term)
+            condition = Q()
+            for lookup in lookups:
+                condition |= Q(**{lookup: term})
+            exact = queryset.filter(condition)
+            if exact.exists():
+                return exact, False
+        return self.get_union_search_results(request, queryset, search_term)
+
+    def get_union_search_results(self, request, queryset, search_term):
+        """Her terim: pk IN (alan1 icontains UNION alan2 icontains ...); terimler AND"""
+        search_fields = self.get_search_fields(request)
+        if not search_fields or not search_term or any(field[0] in '=^@' for field in search_fields):
+            return super().get_search_results(request, queryset, search_term)
+
+        manager = queryset.model._default_manager
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            parts = [
+                manager.filter(**{f'{field}__icontains': bit}).order_by().values('pk')
+                for field in search_fields
+            ]
+            queryset = queryset.filter(pk__in=parts[0].union(*parts[1:]))
+        # pk IN (...) satır çoğaltmaz
+        return queryset, False
@@ -4,7 +4,7 @@ REST API endpoints for mobile app
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api_views import ShipmentViewSet, BidViewSet, UserProfileViewSet, VehicleViewSet
+from .api_views import ShipmentViewSet, BidViewSet, UserProfileViewSet, VehicleViewSet, export_csv, db_connection_stats, price_suggestion, place_autocomplete
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -15,5 +15,9 @@ router.register(r'vehicles', VehicleViewSet, basename='vehicle')
 
 # URL patterns
 urlpatterns = [
+    path('export/<str:kind>/', export_csv, name='api_export'),
+    path('places/autocomplete/', place_autocomplete, name='api_place_autocomplete'),
+    path('price-suggestion/', price_suggestion, name='api_price_suggestion'),
+    path('internal/db-connections/', db_connection_stats, name='api_db_connection_stats'),
     path('', include(router.urls)),
 ]
@@ -2,15 +2,22 @@
 Django REST Framework ViewSets
 API endpoints for mobile app
 """
+import math
+
 from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from django.db.models import Q
 
+from . import gazetteer, pricing
+from .db_metrics import connection_stats
+from .exports import EXPORTS, filter_queryset, stream_csv
+from .ids import parse_id
 from .models import Shipment, Bid, UserProfile, Vehicle
+from .user_cache import get_user_profile
 from .serializers import (
     ShipmentSerializer, ShipmentListSerializer, ShipmentCreateSerializer,
     BidSerializer, BidCreateSerializer,
@@ -18,7 +25,15 @@ from .serializers import (
 )
 
 
-class ShipmentViewSet(viewsets.ModelViewSet):
+class PublicIdLookupMixin:
+    """Accept UUID and legacy (pre-UUID) ids in detail URLs"""
+
+    def get_object(self):
+        self.kwargs[self.lookup_field] = parse_id(self.kwargs[self.lookup_field])
+        return super().get_object()
+
+
+class ShipmentViewSet(PublicIdLookupMixin, viewsets.ModelViewSet):
     """
     ViewSet for Shipment model
 
@@ -64,10 +79,8 @@ class ShipmentViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
 
         # Increment view count (only if not the owner)
-        if not request.user.is_authenticated or (
-            hasattr(request.user, 'profile') and
-            request.user.profile != instance.shipper
-        ):
+        profile = get_user_profile(request)
+        if profile is None or profile != instance.shipper:
             instance.increment_view_count()
 
         serializer = self.get_serializer(instance)
@@ -76,13 +89,13 @@ class ShipmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_shipments(self, request):
         """Get current user's shipments"""
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile = request.user.profile
         shipments = Shipment.objects.filter(shipper=profile).order_by('-created_at')
 
         serializer = ShipmentListSerializer(shipments, many=True)
@@ -94,13 +107,13 @@ class ShipmentViewSet(viewsets.ModelViewSet):
         shipment = self.get_object()
 
         # Check if user is the owner
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile = request.user.profile
         if shipment.shipper != profile:
             return Response(
                 {'error': 'You do not have permission to assign carrier'},
@@ -118,6 +131,7 @@ class ShipmentViewSet(viewsets.ModelViewSet):
             )
 
         # Get bid
+        bid_id = parse_id(bid_id)
         try:
             bid = Bid.objects.get(bid_id=bid_id, shipment=shipment)
         except Bid.DoesNotExist:
@@ -150,7 +164,7 @@ class ShipmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class BidViewSet(viewsets.ModelViewSet):
+class BidViewSet(PublicIdLookupMixin, viewsets.ModelViewSet):
     """
     ViewSet for Bid model
 
@@ -182,7 +196,7 @@ class BidViewSet(viewsets.ModelViewSet):
         # Filter by shipment
         shipment_id = self.request.query_params.get('shipment_id', None)
         if shipment_id:
-            queryset = queryset.filter(shipment__shipment_id=shipment_id)
+            queryset = queryset.filter(shipment__shipment_id=parse_id(shipment_id))
 
         # Filter by tracking number
         tracking_number = self.request.query_params.get('tracking_number', None)
@@ -194,13 +208,13 @@ class BidViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_bids(self, request):
         """Get current user's bids"""
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile = request.user.profile
         bids = Bid.objects.filter(carrier=profile).order_by('-created_at')
 
         serializer = self.get_serializer(bids, many=True)
@@ -212,13 +226,13 @@ class BidViewSet(viewsets.ModelViewSet):
         bid = self.get_object()
 
         # Check if user is the owner
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile = request.user.profile
         if bid.carrier != profile:
             return Response(
                 {'error': 'You do not have permission to withdraw this bid'},
@@ -266,13 +280,14 @@ class UserProfileViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """Get current user's profile"""
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = self.get_serializer(request.user.profile)
+        serializer = self.get_serializer(profile)
         return Response(serializer.data)
 
 
@@ -308,14 +323,122 @@ class VehicleViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_vehicles(self, request):
         """Get current user's vehicles"""
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             return Response(
                 {'error': 'User profile not found'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        profile = request.user.profile
         vehicles = Vehicle.objects.filter(carrier_profile=profile).order_by('-created_at')
 
         serializer = self.get_serializer(vehicles, many=True)
         return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_csv(request, kind):
+    """
+    Streaming CSV export for staff (shipments, bids, payments)
+
+    Query params: date_from, date_to (YYYY-MM-DD), status (comma separated), city
+    """
+    if kind not in EXPORTS:
+        return Response(
+            {'error': f"Unknown export: {kind}"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        queryset = filter_queryset(EXPORTS[kind]['model'].objects.all(), kind, request.query_params)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return stream_csv(queryset, kind)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_connection_stats(request):
+    """Database connection pool metrics for this worker process (staff only)"""
+    return Response(connection_stats())
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def price_suggestion(request):
+    """
+    Route price suggestion from the price index (ilan_olustur form)
+
+    Query params: from_city, to_city (required), cargo_type, weight (kg)
+    Oturum okunmaz; yanıt kullanıcıdan bağımsızdır ve cache'lenir.
+    """
+    params = request.query_params
+    from_city, to_city = params.get('from_city', '').strip(), params.get('to_city', '').strip()
+    if not from_city or not to_city:
+        return Response(
+            {'error': 'from_city and to_city are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Sadece bilinen il ve yük tipleri sorgulanır/cache'lenir
+    from_city, to_city = gazetteer.province_name(from_city), gazetteer.province_name(to_city)
+    if not from_city or not to_city:
+        return Response(
+            {'error': 'from_city and to_city must be Turkish provinces'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    cargo_type = params.get('cargo_type', '').strip()
+    if cargo_type and cargo_type not in dict(Shipment.CARGO_TYPES):
+        return Response(
+            {'error': 'unknown cargo_type'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        weight = float(params['weight']) if params.get('weight') else None
+    except ValueError:
+        weight = math.nan
+    if weight is not None and not (math.isfinite(weight) and weight >= 0):
+        return Response(
+            {'error': 'weight must be a non-negative number'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    suggestion = pricing.suggest(from_city, to_city, cargo_type, weight)
+    if suggestion is None:
+        return Response({'suggested_price': None})
+    return Response(suggestion)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def place_autocomplete(request):
+    """
+    Province/district autocomplete from the in-memory gazetteer
+
+    Query params: q (prefix), city (optional - only that province's districts), limit
+    """
+    params = request.query_params
+    try:
+        limit = int(params.get('limit') or gazetteer.AUTOCOMPLETE_LIMIT)
+    except ValueError:
+        limit = gazetteer.AUTOCOMPLETE_LIMIT
+
+    places = gazetteer.autocomplete(params.get('q', ''), city=params.get('city', '').strip() or None, limit=limit)
+    return Response({
+        'results': [
+            {
+                'name': place.name,
+                'kind': place.kind,
+                'province': place.province,
+                'plate': place.plate,
+                'slug': place.slug,
+                'label': place.name if place.kind == 'province' else f'{place.name}, {place.province}',
+            }
+            for place in places
+        ]
+    })
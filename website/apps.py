@@ -1,10 +1,29 @@
+from allauth.account.apps import AccountConfig
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class WebsiteConfig(AppConfig):
+    # apps.py birden fazla AppConfig içerdiği için 'website' için açıkça seçilir
+    default = True
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'website'
 
     def ready(self):
         # Import signals to register them
         import website.signals
+        import website.db_metrics
+        import website.user_cache
+        # İl/ilçe sözlüğü ilk istekte değil açılışta kurulsun
+        import website.gazetteer
+
+
+class AllauthAccountConfig(AccountConfig):
+    """
+    allauth.account; ready() kontrolü AccountMiddleware'in ASGI uyumlu alt
+    sınıfını (website.middleware.AccountMiddleware) da kabul eder
+    """
+
+    def ready(self):
+        if 'website.middleware.AccountMiddleware' not in settings.MIDDLEWARE:
+            super().ready()
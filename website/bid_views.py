@@ -11,6 +11,7 @@ from django.contrib import messages
 import json
 import uuid
 from .models import Bid, BidComment, Shipment, UserProfile
+from .user_cache import get_user_profile
 
 
 @login_required
@@ -23,7 +24,7 @@ def bid_accept(request, bid_id):
         bid = get_object_or_404(Bid, bid_id=bid_id)
 
         # Check if user is the shipment owner
-        if request.user.profile != bid.shipment.shipper:
+        if get_user_profile(request) != bid.shipment.shipper:
             return JsonResponse({'success': False, 'error': 'Bu işlem için yetkiniz yok'}, status=403)
 
         # Check if bid is still pending
@@ -67,7 +68,7 @@ def bid_reject(request, bid_id):
         bid = get_object_or_404(Bid, bid_id=bid_id)
 
         # Check if user is the shipment owner
-        if request.user.profile != bid.shipment.shipper:
+        if get_user_profile(request) != bid.shipment.shipper:
             return JsonResponse({'success': False, 'error': 'Bu işlem için yetkiniz yok'}, status=403)
 
         # Check if bid is still pending
@@ -95,7 +96,7 @@ def bid_counter_offer(request, bid_id):
         bid = get_object_or_404(Bid, bid_id=bid_id)
 
         # Check if user is the shipment owner
-        if request.user.profile != bid.shipment.shipper:
+        if get_user_profile(request) != bid.shipment.shipper:
             return JsonResponse({'success': False, 'error': 'Bu işlem için yetkiniz yok'}, status=403)
 
         # Check if bid is still pending
@@ -133,7 +134,7 @@ def bid_comment(request, bid_id):
         bid = get_object_or_404(Bid, bid_id=bid_id)
 
         # Check if user is either shipper or carrier
-        user_profile = request.user.profile
+        user_profile = get_user_profile(request)
         is_shipper = (user_profile == bid.shipment.shipper)
         is_carrier = (user_profile == bid.carrier)
 
@@ -0,0 +1,542 @@
+"""
+Toplu ilan yükleme - CSV/XLSX dosyalarını akış halinde işler
+
+Dosya satır satır okunur, her satır Shipment alan kurallarına ve
+il sözlüğüne (gazetteer) göre doğrulanır. Hatalı satırlar diskteki bir CSV
+hata raporuna, geçerli satırlar diskteki geçici bir dosyaya yazılır.
+Dosyanın tamamı okunup MAX_ROWS kontrolü geçtikten sonra geçerli satırlar
+tek transaction içinde CHUNK_SIZE'lık bulk_create'lerle yazılır; yazma
+sırasında hata olursa hiç ilan oluşmaz. Bellekte en fazla bir parça tutulur.
+
+Web yüklemeleri start_import ile arka plan thread'inde işlenir (büyük
+dosyalar gunicorn timeout'una takılmaz); durum ShipmentImport kaydından
+izlenir. Dosyanın kopyası işlem bitene kadar özel storage'da
+(imports/<pk>) tutulur. Worker yeniden başlarsa thread kaybolur ve kayıt
+'processing' kalır; process_shipment_imports komutu (cron) bu yüklemeleri
+kopyadan yeniden işler. Yazma ve 'completed' durumu aynı transaction'da
+olduğu için bir yükleme iki kez yazılmaz.
+"""
+import csv
+import io
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.core.files import File
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import gazetteer
+from .models import Shipment, ShipmentImport
+from .private_media import private_storage
+from .tracking_numbers import allocate_tracking_numbers
+
+logger = logging.getLogger(__name__)
+
+# Bir bulk_create çağrısında yazılacak satır sayısı
+CHUNK_SIZE = 500
+
+# Tek dosyada kabul edilen en fazla satır
+MAX_ROWS = 100000
+
+# Şablondaki kolonlar (ilan_olustur formundaki alan adları ile aynı)
+COLUMNS = [
+    'title', 'description', 'cargo_type',
+    'from_city', 'from_district', 'from_address',
+    'to_city', 'to_district', 'to_address',
+    'weight', 'length', 'width', 'height',
+    'suggested_price', 'pickup_date',
+    'loading_responsibility', 'unloading_responsibility',
+    'phone',
+]
+
+REQUIRED_COLUMNS = [
+    'title', 'from_city', 'from_district', 'from_address',
+    'to_city', 'to_district', 'to_address',
+    'weight', 'suggested_price', 'pickup_date',
+]
+
+# Şablondaki örnek satırın yükleme tarihi (bugünden bu kadar gün sonra)
+SAMPLE_PICKUP_DAYS = 7
+
+# Decimal(10, 2) alanlarının üst sınırı
+MAX_DECIMAL = Decimal('99999999.99')
+
+ZERO_PADDED_FORMAT = re.compile(r'^0+$')
+
+# Sıfır dolgulu sayı biçimi sadece bu kolonda metne çevrilir
+PHONE_COLUMN = 'phone'
+
+
+class ImportFileError(Exception):
+    """Dosya okunamadığında veya başlık satırı geçersiz olduğunda"""
+
+
+class _AlreadyFinished(Exception):
+    """Yükleme başka bir süreçte (thread veya process_shipment_imports) tamamlandı"""
+
+
+def normalize_key(value):
+    """Türkçe büyük/küçük harf kurallarına uygun karşılaştırma anahtarı"""
+    value = (value or '').strip().replace('İ', 'i').replace('I', 'ı')
+    return value.lower()
+
+
+CARGO_TYPE_LOOKUP = {}
+for _value, _label in Shipment.CARGO_TYPES:
+    CARGO_TYPE_LOOKUP[normalize_key(_value)] = _value
+    CARGO_TYPE_LOOKUP[normalize_key(_label)] = _value
+RESPONSIBILITY_VALUES = {value for value, _label in Shipment.LOADING_CHOICES}
+
+
+def iter_rows(uploaded_file):
+    """
+    Yüklenen dosyayı (satır no, {kolon: değer}) olarak akış halinde döndür
+    XLSX dosyaları openpyxl read-only modunda, diğerleri CSV olarak okunur
+    """
+    name = (getattr(uploaded_file, 'name', '') or '').lower()
+    if name.endswith('.xlsx'):
+        rows = _iter_xlsx(uploaded_file)
+    else:
+        rows = _iter_csv(uploaded_file)
+
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise ImportFileError('Dosya boş.')
+
+    header = [normalize_key(str(col or '')) for col in header]
+    missing = [col for col in REQUIRED_COLUMNS if col not in header]
+    if missing:
+        raise ImportFileError(f"Eksik kolonlar: {', '.join(missing)}")
+
+    for row_number, values in enumerate(rows, start=2):
+        if not any(value not in (None, '') for value in values):
+            continue  # Boş satırları atla
+        yield row_number, dict(zip(header, values))
+
+
+def _iter_csv(uploaded_file):
+    """CSV satırlarını oku - Excel'in ; ayracını ve UTF-8 BOM'u destekler"""
+    uploaded_file.seek(0)
+    encoding = _detect_encoding(uploaded_file.read(64 * 1024))
+    uploaded_file.seek(0)
+    stream = io.TextIOWrapper(uploaded_file.file, encoding=encoding, errors='replace', newline='')
+    try:
+        first_line = stream.readline()
+        delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+        yield next(csv.reader([first_line], delimiter=delimiter), [])
+        yield from csv.reader(stream, delimiter=delimiter)
+    finally:
+        stream.detach()  # Yüklenen dosyayı kapatma, Django kapatır
+
+
+def _detect_encoding(sample):
+    """UTF-8 değilse Türkçe Windows kodlamasını (Excel varsayılanı) kullan"""
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:  # Örnek sonunda bölünmüş karakter değil
+            return 'cp1254'
+    return 'utf-8-sig'
+
+
+def _iter_xlsx(uploaded_file):
+    """XLSX satırlarını oku - read_only mod satırları diskteki XML'den akıtır"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX desteği için openpyxl kurulu değil. Lütfen CSV yükleyin.')
+
+    uploaded_file.seek(0)
+    try:
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f'XLSX dosyası okunamadı: {e}')
+
+    try:
+        rows = workbook.active.iter_rows()
+        first = next(rows, None)
+        if first is None:
+            return
+        header = [getattr(cell, 'value', None) for cell in first]
+        yield header
+        keys = [normalize_key(str(col or '')) for col in header]
+        phone = keys.index(PHONE_COLUMN) if PHONE_COLUMN in keys else None
+        for cells in rows:
+            values = [getattr(cell, 'value', None) for cell in cells]
+            if phone is not None and phone < len(cells):
+                values[phone] = _xlsx_phone(cells[phone])
+            yield values
+    finally:
+        workbook.close()
+
+
+def _xlsx_phone(cell):
+    """
+    Telefon hücresi; '00000000000' gibi sıfır dolgulu sayı biçimindeki
+    hücreler Excel'de göründüğü gibi metin olarak okunur. Diğer kolonlara
+    uygulanmaz (1499.99 tutarı '1499' olurdu).
+    """
+    value = getattr(cell, 'value', None)
+    number_format = getattr(cell, 'number_format', '') or ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and ZERO_PADDED_FORMAT.match(number_format):
+        return str(int(value)).zfill(len(number_format))
+    return value
+
+
+def _text(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _phone(value):
+    """
+    Telefon metni; Excel sayı hücresi baştaki 0'ı düşürür
+    (5551234567 -> 05551234567)
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        text = str(int(value))
+        if len(text) == 10 and text.startswith('5'):
+            text = '0' + text
+        return text
+    return _text(value)
+
+
+def _decimal(value):
+    """1.234,50 / 1234.50 / 1234 biçimlerini Decimal'e çevir"""
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    text = _text(value).replace(' ', '')
+    if not text:
+        return None
+    if ',' in text and '.' in text:
+        text = text.replace('.', '').replace(',', '.')
+    elif ',' in text:
+        text = text.replace(',', '.')
+    return Decimal(text)
+
+
+def _date(value):
+    """YYYY-MM-DD veya GG.AA.YYYY tarihlerini çevir"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = _text(value)
+    for fmt in ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(text)
+
+
+def validate_row(row, default_phone=''):
+    """
+    Tek satırı doğrula
+    (Shipment alanları sözlüğü, hata listesi) döndürür
+    """
+    errors = []
+    data = {}
+
+    for column in REQUIRED_COLUMNS:
+        if not _text(row.get(column)):
+            errors.append(f'{column} zorunlu')
+    if errors:
+        return None, errors
+
+    # Metin alanları ve model uzunluk sınırları
+    title = _text(row.get('title'))
+    if len(title) > 255:
+        errors.append('title en fazla 255 karakter olabilir')
+    data['title'] = title
+    data['description'] = _text(row.get('description'))
+
+    for prefix in ('from', 'to'):
+        city = gazetteer.province_name(_text(row.get(f'{prefix}_city')))
+        if not city:
+            errors.append(f'{prefix}_city geçerli bir il değil: {_text(row.get(f"{prefix}_city"))}')
+        district = _text(row.get(f'{prefix}_district'))
+        # Tanınan ilçeler standart yazımıyla kaydedilir ("kadikoy" -> "Kadıköy")
+        known_district = gazetteer.find_district(city, district) if city else None
+        if known_district is not None:
+            district = known_district.name
+        if len(district) > 100:
+            errors.append(f'{prefix}_district en fazla 100 karakter olabilir')
+        data[f'{prefix}_address_city'] = city
+        data[f'{prefix}_address_district'] = district
+        data[f'{prefix}_address_full'] = _text(row.get(f'{prefix}_address'))
+
+    # Yük tipi - kod (evden_eve) veya etiket (Evden Eve Nakliyat) kabul edilir
+    cargo_type = _text(row.get('cargo_type'))
+    if cargo_type:
+        data['cargo_type'] = CARGO_TYPE_LOOKUP.get(normalize_key(cargo_type))
+        if not data['cargo_type']:
+            errors.append(f'cargo_type geçersiz: {cargo_type}')
+    else:
+        data['cargo_type'] = 'diger'
+
+    # Sayısal alanlar
+    for column in ('weight', 'suggested_price', 'length', 'width', 'height'):
+        try:
+            value = _decimal(row.get(column))
+        except (InvalidOperation, ValueError):
+            errors.append(f'{column} sayı olmalı')
+            continue
+        if value is None:
+            data[column] = None
+            continue
+        if value <= 0 or value > MAX_DECIMAL:
+            errors.append(f'{column} 0 ile {MAX_DECIMAL} arasında olmalı')
+            continue
+        data[column] = value.quantize(Decimal('0.01'))
+
+    try:
+        pickup_date = _date(row.get('pickup_date'))
+        if pickup_date < timezone.localdate():
+            errors.append('pickup_date geçmiş bir tarih olamaz')
+        data['pickup_date'] = pickup_date
+    except ValueError:
+        errors.append('pickup_date YYYY-AA-GG veya GG.AA.YYYY olmalı')
+
+    for column in ('loading_responsibility', 'unloading_responsibility'):
+        value = _text(row.get(column)) or 'shipper'
+        if value not in RESPONSIBILITY_VALUES:
+            errors.append(f'{column} shipper, carrier veya both olmalı')
+        data[column] = value
+
+    phone = _phone(row.get('phone')) or default_phone
+    if not phone:
+        errors.append('phone zorunlu (profilde telefon yoksa)')
+    elif len(phone) > 20:
+        errors.append('phone en fazla 20 karakter olabilir')
+    data['shipper_phone'] = phone
+
+    return (None, errors) if errors else (data, [])
+
+
+class _ErrorReport:
+    """Hatalı satırları diskteki geçici bir CSV'ye yazar"""
+
+    def __init__(self):
+        self.file = tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8-sig', newline='', suffix='.csv', delete=False)
+        self.writer = csv.writer(self.file, delimiter=';')
+        self.writer.writerow(['satir', 'hatalar'] + COLUMNS)
+        self.count = 0
+
+    def add(self, row_number, errors, row):
+        self.writer.writerow([row_number, ' | '.join(errors)] + [_text(row.get(col)) for col in COLUMNS])
+        self.count += 1
+
+    def save_to(self, shipment_import):
+        self.file.flush()
+        self.file.seek(0)
+        name = f'import-{shipment_import.pk}-hatalar.csv'
+        with open(self.file.name, 'rb') as report:
+            shipment_import.error_report.save(name, File(report), save=False)
+
+    def close(self):
+        self.file.close()
+        os.unlink(self.file.name)
+
+
+class _ValidRows:
+    """Doğrulanmış satırları diskteki geçici bir dosyada tutar (pickle akışı)"""
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.count = 0
+
+    def add(self, data):
+        pickle.dump(data, self.file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def chunks(self, size):
+        self.file.seek(0)
+        for start in range(0, self.count, size):
+            yield [pickle.load(self.file) for _ in range(min(size, self.count - start))]
+
+    def close(self):
+        self.file.close()
+
+
+def _write_shipments(shipment_import, profile, user_email, rows):
+    """
+    Tüm geçerli satırları tek transaction içinde yaz; kayıt aynı transaction'da
+    'completed' olur. Kayıt kilitlenir ve hâlâ 'processing' değilse (aynı dosyayı
+    işleyen diğer süreç bitirdi) hiçbir şey yazılmaz.
+
+    Takip numaraları transaction'dan önce tek seferde ayrılır (sayaç
+    kilidi uzun süre tutulmaz); geri alınan yüklemenin numaraları boş kalır.
+    """
+    tracking_numbers = iter(allocate_tracking_numbers(rows.count))
+    now = timezone.now()
+    created = 0
+    with transaction.atomic():
+        pending = ShipmentImport.objects.select_for_update().filter(pk=shipment_import.pk, status='processing')
+        if not pending.exists():
+            raise _AlreadyFinished
+        for chunk in rows.chunks(CHUNK_SIZE):
+            shipments = [
+                Shipment(
+                    tracking_number=next(tracking_numbers),
+                    shipper=profile,
+                    shipper_email=user_email,
+                    status='active',
+                    created_at=now,
+                    **data
+                )
+                for data in chunk
+            ]
+            # bulk_create save() çağırmaz
+            for shipment in shipments:
+                shipment.distance_km = shipment.route_distance_km()
+            Shipment.objects.bulk_create(shipments, batch_size=CHUNK_SIZE)
+            created += len(shipments)
+        pending.update(status='completed', created_count=created)
+    return created
+
+
+def run_import(shipment_import, uploaded_file):
+    """
+    ShipmentImport kaydı için dosyayı işle
+    Sonuç sayıları ve hata raporu kayda yazılır
+    """
+    profile = shipment_import.shipper
+    user_email = profile.user.email
+    report = _ErrorReport()
+    valid_rows = _ValidRows()
+
+    try:
+        # 1. geçiş: doğrula ve say; veritabanına yazılmaz
+        for row_number, row in iter_rows(uploaded_file):
+            shipment_import.total_rows += 1
+            if shipment_import.total_rows > MAX_ROWS:
+                raise ImportFileError(f'Bir dosyada en fazla {MAX_ROWS} satır yüklenebilir.')
+
+            data, errors = validate_row(row, default_phone=profile.phone_number)
+            if errors:
+                report.add(row_number, errors, row)
+            else:
+                valid_rows.add(data)
+
+        # 2. geçiş: hepsi ya da hiçbiri
+        if valid_rows.count:
+            shipment_import.created_count = _write_shipments(shipment_import, profile, user_email, valid_rows)
+        shipment_import.status = 'completed'
+
+    except _AlreadyFinished:
+        report.close()
+        shipment_import.refresh_from_db()
+        return shipment_import
+    except ImportFileError as e:
+        shipment_import.status = 'failed'
+        shipment_import.error_message = str(e)
+    except Exception as e:
+        logger.error(f"Bulk import {shipment_import.pk} failed: {e}", exc_info=True)
+        shipment_import.status = 'failed'
+        shipment_import.created_count = 0
+        shipment_import.error_message = 'Dosya işlenirken beklenmeyen bir hata oluştu. Hiçbir ilan oluşturulmadı.'
+    finally:
+        valid_rows.close()
+
+    try:
+        shipment_import.error_count = report.count
+        if report.count:
+            report.save_to(shipment_import)
+    finally:
+        report.close()
+
+    shipment_import.finished_at = timezone.now()
+    shipment_import.save()
+    return shipment_import
+
+
+def upload_copy_name(shipment_import):
+    """Arka planda işlenen dosyanın özel storage'daki kopyası"""
+    suffix = os.path.splitext(shipment_import.file_name)[1].lower()
+    return f'imports/{shipment_import.pk}{suffix}'
+
+
+def start_import(shipment_import, uploaded_file):
+    """
+    Yüklemeyi arka plan thread'inde işle
+
+    Django'nun geçici yükleme dosyası istek bitince silinir; dosya önce
+    özel storage'a kopyalanır. Thread bitince kopya silinir ve thread'in
+    veritabanı bağlantısı kapatılır. Thread worker ile birlikte kaybolursa
+    kopya kalır ve resume_import onu işler.
+    """
+    name = upload_copy_name(shipment_import)
+    private_storage.delete(name)
+    uploaded_file.seek(0)
+    private_storage.save(name, uploaded_file)
+
+    def work():
+        try:
+            _run_copy(shipment_import, name)
+        except Exception as e:
+            logger.error(f"Bulk import {shipment_import.pk} thread failed: {e}", exc_info=True)
+        finally:
+            connection.close()
+
+    # Kayıt commit edilmeden thread onu göremez
+    transaction.on_commit(lambda: threading.Thread(target=work, name=f'import-{shipment_import.pk}', daemon=True).start())
+
+
+def _run_copy(shipment_import, name):
+    """Kopyadan işle; yükleme bitince (başarılı veya hatalı) kopyayı sil"""
+    with private_storage.open(name, 'rb') as handle:
+        run_import(shipment_import, File(handle, name=shipment_import.file_name))
+    private_storage.delete(name)
+
+
+def resume_import(shipment_import):
+    """
+    Worker yeniden başladığı için 'processing' kalmış yüklemeyi kopyasından
+    baştan işle; kopya yoksa yükleme hatalı olarak kapatılır
+    """
+    name = upload_copy_name(shipment_import)
+    if not private_storage.exists(name):
+        updated = ShipmentImport.objects.filter(pk=shipment_import.pk, status='processing').update(
+            status='failed',
+            error_message='Dosya işlenirken sunucu yeniden başladı. Lütfen dosyayı tekrar yükleyin.',
+            finished_at=timezone.now(),
+        )
+        shipment_import.refresh_from_db()
+        return shipment_import if updated else None
+
+    # 1. geçiş sayaçları baştan sayar
+    shipment_import.total_rows = shipment_import.created_count = shipment_import.error_count = 0
+    _run_copy(shipment_import, name)
+    return shipment_import
+
+
+def sample_row():
+    """Şablondaki örnek satır; tarih indirme anında hesaplanır (geçmiş tarih hatası vermez)"""
+    pickup_date = timezone.localdate() + timedelta(days=SAMPLE_PICKUP_DAYS)
+    return [
+        '3+1 ev eşyası', 'Asansörlü bina, 2. kat', 'evden_eve',
+        'İstanbul', 'Kadıköy', 'Caferağa Mah. Moda Cad. No:1',
+        'Ankara', 'Çankaya', 'Kızılay Mah. Atatürk Blv. No:10',
+        '1500', '', '', '',
+        '12000', pickup_date.isoformat(),
+        'carrier', 'carrier',
+        '05551234567',
+    ]
+
+
+def template_csv():
+    """Boş şablon dosyasının içeriği (başlık + örnek satır)"""
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=';')
+    writer.writerow(COLUMNS)
+    writer.writerow(sample_row())
+    return '\ufeff' + output.getvalue()
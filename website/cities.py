@@ -82,3 +82,303 @@ CITIES = [
     'Yozgat',
     'Zonguldak',
 ]
+
+# İller: (plaka, ad, enlem, boylam) - koordinatlar il merkezinin yaklaşık konumu
+PROVINCES = [
+    (1, 'Adana', 37.0000, 35.3213),
+    (2, 'Adıyaman', 37.7648, 38.2786),
+    (3, 'Afyonkarahisar', 38.7507, 30.5567),
+    (4, 'Ağrı', 39.7191, 43.0503),
+    (5, 'Amasya', 40.6499, 35.8353),
+    (6, 'Ankara', 39.9334, 32.8597),
+    (7, 'Antalya', 36.8969, 30.7133),
+    (8, 'Artvin', 41.1828, 41.8183),
+    (9, 'Aydın', 37.8560, 27.8416),
+    (10, 'Balıkesir', 39.6484, 27.8826),
+    (11, 'Bilecik', 40.1451, 29.9799),
+    (12, 'Bingöl', 38.8854, 40.4980),
+    (13, 'Bitlis', 38.4006, 42.1095),
+    (14, 'Bolu', 40.7350, 31.6061),
+    (15, 'Burdur', 37.7203, 30.2908),
+    (16, 'Bursa', 40.1826, 29.0665),
+    (17, 'Çanakkale', 40.1553, 26.4142),
+    (18, 'Çankırı', 40.6013, 33.6134),
+    (19, 'Çorum', 40.5506, 34.9556),
+    (20, 'Denizli', 37.7765, 29.0864),
+    (21, 'Diyarbakır', 37.9144, 40.2306),
+    (22, 'Edirne', 41.6818, 26.5623),
+    (23, 'Elazığ', 38.6810, 39.2264),
+    (24, 'Erzincan', 39.7500, 39.5000),
+    (25, 'Erzurum', 39.9000, 41.2700),
+    (26, 'Eskişehir', 39.7767, 30.5206),
+    (27, 'Gaziantep', 37.0662, 37.3833),
+    (28, 'Giresun', 40.9128, 38.3895),
+    (29, 'Gümüşhane', 40.4386, 39.5086),
+    (30, 'Hakkari', 37.5833, 43.7333),
+    (31, 'Hatay', 36.2021, 36.1600),
+    (32, 'Isparta', 37.7648, 30.5566),
+    (33, 'Mersin', 36.8000, 34.6333),
+    (34, 'İstanbul', 41.0082, 28.9784),
+    (35, 'İzmir', 38.4237, 27.1428),
+    (36, 'Kars', 40.6167, 43.1000),
+    (37, 'Kastamonu', 41.3887, 33.7827),
+    (38, 'Kayseri', 38.7312, 35.4787),
+    (39, 'Kırklareli', 41.7333, 27.2167),
+    (40, 'Kırşehir', 39.1425, 34.1709),
+    (41, 'Kocaeli', 40.7650, 29.9400),
+    (42, 'Konya', 37.8667, 32.4833),
+    (43, 'Kütahya', 39.4167, 29.9833),
+    (44, 'Malatya', 38.3552, 38.3095),
+    (45, 'Manisa', 38.6191, 27.4289),
+    (46, 'Kahramanmaraş', 37.5858, 36.9371),
+    (47, 'Mardin', 37.3212, 40.7245),
+    (48, 'Muğla', 37.2153, 28.3636),
+    (49, 'Muş', 38.9462, 41.7539),
+    (50, 'Nevşehir', 38.6939, 34.6857),
+    (51, 'Niğde', 37.9667, 34.6833),
+    (52, 'Ordu', 40.9839, 37.8764),
+    (53, 'Rize', 41.0201, 40.5234),
+    (54, 'Sakarya', 40.7806, 30.4033),
+    (55, 'Samsun', 41.2928, 36.3313),
+    (56, 'Siirt', 37.9333, 41.9500),
+    (57, 'Sinop', 42.0231, 35.1531),
+    (58, 'Sivas', 39.7477, 37.0179),
+    (59, 'Tekirdağ', 40.9833, 27.5167),
+    (60, 'Tokat', 40.3167, 36.5500),
+    (61, 'Trabzon', 41.0015, 39.7178),
+    (62, 'Tunceli', 39.1079, 39.5401),
+    (63, 'Şanlıurfa', 37.1591, 38.7969),
+    (64, 'Uşak', 38.6823, 29.4082),
+    (65, 'Van', 38.4891, 43.4089),
+    (66, 'Yozgat', 39.8181, 34.8147),
+    (67, 'Zonguldak', 41.4564, 31.7987),
+    (68, 'Aksaray', 38.3687, 34.0370),
+    (69, 'Bayburt', 40.2552, 40.2249),
+    (70, 'Karaman', 37.1759, 33.2287),
+    (71, 'Kırıkkale', 39.8468, 33.5153),
+    (72, 'Batman', 37.8812, 41.1351),
+    (73, 'Şırnak', 37.5164, 42.4611),
+    (74, 'Bartın', 41.6344, 32.3375),
+    (75, 'Ardahan', 41.1105, 42.7022),
+    (76, 'Iğdır', 39.9237, 44.0450),
+    (77, 'Yalova', 40.6500, 29.2667),
+    (78, 'Karabük', 41.2061, 32.6204),
+    (79, 'Kilis', 36.7184, 37.1212),
+    (80, 'Osmaniye', 37.0742, 36.2478),
+    (81, 'Düzce', 40.8438, 31.1565),
+]
+
+# İlçeler (plaka -> ilçe adları); büyükşehir olmayan illerin merkez ilçesi 'Merkez'
+DISTRICTS = {
+    1: 'Aladağ Ceyhan Çukurova Feke İmamoğlu Karaisalı Karataş Kozan Pozantı Saimbeyli Sarıçam Seyhan '
+       'Tufanbeyli Yumurtalık Yüreğir',
+    2: 'Merkez Besni Çelikhan Gerger Gölbaşı Kahta Samsat Sincik Tut',
+    3: 'Merkez Başmakçı Bayat Bolvadin Çay Çobanlar Dazkırı Dinar Emirdağ Evciler Hocalar İhsaniye İscehisar '
+       'Kızılören Sandıklı Sinanpaşa Sultandağı Şuhut',
+    4: 'Merkez Diyadin Doğubayazıt Eleşkirt Hamur Patnos Taşlıçay Tutak',
+    5: 'Merkez Göynücek Gümüşhacıköy Hamamözü Merzifon Suluova Taşova',
+    6: 'Akyurt Altındağ Ayaş Bala Beypazarı Çamlıdere Çankaya Çubuk Elmadağ Etimesgut Evren Gölbaşı Güdül '
+       'Haymana Kahramankazan Kalecik Keçiören Kızılcahamam Mamak Nallıhan Polatlı Pursaklar Sincan '
+       'Şereflikoçhisar Yenimahalle',
+    7: 'Akseki Aksu Alanya Demre Döşemealtı Elmalı Finike Gazipaşa Gündoğmuş İbradı Kaş Kemer Kepez Konyaaltı '
+       'Korkuteli Kumluca Manavgat Muratpaşa Serik',
+    8: 'Merkez Ardanuç Arhavi Borçka Hopa Kemalpaşa Murgul Şavşat Yusufeli',
+    9: 'Bozdoğan Buharkent Çine Didim Efeler Germencik İncirliova Karacasu Karpuzlu Koçarlı Köşk Kuşadası '
+       'Kuyucak Nazilli Söke Sultanhisar Yenipazar',
+    10: 'Altıeylül Ayvalık Balya Bandırma Bigadiç Burhaniye Dursunbey Edremit Erdek Gömeç Gönen Havran İvrindi '
+        'Karesi Kepsut Manyas Marmara Savaştepe Sındırgı Susurluk',
+    11: 'Merkez Bozüyük Gölpazarı İnhisar Osmaneli Pazaryeri Söğüt Yenipazar',
+    12: 'Merkez Adaklı Genç Karlıova Kiğı Solhan Yayladere Yedisu',
+    13: 'Merkez Adilcevaz Ahlat Güroymak Hizan Mutki Tatvan',
+    14: 'Merkez Dörtdivan Gerede Göynük Kıbrıscık Mengen Mudurnu Seben Yeniçağa',
+    15: 'Merkez Ağlasun Altınyayla Bucak Çavdır Çeltikçi Gölhisar Karamanlı Kemer Tefenni Yeşilova',
+    16: 'Büyükorhan Gemlik Gürsu Harmancık İnegöl İznik Karacabey Keles Kestel Mudanya Mustafakemalpaşa '
+        'Nilüfer Orhaneli Orhangazi Osmangazi Yenişehir Yıldırım',
+    17: 'Merkez Ayvacık Bayramiç Biga Bozcaada Çan Eceabat Ezine Gelibolu Gökçeada Lapseki Yenice',
+    18: 'Merkez Atkaracalar Bayramören Çerkeş Eldivan Ilgaz Kızılırmak Korgun Kurşunlu Orta Şabanözü Yapraklı',
+    19: 'Merkez Alaca Bayat Boğazkale Dodurga İskilip Kargı Laçin Mecitözü Oğuzlar Ortaköy Osmancık Sungurlu '
+        'Uğurludağ',
+    20: 'Acıpayam Babadağ Baklan Bekilli Beyağaç Bozkurt Buldan Çal Çameli Çardak Çivril Güney Honaz Kale '
+        'Merkezefendi Pamukkale Sarayköy Serinhisar Tavas',
+    21: 'Bağlar Bismil Çermik Çınar Çüngüş Dicle Eğil Ergani Hani Hazro Kayapınar Kocaköy Kulp Lice Silvan Sur '
+        'Yenişehir',
+    22: 'Merkez Enez Havsa İpsala Keşan Lalapaşa Meriç Süloğlu Uzunköprü',
+    23: 'Merkez Ağın Alacakaya Arıcak Baskil Karakoçan Keban Kovancılar Maden Palu Sivrice',
+    24: 'Merkez Çayırlı İliç Kemah Kemaliye Otlukbeli Refahiye Tercan Üzümlü',
+    25: 'Aşkale Aziziye Çat Hınıs Horasan İspir Karaçoban Karayazı Köprüköy Narman Oltu Olur Palandöken '
+        'Pasinler Pazaryolu Şenkaya Tekman Tortum Uzundere Yakutiye',
+    26: 'Alpu Beylikova Çifteler Günyüzü Han İnönü Mahmudiye Mihalgazi Mihalıççık Odunpazarı Sarıcakaya '
+        'Seyitgazi Sivrihisar Tepebaşı',
+    27: 'Araban İslahiye Karkamış Nizip Nurdağı Oğuzeli Şahinbey Şehitkamil Yavuzeli',
+    28: 'Merkez Alucra Bulancak Çamoluk Çanakçı Dereli Doğankent Espiye Eynesil Görele Güce Keşap Piraziz '
+        'Şebinkarahisar Tirebolu Yağlıdere',
+    29: 'Merkez Kelkit Köse Kürtün Şiran Torul',
+    30: 'Merkez Çukurca Derecik Şemdinli Yüksekova',
+    31: 'Altınözü Antakya Arsuz Belen Defne Dörtyol Erzin Hassa İskenderun Kırıkhan Kumlu Payas Reyhanlı '
+        'Samandağ Yayladağı',
+    32: 'Merkez Aksu Atabey Eğirdir Gelendost Gönen Keçiborlu Senirkent Sütçüler Şarkikaraağaç Uluborlu Yalvaç '
+        'Yenişarbademli',
+    33: 'Akdeniz Anamur Aydıncık Bozyazı Çamlıyayla Erdemli Gülnar Mezitli Mut Silifke Tarsus Toroslar '
+        'Yenişehir',
+    34: 'Adalar Arnavutköy Ataşehir Avcılar Bağcılar Bahçelievler Bakırköy Başakşehir Bayrampaşa Beşiktaş '
+        'Beykoz Beylikdüzü Beyoğlu Büyükçekmece Çatalca Çekmeköy Esenler Esenyurt Eyüpsultan Fatih '
+        'Gaziosmanpaşa Güngören Kadıköy Kağıthane Kartal Küçükçekmece Maltepe Pendik Sancaktepe Sarıyer '
+        'Silivri Sultanbeyli Sultangazi Şile Şişli Tuzla Ümraniye Üsküdar Zeytinburnu',
+    35: 'Aliağa Balçova Bayındır Bayraklı Bergama Beydağ Bornova Buca Çeşme Çiğli Dikili Foça Gaziemir '
+        'Güzelbahçe Karabağlar Karaburun Karşıyaka Kemalpaşa Kınık Kiraz Konak Menderes Menemen Narlıdere '
+        'Ödemiş Seferihisar Selçuk Tire Torbalı Urla',
+    36: 'Merkez Akyaka Arpaçay Digor Kağızman Sarıkamış Selim Susuz',
+    37: 'Merkez Abana Ağlı Araç Azdavay Bozkurt Cide Çatalzeytin Daday Devrekani Doğanyurt Hanönü İhsangazi '
+        'İnebolu Küre Pınarbaşı Seydiler Şenpazar Taşköprü Tosya',
+    38: 'Akkışla Bünyan Develi Felahiye Hacılar İncesu Kocasinan Melikgazi Özvatan Pınarbaşı Sarıoğlan Sarız '
+        'Talas Tomarza Yahyalı Yeşilhisar',
+    39: 'Merkez Babaeski Demirköy Kofçaz Lüleburgaz Pehlivanköy Pınarhisar Vize',
+    40: 'Merkez Akçakent Akpınar Boztepe Çiçekdağı Kaman Mucur',
+    41: 'Başiskele Çayırova Darıca Derince Dilovası Gebze Gölcük İzmit Kandıra Karamürsel Kartepe Körfez',
+    42: 'Ahırlı Akören Akşehir Altınekin Beyşehir Bozkır Cihanbeyli Çeltik Çumra Derbent Derebucak Doğanhisar '
+        'Emirgazi Ereğli Güneysınır Hadim Halkapınar Hüyük Ilgın Kadınhanı Karapınar Karatay Kulu Meram '
+        'Sarayönü Selçuklu Seydişehir Taşkent Tuzlukçu Yalıhüyük Yunak',
+    43: 'Merkez Altıntaş Aslanapa Çavdarhisar Domaniç Dumlupınar Emet Gediz Hisarcık Pazarlar Simav Şaphane '
+        'Tavşanlı',
+    44: 'Akçadağ Arapgir Arguvan Battalgazi Darende Doğanşehir Doğanyol Hekimhan Kale Kuluncak Pütürge Yazıhan '
+        'Yeşilyurt',
+    45: 'Ahmetli Akhisar Alaşehir Demirci Gölmarmara Gördes Kırkağaç Köprübaşı Kula Salihli Sarıgöl Saruhanlı '
+        'Selendi Soma Şehzadeler Turgutlu Yunusemre',
+    46: 'Afşin Andırın Çağlayancerit Dulkadiroğlu Ekinözü Elbistan Göksun Nurhak Onikişubat Pazarcık Türkoğlu',
+    47: 'Artuklu Dargeçit Derik Kızıltepe Mazıdağı Midyat Nusaybin Ömerli Savur Yeşilli',
+    48: 'Bodrum Dalaman Datça Fethiye Kavaklıdere Köyceğiz Marmaris Menteşe Milas Ortaca Seydikemer Ula Yatağan',
+    49: 'Merkez Bulanık Hasköy Korkut Malazgirt Varto',
+    50: 'Merkez Acıgöl Avanos Derinkuyu Gülşehir Hacıbektaş Kozaklı Ürgüp',
+    51: 'Merkez Altunhisar Bor Çamardı Çiftlik Ulukışla',
+    52: 'Akkuş Altınordu Aybastı Çamaş Çatalpınar Çaybaşı Fatsa Gölköy Gülyalı Gürgentepe İkizce Kabadüz '
+        'Kabataş Korgan Kumru Mesudiye Perşembe Ulubey Ünye',
+    53: 'Merkez Ardeşen Çamlıhemşin Çayeli Derepazarı Fındıklı Güneysu Hemşin İkizdere İyidere Kalkandere Pazar',
+    54: 'Adapazarı Akyazı Arifiye Erenler Ferizli Geyve Hendek Karapürçek Karasu Kaynarca Kocaali Pamukova '
+        'Sapanca Serdivan Söğütlü Taraklı',
+    55: 'Alaçam Asarcık Atakum Ayvacık Bafra Canik Çarşamba Havza İlkadım Kavak Ladik Ondokuzmayıs Salıpazarı '
+        'Tekkeköy Terme Vezirköprü Yakakent',
+    56: 'Merkez Baykan Eruh Kurtalan Pervari Şirvan Tillo',
+    57: 'Merkez Ayancık Boyabat Dikmen Durağan Erfelek Gerze Saraydüzü Türkeli',
+    58: 'Merkez Akıncılar Altınyayla Divriği Doğanşar Gemerek Gölova Gürün Hafik İmranlı Kangal Koyulhisar '
+        'Suşehri Şarkışla Ulaş Yıldızeli Zara',
+    59: 'Çerkezköy Çorlu Ergene Hayrabolu Kapaklı Malkara Marmaraereğlisi Muratlı Saray Süleymanpaşa Şarköy',
+    60: 'Merkez Almus Artova Başçiftlik Erbaa Niksar Pazar Reşadiye Sulusaray Turhal Yeşilyurt Zile',
+    61: 'Akçaabat Araklı Arsin Beşikdüzü Çarşıbaşı Çaykara Dernekpazarı Düzköy Hayrat Köprübaşı Maçka Of '
+        'Ortahisar Sürmene Şalpazarı Tonya Vakfıkebir Yomra',
+    62: 'Merkez Çemişgezek Hozat Mazgirt Nazımiye Ovacık Pertek Pülümür',
+    63: 'Akçakale Birecik Bozova Ceylanpınar Eyyübiye Halfeti Haliliye Harran Hilvan Karaköprü Siverek Suruç '
+        'Viranşehir',
+    64: 'Merkez Banaz Eşme Karahallı Sivaslı Ulubey',
+    65: 'Bahçesaray Başkale Çaldıran Çatak Edremit Erciş Gevaş Gürpınar İpekyolu Muradiye Özalp Saray Tuşba',
+    66: 'Merkez Akdağmadeni Aydıncık Boğazlıyan Çandır Çayıralan Çekerek Kadışehri Saraykent Sarıkaya Sorgun '
+        'Şefaatli Yenifakılı Yerköy',
+    67: 'Merkez Alaplı Çaycuma Devrek Ereğli Gökçebey Kilimli Kozlu',
+    68: 'Merkez Ağaçören Eskil Gülağaç Güzelyurt Ortaköy Sarıyahşi Sultanhanı',
+    69: 'Merkez Aydıntepe Demirözü',
+    70: 'Merkez Ayrancı Başyayla Ermenek Kazımkarabekir Sarıveliler',
+    71: 'Merkez Bahşılı Balışeyh Çelebi Delice Karakeçili Keskin Sulakyurt Yahşihan',
+    72: 'Merkez Beşiri Gercüş Hasankeyf Kozluk Sason',
+    73: 'Merkez Beytüşşebap Cizre Güçlükonak İdil Silopi Uludere',
+    74: 'Merkez Amasra Kurucaşile Ulus',
+    75: 'Merkez Çıldır Damal Göle Hanak Posof',
+    76: 'Merkez Aralık Karakoyunlu Tuzluca',
+    77: 'Merkez Altınova Armutlu Çınarcık Çiftlikköy Termal',
+    78: 'Merkez Eflani Eskipazar Ovacık Safranbolu Yenice',
+    79: 'Merkez Elbeyli Musabeyli Polateli',
+    80: 'Merkez Bahçe Düziçi Hasanbeyli Kadirli Sumbas Toprakkale',
+    81: 'Merkez Akçakoca Cumayeri Çilimli Gölyaka Gümüşova Kaynaşlı Yığılca',
+}
+
+# İl merkezinden uzak büyük ilçelerin yaklaşık konumu (plaka, ilçe) -> (enlem, boylam)
+# Listede olmayan ilçeler için il koordinatı kullanılır
+DISTRICT_COORDINATES = {
+    (1, 'Ceyhan'): (37.0290, 35.8120),
+    (1, 'Kozan'): (37.4550, 35.8150),
+    (6, 'Beypazarı'): (40.1670, 31.9200),
+    (6, 'Polatlı'): (39.5840, 32.1470),
+    (6, 'Sincan'): (39.9700, 32.5800),
+    (7, 'Alanya'): (36.5440, 31.9990),
+    (7, 'Kaş'): (36.2020, 29.6410),
+    (7, 'Kemer'): (36.6000, 30.5600),
+    (7, 'Manavgat'): (36.7870, 31.4430),
+    (7, 'Serik'): (36.9170, 31.1000),
+    (9, 'Didim'): (37.3750, 27.2670),
+    (9, 'Kuşadası'): (37.8580, 27.2610),
+    (9, 'Nazilli'): (37.9120, 28.3220),
+    (9, 'Söke'): (37.7510, 27.4100),
+    (10, 'Ayvalık'): (39.3190, 26.6950),
+    (10, 'Bandırma'): (40.3520, 27.9770),
+    (10, 'Edremit'): (39.5960, 27.0240),
+    (16, 'Gemlik'): (40.4310, 29.1560),
+    (16, 'İnegöl'): (40.0780, 29.5130),
+    (16, 'Mudanya'): (40.3750, 28.8830),
+    (17, 'Biga'): (40.2280, 27.2420),
+    (17, 'Gelibolu'): (40.4090, 26.6710),
+    (21, 'Bismil'): (37.8480, 40.6640),
+    (21, 'Ergani'): (38.2690, 39.7620),
+    (22, 'Keşan'): (40.8560, 26.6360),
+    (27, 'Nizip'): (37.0100, 37.7940),
+    (31, 'Dörtyol'): (36.8390, 36.2300),
+    (31, 'İskenderun'): (36.5870, 36.1730),
+    (31, 'Reyhanlı'): (36.2690, 36.5670),
+    (33, 'Anamur'): (36.0750, 32.8360),
+    (33, 'Erdemli'): (36.6050, 34.3080),
+    (33, 'Silifke'): (36.3770, 33.9340),
+    (33, 'Tarsus'): (36.9170, 34.8950),
+    (34, 'Arnavutköy'): (41.1850, 28.7400),
+    (34, 'Büyükçekmece'): (41.0210, 28.5850),
+    (34, 'Çatalca'): (41.1433, 28.4608),
+    (34, 'Esenyurt'): (41.0343, 28.6801),
+    (34, 'Kadıköy'): (40.9903, 29.0290),
+    (34, 'Pendik'): (40.8758, 29.2350),
+    (34, 'Silivri'): (41.0733, 28.2467),
+    (34, 'Şile'): (41.1750, 29.6125),
+    (34, 'Tuzla'): (40.8160, 29.3000),
+    (35, 'Aliağa'): (38.8000, 26.9720),
+    (35, 'Bergama'): (39.1200, 27.1800),
+    (35, 'Çeşme'): (38.3240, 26.3060),
+    (35, 'Ödemiş'): (38.2270, 27.9700),
+    (35, 'Torbalı'): (38.1550, 27.3620),
+    (39, 'Lüleburgaz'): (41.4040, 27.3560),
+    (41, 'Çayırova'): (40.8240, 29.3720),
+    (41, 'Darıca'): (40.7690, 29.3750),
+    (41, 'Dilovası'): (40.7790, 29.5440),
+    (41, 'Gebze'): (40.8027, 29.4307),
+    (41, 'Gölcük'): (40.7170, 29.8200),
+    (41, 'Körfez'): (40.7760, 29.7370),
+    (42, 'Akşehir'): (38.3570, 31.4160),
+    (42, 'Beyşehir'): (37.6770, 31.7250),
+    (42, 'Ereğli'): (37.5130, 34.0470),
+    (45, 'Akhisar'): (38.9180, 27.8400),
+    (45, 'Salihli'): (38.4830, 28.1400),
+    (45, 'Soma'): (39.1860, 27.6100),
+    (45, 'Turgutlu'): (38.5000, 27.7000),
+    (46, 'Elbistan'): (38.2060, 37.1980),
+    (47, 'Kızıltepe'): (37.1930, 40.5860),
+    (47, 'Midyat'): (37.4180, 41.3400),
+    (47, 'Nusaybin'): (37.0750, 41.2180),
+    (48, 'Bodrum'): (37.0344, 27.4305),
+    (48, 'Dalaman'): (36.7660, 28.8020),
+    (48, 'Fethiye'): (36.6210, 29.1160),
+    (48, 'Marmaris'): (36.8550, 28.2740),
+    (48, 'Milas'): (37.3160, 27.7830),
+    (52, 'Fatsa'): (41.0310, 37.5000),
+    (52, 'Ünye'): (41.1310, 37.2880),
+    (54, 'Hendek'): (40.7990, 30.7480),
+    (55, 'Bafra'): (41.5680, 35.9060),
+    (55, 'Çarşamba'): (41.1990, 36.7220),
+    (59, 'Çerkezköy'): (41.2850, 28.0000),
+    (59, 'Çorlu'): (41.1590, 27.8000),
+    (59, 'Kapaklı'): (41.3300, 27.9700),
+    (61, 'Akçaabat'): (41.0210, 39.5710),
+    (63, 'Birecik'): (37.0250, 37.9780),
+    (63, 'Siverek'): (37.7550, 39.3170),
+    (63, 'Viranşehir'): (37.2350, 39.7630),
+    (65, 'Erciş'): (39.0280, 43.3590),
+    (67, 'Ereğli'): (41.2800, 31.4200),
+    (73, 'Cizre'): (37.3300, 42.1900),
+    (73, 'Silopi'): (37.2490, 42.4690),
+    (77, 'Çınarcık'): (40.6430, 29.1210),
+    (78, 'Safranbolu'): (41.2520, 32.6940),
+    (81, 'Akçakoca'): (41.0870, 31.1170),
+}
@@ -0,0 +1,74 @@
+"""
+Veritabanı bağlantı metrikleri
+
+Django bağlantıları thread başına tutulur; CONN_MAX_AGE > 0 iken gunicorn
+gthread worker'ındaki her thread bağlantısını istekler arasında yeniden
+kullanır ve süre dolunca (veya health check başarısız olunca) kapatır.
+Bu modül süreç içindeki açılan bağlantı sayısını ve açık bağlantıların
+yaşını izler.
+"""
+import os
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_lock = threading.Lock()
+_opened_total = {}
+_wrappers = weakref.WeakSet()
+_started_at = time.time()
+
+
+@receiver(connection_created)
+def track_connection(sender, connection, **kwargs):
+    """Yeni açılan bağlantıyı kaydet"""
+    connection.nakliyenet_connected_at = time.monotonic()
+    with _lock:
+        _opened_total[connection.alias] = _opened_total.get(connection.alias, 0) + 1
+        _wrappers.add(connection)
+
+
+def opened_total():
+    """Alias başına süreç başından beri açılan bağlantı sayısı"""
+    with _lock:
+        return dict(_opened_total)
+
+
+def connection_stats():
+    """Süreç için bağlantı havuzu özeti (pool boyutu, yaş, toplam açılış)"""
+    now = time.monotonic()
+    with _lock:
+        wrappers = list(_wrappers)
+        opened = dict(_opened_total)
+
+    aliases = {}
+    for alias, db_settings in settings.DATABASES.items():
+        aliases[alias] = {
+            'conn_max_age': db_settings.get('CONN_MAX_AGE', 0),
+            'health_checks': db_settings.get('CONN_HEALTH_CHECKS', False),
+            'opened_total': opened.get(alias, 0),
+            'open': 0,
+            'ages': [],
+        }
+
+    for wrapper in wrappers:
+        # connection None ise thread bağlantıyı kapatmış
+        if wrapper.connection is None or wrapper.alias not in aliases:
+            continue
+        stats = aliases[wrapper.alias]
+        stats['open'] += 1
+        stats['ages'].append(now - wrapper.nakliyenet_connected_at)
+
+    for stats in aliases.values():
+        ages = stats.pop('ages')
+        stats['max_age_seconds'] = round(max(ages), 1) if ages else None
+        stats['avg_age_seconds'] = round(sum(ages) / len(ages), 1) if ages else None
+
+    return {
+        'pid': os.getpid(),
+        'uptime_seconds': round(time.time() - _started_at),
+        'databases': aliases,
+    }
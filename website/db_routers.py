@@ -0,0 +1,159 @@
+"""
+Read replica routing
+
+Okuma ağırlıklı sayfalar (@read_replica ile işaretli view'lar ve DRF list
+action'ları) sorgularını replica bağlantılarına gönderir. Diğer her şey
+'default' (primary) üzerinde kalır.
+
+Read-your-writes: kullanıcı yazma isteği (POST/PUT/PATCH/DELETE) yaptığında
+REPLICA_PIN_SECONDS boyunca bir cookie ile primary'ye sabitlenir; böylece
+kendi yazdığını replica gecikmesi yüzünden kaybolmuş görmez. GET içindeki
+yan yazmalar (görüntülenme sayacı gibi) sabitleme yapmaz, ancak aynı istekte
+yazmadan sonraki okumalar ve transaction içindeki okumalar primary'den
+yapılır.
+
+Karar ReplicaRoutingMiddleware'de verilir ve contextvar ile taşınır; thread
+ve async view'larda istekler birbirini etkilemez.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE_NAME = 'db_primary_pin'
+
+# Her zaman primary'den okunan uygulamalar (oturum, kimlik doğrulama)
+PRIMARY_ONLY_APPS = {'sessions', 'auth', 'contenttypes', 'account', 'socialaccount'}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """Tek bir isteğin yönlendirme durumu"""
+
+    def __init__(self, use_replica=False):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    """settings.DATABASES içindeki replica alias'ları"""
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def read_replica(view_func):
+    """View'ı replica'dan okunabilir olarak işaretle (sadece GET/HEAD)"""
+    @wraps(view_func)
+    def wrapped(*args, **kwargs):
+        return view_func(*args, **kwargs)
+    wrapped.use_read_replica = True
+    return wrapped
+
+
+def is_pinned(request):
+    """Kullanıcı yakın zamanda yazma yaptıysa primary'ye sabitlidir"""
+    return PIN_COOKIE_NAME in request.COOKIES
+
+
+@contextmanager
+def replica_reads(request=None):
+    """Blok içindeki okumaları replica'ya yönlendir (view dışı kullanım için)"""
+    if request is not None and (request.method not in SAFE_METHODS or is_pinned(request)):
+        yield
+        return
+
+    token = _state.set(RoutingState(use_replica=True))
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReadReplicaRouter:
+    """İşaretli isteklerde okumaları replica'ya, yazmaları primary'ye gönderir"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        # Transaction içindeki okumalar yazmalarla tutarlı olmalı
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica'lar primary'nin kopyası
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Şema sadece primary'ye uygulanır, replica'lar replikasyonla gelir
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    İsteğin replica'dan okunup okunamayacağına karar verir ve yazma yapan
+    kullanıcıyı PIN cookie'si ile primary'ye sabitler
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _state.set(RoutingState())
+        try:
+            return self._pin_after_write(request, self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    async def __acall__(self, request):
+        token = _state.set(RoutingState())
+        try:
+            return self._pin_after_write(request, await self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    def _pin_after_write(self, request, response):
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE_NAME, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not replica_aliases() or request.method not in SAFE_METHODS or is_pinned(request):
+            return None
+
+        # DRF ViewSet.as_view() {'get': 'list'} eşlemesini view üzerinde tutar
+        actions = getattr(view_func, 'actions', None) or {}
+        if getattr(view_func, 'use_read_replica', False) or actions.get(request.method.lower()) == 'list':
+            _state.get().use_replica = True
+        return None
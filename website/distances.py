@@ -0,0 +1,132 @@
+"""
+İller arası mesafe ve süre matrisi
+
+81x81 il çifti için tahmini karayolu mesafesi (km) açılışta bir kez
+hesaplanır ve plaka sırasıyla düz bir array'de (uint16, ~13 KB) tutulur;
+istek içinde trigonometri yapılmaz, okuma tek indeks erişimidir.
+
+- Mesafe: il merkezleri arası kuş uçuşu x gazetteer.ROAD_FACTOR
+- Kendi koordinatı olan ilçeler (Gebze, Alanya...) için mesafe ilk
+  sorulduğunda hesaplanır ve lru_cache'te tutulur; diğer ilçeler il
+  merkezi kabul edilir ve matristen okunur.
+- Süre mesafeden türetilir: AVERAGE_SPEED_KMH ile sürüş süresi, gün
+  sayısı sürücünün günlük DAILY_DRIVING_HOURS sürüş sınırına göre.
+- İlan mesafesi Shipment.distance_km kolonunda saklanır (kayıt sırasında
+  hesaplanır); annotate_price_per_km() km başına bütçe sıralaması içindir.
+"""
+import math
+from array import array
+from functools import lru_cache
+
+from django.db.models import FloatField, Value
+from django.db.models.functions import Cast, NullIf
+
+from . import gazetteer
+
+# Ağır vasıtanın şehirlerarası ortalama hızı (mola ve şehir içi dahil)
+AVERAGE_SPEED_KMH = 65
+# Tek sürücünün günlük sürüş sınırı (saat)
+DAILY_DRIVING_HOURS = 9
+# Çift sürücüyle bir günde gidilebilecek en uzun mesafe; teklifteki
+# teslimat gününün alt sınırı bundan hesaplanır
+MAX_DAILY_KM = 1100
+
+PROVINCE_COUNT = len(gazetteer.PROVINCES_BY_PLATE)
+
+
+def _build_matrix():
+    """Plaka sırasıyla mesafe matrisi (km)"""
+    provinces = [gazetteer.PROVINCES_BY_PLATE[plate] for plate in range(1, PROVINCE_COUNT + 1)]
+    # Her il için trigonometrik değerler bir kez hesaplanır
+    lats = [math.radians(province.lat) for province in provinces]
+    lons = [math.radians(province.lon) for province in provinces]
+    cos_lats = [math.cos(lat) for lat in lats]
+
+    km = array('H')
+    for i in range(PROVINCE_COUNT):
+        lat_i, lon_i, cos_i = lats[i], lons[i], cos_lats[i]
+        row = [
+            2 * gazetteer.EARTH_RADIUS_KM * math.asin(math.sqrt(
+                math.sin((lats[j] - lat_i) / 2) ** 2 + cos_i * cos_lats[j] * math.sin((lons[j] - lon_i) / 2) ** 2
+            )) * gazetteer.ROAD_FACTOR
+            for j in range(PROVINCE_COUNT)
+        ]
+        km.extend(round(value) for value in row)
+    return km
+
+
+_KM = _build_matrix()
+
+
+def _index(place):
+    return (place.plate - 1) * PROVINCE_COUNT
+
+
+def province_km(from_plate, to_plate):
+    return _KM[(from_plate - 1) * PROVINCE_COUNT + to_plate - 1]
+
+
+@lru_cache(maxsize=65536)
+def _place_km(from_id, to_id):
+    origin, destination = gazetteer.PLACES[from_id], gazetteer.PLACES[to_id]
+    return round(
+        gazetteer.haversine_km(origin.lat, origin.lon, destination.lat, destination.lon) * gazetteer.ROAD_FACTOR
+    )
+
+
+def _has_own_location(place):
+    return place.kind == 'district' and (place.plate, place.name) in gazetteer.DISTRICT_COORDINATES
+
+
+def distance_km(from_city, to_city, from_district='', to_district=''):
+    """Tahmini karayolu mesafesi (km); il tanınmazsa None"""
+    origin = gazetteer.locate(from_city, from_district)
+    destination = gazetteer.locate(to_city, to_district)
+    if origin is None or destination is None:
+        return None
+    if _has_own_location(origin) or _has_own_location(destination):
+        return _place_km(origin.id, destination.id)
+    return _KM[_index(origin) + destination.plate - 1]
+
+
+def driving_hours(km):
+    return km / AVERAGE_SPEED_KMH
+
+
+def transit_days(km):
+    """Tek sürücüyle tipik teslim süresi (gün)"""
+    return max(1, math.ceil(driving_hours(km) / DAILY_DRIVING_HOURS))
+
+
+def minimum_transit_days(km):
+    """Mesafenin fiziksel olarak taşınabileceği en kısa süre (gün)"""
+    return max(1, math.ceil(km / MAX_DAILY_KM))
+
+
+def eta(from_city, to_city, from_district='', to_district=''):
+    """{'distance_km', 'driving_hours', 'transit_days', 'minimum_days'}; il tanınmazsa None"""
+    km = distance_km(from_city, to_city, from_district, to_district)
+    if km is None:
+        return None
+    return {
+        'distance_km': km,
+        'driving_hours': round(driving_hours(km), 1),
+        'transit_days': transit_days(km),
+        'minimum_days': minimum_transit_days(km),
+    }
+
+
+def price_per_km(price, km):
+    if not price or not km:
+        return None
+    return round(float(price) / km, 2)
+
+
+def annotate_price_per_km(queryset):
+    """
+    İlanlara saklanan Shipment.distance_km'den `km_price` (TL/km) ekle;
+    mesafesi bilinmeyen ilanlarda NULL'dır.
+    """
+    return queryset.annotate(
+        km_price=Cast('suggested_price', FloatField()) / NullIf(Cast('distance_km', FloatField()), Value(0.0)),
+    )
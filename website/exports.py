@@ -0,0 +1,189 @@
+"""
+CSV dışa aktarma - ilan, teklif ve ödemeleri akış halinde indirir
+
+Sorgular values_list() + keyset sayfalama (website.keyset) ile parça parça okunur,
+satırlar StreamingHttpResponse üzerinden üretildikçe gönderilir. Model
+nesnesi oluşturulmaz ve sonuç kümesi bellekte tutulmaz; bir yıllık ödeme
+dökümü sabit bellekle akar.
+"""
+import csv
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import gazetteer, keyset
+from .models import Bid, Payment, Shipment
+
+# Veritabanından bir seferde çekilecek satır sayısı
+CHUNK_SIZE = 2000
+
+# Yanıta tek parça olarak yazılacak satır sayısı
+LINES_PER_YIELD = 500
+
+
+class Echo:
+    """csv.writer için yazılan satırı olduğu gibi döndüren sahte dosya"""
+
+    def write(self, value):
+        return value
+
+
+# Her dışa aktarım: model, (başlık, alan) kolonları, şehir alanları
+EXPORTS = {
+    'shipments': {
+        'model': Shipment,
+        'columns': [
+            ('ilan_id', 'shipment_id'),
+            ('takip_no', 'tracking_number'),
+            ('baslik', 'title'),
+            ('yuk_tipi', 'cargo_type'),
+            ('durum', 'status'),
+            ('yuk_sahibi', 'shipper_email'),
+            ('cikis_il', 'from_address_city'),
+            ('cikis_ilce', 'from_address_district'),
+            ('varis_il', 'to_address_city'),
+            ('varis_ilce', 'to_address_district'),
+            ('agirlik_kg', 'weight'),
+            ('onerilen_fiyat', 'suggested_price'),
+            ('teklif_sayisi', 'bid_count'),
+            ('yukleme_tarihi', 'pickup_date'),
+            ('olusturma', 'created_at'),
+            ('tamamlanma', 'completed_at'),
+        ],
+        'city_fields': ['from_address_city', 'to_address_city'],
+    },
+    'bids': {
+        'model': Bid,
+        'columns': [
+            ('teklif_id', 'bid_id'),
+            ('takip_no', 'tracking_number'),
+            ('tasiyici', 'carrier_email'),
+            ('yuk_sahibi', 'shipper_email'),
+            ('teklif_fiyat', 'offered_price'),
+            ('karsi_teklif', 'counter_offer_price'),
+            ('tahmini_gun', 'estimated_delivery_days'),
+            ('durum', 'status'),
+            ('cikis_il', 'shipment__from_address_city'),
+            ('varis_il', 'shipment__to_address_city'),
+            ('olusturma', 'created_at'),
+            ('kabul', 'accepted_at'),
+            ('red', 'rejected_at'),
+        ],
+        'city_fields': ['shipment__from_address_city', 'shipment__to_address_city'],
+    },
+    'payments': {
+        'model': Payment,
+        'columns': [
+            ('odeme_id', 'payment_id'),
+            ('takip_no', 'shipment__tracking_number'),
+            ('yuk_sahibi', 'shipper__user__email'),
+            ('tasiyici', 'carrier__user__email'),
+            ('tutar', 'amount'),
+            ('komisyon', 'platform_fee'),
+            ('tasiyici_tutari', 'carrier_amount'),
+            ('durum', 'status'),
+            ('odeme_yontemi', 'payment_method'),
+            ('saglayici', 'payment_provider'),
+            ('islem_id', 'transaction_id'),
+            ('transfer_edildi', 'admin_transferred'),
+            ('cikis_il', 'shipment__from_address_city'),
+            ('varis_il', 'shipment__to_address_city'),
+            ('olusturma', 'created_at'),
+            ('odeme', 'paid_at'),
+            ('tamamlanma', 'completed_at'),
+        ],
+        'city_fields': ['shipment__from_address_city', 'shipment__to_address_city'],
+    },
+}
+
+
+def _date_param(params, name):
+    """YYYY-MM-DD parametresi; boşsa None, geçersizse (2025-02-30, 'dün') ValueError"""
+    value = (params.get(name) or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{name} must be a valid date (YYYY-MM-DD)")
+    return parsed
+
+
+def filter_queryset(queryset, kind, params):
+    """
+    Tarih aralığı, durum ve şehir filtrelerini uygular
+    params: date_from / date_to (YYYY-MM-DD, created_at), status, city
+    Geçersiz tarih ValueError verir (API 400 döner).
+    """
+    date_from = _date_param(params, 'date_from')
+    date_to = _date_param(params, 'date_to')
+    if date_from:
+        queryset = queryset.filter(created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        queryset = queryset.filter(created_at__lte=timezone.make_aware(datetime.combine(date_to, time.max)))
+
+    statuses = [s for s in (params.get('status') or '').split(',') if s]
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+
+    city = (params.get('city') or '').strip()
+    if city:
+        # "istanbul" / "İSTANBUL" -> "İstanbul"
+        city = gazetteer.province_name(city) or city
+        condition = Q()
+        for field in EXPORTS[kind]['city_fields']:
+            condition |= Q(**{field: city})
+        queryset = queryset.filter(condition)
+
+    return queryset
+
+
+def _format(value):
+    """CSV hücresi için değer biçimlendirme"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    return value
+
+
+def iter_csv_rows(queryset, kind):
+    """Başlık + satırları CSV metni olarak üretir"""
+    columns = EXPORTS[kind]['columns']
+    writer = csv.writer(Echo(), delimiter=';')
+
+    yield '\ufeff' + writer.writerow([header for header, _ in columns])
+
+    rows = keyset.iterate(
+        queryset.values_list(*[field for _, field in columns]),
+        ('-created_at', '-pk'),
+        CHUNK_SIZE,
+    )
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([_format(value) for value in row]))
+        if len(lines) >= LINES_PER_YIELD:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def stream_csv(queryset, kind):
+    """Sorguyu CSV olarak akıtan StreamingHttpResponse döndürür"""
+    filename = f'{kind}-{timezone.localdate():%Y%m%d}.csv'
+    response = StreamingHttpResponse(iter_csv_rows(queryset, kind), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,211 @@
+"""
+Türkiye il/ilçe sözlüğü (gazetteer)
+
+website.cities verisi uygulama açılışında bir kez okunur ve sorgu
+yapılarına çevrilir; istek içinde sözlük veya liste kurulmaz.
+
+- Anahtarlar Türkçe büyük/küçük harf ve aksan farkı gözetmez:
+  "İSTANBUL", "istanbul", "Istanbul" -> "istanbul"
+- Slug'lar URL'lerde kullanılır (/nakliye/<slug>/). İl slug'ı il adıdır;
+  başka ilde aynı adlı ilçe varsa ilçe slug'ına il eklenir (eregli-konya).
+- Otomatik tamamlama: il ve ilçe anahtarları üzerinde önek ağacı (trie).
+  Her düğüm en iyi AUTOCOMPLETE_LIMIT sonucu tutar; arama önek uzunluğu
+  kadar adımdır.
+- Konumlar il merkezinin (büyük ilçelerde ilçenin) yaklaşık koordinatıdır;
+  mesafe ve süre website.distances'ta (kuş uçuşu mesafe x ROAD_FACTOR).
+"""
+import math
+import re
+from collections import namedtuple
+
+from .cities import DISTRICT_COORDINATES, DISTRICTS, PROVINCES
+
+# Karayolu mesafesi / kuş uçuşu mesafe (Türkiye ortalaması)
+ROAD_FACTOR = 1.25
+EARTH_RADIUS_KM = 6371.0
+
+AUTOCOMPLETE_LIMIT = 10
+
+# İl sayfası dışında sitemap'e eklenen ilçe sayfaları
+LANDING_DISTRICTS = [(41, 'Gebze'), (41, 'Darıca'), (54, 'Adapazarı')]
+
+Place = namedtuple('Place', 'id kind name province plate slug key lat lon')
+
+_FOLD = str.maketrans({
+    'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u', 'â': 'a', 'î': 'i', 'û': 'u',
+})
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def fold(value):
+    """Türkçe harf ve aksan farkı gözetmeyen arama anahtarı"""
+    value = (value or '').strip().replace('İ', 'i').replace('I', 'ı').lower().translate(_FOLD)
+    return _NON_ALNUM.sub(' ', value).strip()
+
+
+def slugify(value):
+    return fold(value).replace(' ', '-')
+
+
+def _build():
+    places = []
+    provinces, province_keys, district_keys, districts_of = {}, {}, {}, {}
+
+    for plate, name, lat, lon in PROVINCES:
+        place = Place(len(places), 'province', name, name, plate, slugify(name), fold(name), lat, lon)
+        places.append(place)
+        provinces[plate] = place
+        province_keys[place.key] = place
+        province_keys[f'{plate:02d}'] = place
+
+    # Aynı adlı ilçeler ve il adıyla çakışanlar için slug'a il eklenir
+    name_counts = {}
+    for names in DISTRICTS.values():
+        for name in names.split():
+            name_counts[fold(name)] = name_counts.get(fold(name), 0) + 1
+
+    for plate, names in DISTRICTS.items():
+        province = provinces[plate]
+        ids = []
+        for name in names.split():
+            key = fold(name)
+            if name == 'Merkez' or name_counts[key] > 1 or key in province_keys:
+                slug = f'{slugify(name)}-{province.slug}'
+            else:
+                slug = slugify(name)
+            lat, lon = DISTRICT_COORDINATES.get((plate, name), (province.lat, province.lon))
+            place = Place(len(places), 'district', name, province.name, plate, slug, key, lat, lon)
+            places.append(place)
+            district_keys[(plate, key)] = place
+            ids.append(place.id)
+        districts_of[plate] = tuple(ids)
+
+    slugs = {place.slug: place for place in places if place.name != 'Merkez'}
+    return places, provinces, province_keys, district_keys, districts_of, slugs
+
+
+PLACES, PROVINCES_BY_PLATE, _province_keys, _district_keys, _districts_of, _slugs = _build()
+
+
+def _rank(place):
+    # İller önce, sonra konumu bilinen büyük ilçeler, sonra alfabetik
+    has_own_location = (place.plate, place.name) in DISTRICT_COORDINATES
+    return (place.kind != 'province', not has_own_location, place.key)
+
+
+def _build_trie():
+    root = {}
+    for place in sorted(PLACES, key=_rank):
+        if place.name == 'Merkez':
+            continue
+        node = root
+        for char in place.key:
+            node = node.setdefault(char, {})
+            ids = node.setdefault(None, [])
+            if len(ids) < AUTOCOMPLETE_LIMIT:
+                ids.append(place.id)
+
+    # Listeler tuple'a çevrilir (daha az bellek, salt okunur)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for char, child in node.items():
+            if char is None:
+                node[None] = tuple(child)
+            else:
+                stack.append(child)
+    return root
+
+
+_trie = _build_trie()
+
+
+def find_province(value):
+    """İl adı (yazım farkı gözetmeden) veya plaka kodu -> Place"""
+    key = fold(str(value or ''))
+    if key.isdigit():
+        key = key.zfill(2)
+    return _province_keys.get(key)
+
+
+def province_name(value):
+    """Girilen il adının standart yazımı ("istanbul" -> "İstanbul"); tanınmazsa None"""
+    province = find_province(value)
+    return province.name if province else None
+
+
+def find_district(city, district):
+    province = find_province(city)
+    if province is None:
+        return None
+    return _district_keys.get((province.plate, fold(district)))
+
+
+def find_by_slug(slug):
+    """URL slug'ı -> il veya ilçe (Place)"""
+    return _slugs.get(slugify(slug))
+
+
+def districts(city):
+    province = find_province(city)
+    if province is None:
+        return []
+    return [PLACES[place_id] for place_id in _districts_of[province.plate]]
+
+
+def autocomplete(prefix, city=None, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Önekle başlayan yerler. city verilirse sadece o ilin ilçeleri
+    (en fazla 39 ilçe, doğrudan taranır), verilmezse il ve ilçeler (trie).
+    """
+    key = fold(prefix)
+    limit = min(limit, AUTOCOMPLETE_LIMIT)
+
+    if city:
+        return [place for place in districts(city) if place.key.startswith(key)][:limit]
+
+    if not key:
+        return []
+    node = _trie
+    for char in key:
+        node = node.get(char)
+        if node is None:
+            return []
+    return [PLACES[place_id] for place_id in node[None][:limit]]
+
+
+def locate(city, district=''):
+    """İl/ilçe -> Place; ilçe tanınmazsa il"""
+    if district:
+        place = find_district(city, district)
+        if place is not None:
+            return place
+    return find_province(city)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def sitemap_slugs():
+    """Şehir sayfası slug'ları: tüm iller ve LANDING_DISTRICTS"""
+    slugs = [province.slug for province in PROVINCES_BY_PLATE.values()]
+    slugs += [_district_keys[(plate, fold(name))].slug for plate, name in LANDING_DISTRICTS]
+    return slugs
+
+
+class ProvinceSlugConverter:
+    """
+    Sadece il slug'larıyla eşleşen path converter: /nakliye/<il>-<il>/
+    güzergah sayfaları ilçe ve şehir sayfalarından URL'de ayrılır.
+    İl slug'ları tire içermez; uzun olanlar önce denenir.
+    """
+    regex = '|'.join(sorted((province.slug for province in PROVINCES_BY_PLATE.values()), key=len, reverse=True))
+
+    def to_python(self, value):
+        return _slugs[value]
+
+    def to_url(self, value):
+        return value.slug if isinstance(value, Place) else slugify(value)
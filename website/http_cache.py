@@ -0,0 +1,200 @@
+"""
+Dinamik yanıtlar için sıkıştırma ve HTTP önbellek politikası
+
+nginx sadece /static/ altını sıkıştırıyordu; HTML ve JSON yanıtları
+sıkıştırmasız ve Cache-Control başlığı olmadan gidiyordu.
+
+CompressionMiddleware: HTML, JSON ve XML (sitemap) yanıtlarını sıkıştırır.
+Brotli sadece paylaşılabilir (public, cookie'siz, anonim) yanıtlarda
+kullanılır. Kişisel veri, CSRF token veya oturum içeren yanıtlar Django'nun
+gzip yoluna gider; orada BREACH'e karşı rastgele uzunlukta dolgu eklenir,
+Brotli yolunda eklenmez. Statik dosyalar
+WhiteNoise'un collectstatic sırasında ürettiği .br/.gz kopyalarından sunulur,
+burada tekrar sıkıştırılmaz.
+
+CachePolicyMiddleware: view'ın işaretine göre Cache-Control/Vary koyar.
+- @public_page: SEO sayfaları; anonim ziyaretçiye public, max-age/s-maxage ile
+- @private_page: kişisel panolar (finans, teklifler); private, no-store
+- İşaretsiz view'lar: private, no-cache
+
+Giriş yapmış kullanıcıya veya cookie set eden yanıtlara (CSRF token'lı
+formlar, mesajlar) public sayfa bile private gider. View kendi
+Cache-Control'ünü koyduysa (thumbnail, cache_page) dokunulmaz.
+"""
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # Brotli kurulu değilse sadece gzip
+    brotli = None
+
+re_accepts_br = re.compile(r'\bbr\b')
+re_public = re.compile(r'(?:^|,)\s*public\s*(?:,|$)', re.IGNORECASE)
+
+# Sıkıştırılan içerik tipleri (resim, CSV, dosya indirmeleri hariç)
+COMPRESSIBLE_TYPES = ('text/html', 'application/json', 'application/xml', 'text/xml')
+
+# Dinamik içerik her istekte sıkıştırıldığı için hızlı seviye (11 statik build içindir)
+BROTLI_QUALITY = 5
+
+PUBLIC = 'public'
+PRIVATE = 'private'
+
+
+def public_page(view_func=None, *, max_age=None, s_maxage=None):
+    """
+    View'ı herkese açık ve önbelleklenebilir olarak işaretle (SEO sayfaları).
+    Süreler verilmezse PUBLIC_PAGE_MAX_AGE / PUBLIC_PAGE_S_MAXAGE kullanılır;
+    sadece max_age verilirse CDN de aynı süreyi kullanır.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            return func(*args, **kwargs)
+        wrapped.cache_policy = PUBLIC
+        wrapped.cache_max_age = max_age
+        wrapped.cache_s_maxage = s_maxage
+        return wrapped
+
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
+
+
+def private_page(view_func):
+    """View'ı kişisel veri gösteren pano olarak işaretle (hiçbir yerde saklanmaz)"""
+    @wraps(view_func)
+    def wrapped(*args, **kwargs):
+        return view_func(*args, **kwargs)
+    wrapped.cache_policy = PRIVATE
+    return wrapped
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES
+
+
+def is_shareable(request, response):
+    """
+    Yanıt gizli veri taşımıyor mu? Brotli yolunda BREACH dolgusu olmadığı için
+    sadece public önbelleklenebilir, cookie set etmeyen, anonim yanıtlar.
+    """
+    if not re_public.search(response.get('Cache-Control', '')):
+        return False
+    if response.cookies:
+        return False
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+def compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    async for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    HTML/JSON/XML yanıtlarını Brotli (paylaşılabilir yanıtlar) veya gzip ile
+    sıkıştırır. gzip yolu Django'nun GZipMiddleware'idir (BREACH'e karşı
+    rastgele dolgu dahil); kişisel yanıtlar her zaman bu yoldan geçer.
+    """
+
+    def process_response(self, request, response):
+        if not is_compressible(response):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or not re_accepts_br.search(ae) or not is_shareable(request, response):
+            return super().process_response(request, response)
+
+        if not response.streaming and len(response.content) < 200:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_brotli_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = compress_brotli(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class CachePolicyMiddleware(MiddlewareMixin):
+    """View işaretine göre Cache-Control ve Vary başlıklarını koyar"""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._cache_view = view_func
+        return None
+
+    def process_response(self, request, response):
+        if response.has_header('Cache-Control'):
+            return response
+
+        view_func = getattr(request, '_cache_view', None)
+        policy = getattr(view_func, 'cache_policy', None)
+
+        if policy == PUBLIC and self._is_shareable(request, response):
+            max_age = getattr(view_func, 'cache_max_age', None)
+            s_maxage = getattr(view_func, 'cache_s_maxage', None)
+            if max_age is None:
+                max_age = settings.PUBLIC_PAGE_MAX_AGE
+                s_maxage = settings.PUBLIC_PAGE_S_MAXAGE if s_maxage is None else s_maxage
+            elif s_maxage is None:
+                s_maxage = max_age
+            patch_cache_control(response, public=True, max_age=max_age, s_maxage=s_maxage)
+            # Aynı URL giriş yapmış kullanıcıya farklı (kişisel navbar) döner
+            patch_vary_headers(response, ('Cookie',))
+        elif policy == PRIVATE:
+            patch_cache_control(response, private=True, no_store=True)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @staticmethod
+    def _is_shareable(request, response):
+        if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+            return False
+        # Set-Cookie taşıyan yanıt paylaşılan önbelleğe girerse cookie başkasına gider
+        if response.cookies:
+            return False
+        user = getattr(request, 'user', None)
+        return user is None or not user.is_authenticated
@@ -0,0 +1,157 @@
+"""
+Dış HTTP çağrıları için paylaşılan istemci
+
+Async view'lar her istekte yeni bağlantı açmak yerine event loop başına tek
+bir httpx.AsyncClient kullanır; keep-alive bağlantıları (Google OAuth vb.)
+istekler arasında yeniden kullanılır. Tüm çağrılar zaman aşımına tabidir;
+geçici hatalar jitter'lı bekleme ile yeniden denenir ve discovery/JWKS gibi
+belgeler önbelleklenir.
+
+WSGI altında (Procfile) async view her istekte yeni bir event loop'ta
+çalışır; loop başına istemci orada yeniden kullanılmaz ve kapatılmadan
+kalır. Bu tür view'lar scoped_async_client ile sarılır: ASGI dışında istek
+süresince bir istemci açılır ve istek bitince kapatılır.
+"""
+import asyncio
+import contextvars
+import functools
+import random
+import threading
+import time
+import weakref
+
+import httpx
+from django.core.handlers.asgi import ASGIRequest
+
+# Bağlantı kurma ve toplam istek zaman aşımı (saniye)
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=10, keepalive_expiry=60)
+
+_async_clients = weakref.WeakKeyDictionary()
+# İstek süresince kullanılan istemci (scoped_async_client)
+_scoped_client = contextvars.ContextVar('http_client_scoped', default=None)
+_sync_client = None
+_sync_client_lock = threading.Lock()
+
+
+def get_async_client():
+    """Çalışan event loop'a ait paylaşılan AsyncClient (istek kapsamında o isteğinki)"""
+    scoped = _scoped_client.get()
+    if scoped is not None:
+        return scoped
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _async_clients[loop] = client
+    return client
+
+
+def scoped_async_client(view):
+    """
+    Async view decorator'ı: ASGI'de loop başına paylaşılan istemci kullanılır;
+    WSGI'de (istek başına kısa ömürlü loop) istek için açılan istemci view
+    bitince kapatılır.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if isinstance(request, ASGIRequest):
+            return await view(request, *args, **kwargs)
+
+        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS) as client:
+            token = _scoped_client.set(client)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _scoped_client.reset(token)
+
+    return wrapper
+
+
+def get_client():
+    """Sync view'lar için süreç genelinde paylaşılan (thread-safe) httpx.Client"""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        with _sync_client_lock:
+            if _sync_client is None or _sync_client.is_closed:
+                _sync_client = httpx.Client(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+    return _sync_client
+
+
+# Yeniden denenebilir durum kodları (sadece güvenli/idempotent isteklerde)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+RETRY_BACKOFF = 0.25  # saniye, her denemede iki katına çıkar
+RETRY_BACKOFF_MAX = 2.0
+
+# URL -> (geçerlilik bitiş zamanı, JSON) ; discovery/JWKS gibi belgeler için
+_json_cache = {}
+_json_cache_locks = weakref.WeakKeyDictionary()
+
+
+async def request_with_retry(method, url, retries=2, **kwargs):
+    """
+    Paylaşılan istemci ile istek at; geçici hatalarda jitter'lı üstel bekleme
+    ile yeniden dene.
+
+    Bağlantı kurulamadıysa (istek sunucuya hiç ulaşmadı) her istek tekrar
+    denenir. Okuma zaman aşımı ve 5xx/429 yanıtları sadece GET/HEAD için
+    tekrar denenir; OAuth code gibi tek kullanımlık POST'lar iki kez
+    gönderilmez.
+    """
+    client = get_async_client()
+    idempotent = method.upper() in ('GET', 'HEAD')
+
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            response = await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            if last_attempt:
+                raise
+        except httpx.TimeoutException:
+            if last_attempt or not idempotent:
+                raise
+        else:
+            if last_attempt or not idempotent or response.status_code not in RETRY_STATUSES:
+                return response
+
+        # Full jitter: 0 ile üstel sınır arasında rastgele bekle
+        delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * (2 ** attempt))
+        await asyncio.sleep(random.uniform(0, delay))
+
+
+async def get_json_cached(url, default_ttl=3600, force_refresh=False):
+    """
+    JSON belgesini getir ve süreç içinde önbellekle
+
+    Süre yanıtın Cache-Control max-age değerinden alınır (Google JWKS ve
+    discovery belgeleri bunu gönderir), yoksa default_ttl kullanılır.
+    """
+    now = time.monotonic()
+    cached = _json_cache.get(url)
+    if cached and not force_refresh and cached[0] > now:
+        return cached[1]
+
+    lock = _json_cache_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    async with lock:
+        # Kilit beklenirken başka bir istek yenilemiş olabilir
+        cached = _json_cache.get(url)
+        if cached and not force_refresh and cached[0] > time.monotonic():
+            return cached[1]
+
+        response = await request_with_retry('GET', url)
+        response.raise_for_status()
+        data = response.json()
+        _json_cache[url] = (time.monotonic() + _max_age(response, default_ttl), data)
+        return data
+
+
+def _max_age(response, default_ttl):
+    """Cache-Control max-age (saniye); yoksa default_ttl"""
+    for directive in response.headers.get('cache-control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name.lower() == 'max-age' and value.isdigit():
+            return int(value)
+    return default_ttl
@@ -0,0 +1,57 @@
+"""
+Birincil anahtar üretimi - zaman sıralı UUIDv7
+
+Shipment, Bid ve Payment anahtarları native UUID olarak saklanır (Postgres'te
+16 byte). UUIDv7'nin ilk 48 biti milisaniye zaman damgası olduğundan yeni
+kayıtlar index'in sonuna eklenir; uuid4 gibi B-tree'yi rastgele bölmez.
+
+UUID olmayan eski anahtarlar 0014 migration'ında legacy_uuid() ile sabit bir
+UUID'ye çevrildi. parse_id() aynı dönüşümü yaptığı için eski URL'ler
+çalışmaya devam eder.
+"""
+import os
+import time
+import uuid
+
+# Eski (UUID olmayan) anahtarların uuid5 namespace'i - değiştirilmemeli
+LEGACY_NAMESPACE = uuid.UUID('5b1f6c0e-3a9d-4c8e-9f3a-6e2d7b4a1c90')
+
+
+def uuid7():
+    """RFC 9562 UUIDv7: 48 bit unix ms + 74 bit rastgele"""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= int.from_bytes(os.urandom(10), 'big')
+    # version 7
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    # variant 10xx
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def legacy_uuid(value):
+    """UUID olmayan eski anahtarın sabit UUID karşılığı"""
+    return uuid.uuid5(LEGACY_NAMESPACE, str(value))
+
+
+def parse_id(value):
+    """URL/istek parametresindeki anahtarı UUID'ye çevir"""
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return legacy_uuid(value)
+
+
+class PublicIdConverter:
+    """URL'deki UUID veya eski formattaki anahtarı kabul eden path converter"""
+    regex = '[^/]+'
+
+    def to_python(self, value):
+        return parse_id(value)
+
+    def to_url(self, value):
+        return str(value)
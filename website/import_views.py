@@ -0,0 +1,97 @@
+"""
+Bulk Import Views - Toplu İlan Yükleme
+Kurumsal yük sahipleri CSV/XLSX dosyası ile çok sayıda ilan oluşturur
+"""
+import os
+from datetime import timedelta
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from .bulk_import import COLUMNS, REQUIRED_COLUMNS, start_import, template_csv
+from .models import ShipmentImport
+from .user_cache import get_user_profile
+
+ALLOWED_EXTENSIONS = ('.csv', '.xlsx')
+
+PROCESSING_REFRESH_WINDOW = timedelta(hours=1)
+
+
+@login_required
+def toplu_ilan_yukle(request):
+    """
+    Toplu ilan yükleme sayfası
+    GET: yükleme formu ve son yüklemeler, POST: dosyayı arka planda işle
+    """
+    profile = get_user_profile(request)
+    if profile is None:
+        messages.error(request, 'Profil bulunamadı.')
+        return redirect('website:profil')
+
+    if profile.user_type != 0:
+        messages.warning(request, 'Toplu ilan yükleme sadece yük sahipleri içindir.')
+        return redirect('website:index')
+
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if not upload:
+            messages.error(request, 'Lütfen bir dosya seçin.')
+            return redirect('website:toplu_ilan_yukle')
+
+        extension = os.path.splitext(upload.name)[1].lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            messages.error(request, 'Sadece .csv ve .xlsx dosyaları yüklenebilir.')
+            return redirect('website:toplu_ilan_yukle')
+
+        shipment_import = ShipmentImport.objects.create(
+            shipper=profile,
+            file_name=upload.name[:255],
+        )
+        start_import(shipment_import, upload)
+        messages.info(request, 'Dosyanız işleniyor. Sonuç aşağıdaki listede görünecek.')
+
+        return redirect('website:toplu_ilan_yukle')
+
+    imports = list(ShipmentImport.objects.filter(shipper=profile)[:10])
+    context = {
+        'title': 'Toplu İlan Yükle - NAKLIYE NET',
+        'description': 'CSV veya Excel dosyası ile toplu nakliye ilanı oluşturun',
+        'imports': imports,
+        # İşlenen yükleme varsa sayfa kendini yeniler (worker yeniden başladıysa
+        # kayıt process_shipment_imports çalışana kadar 'processing' kalır;
+        # eski kayıtlar için yenileme yapılmaz)
+        'processing': any(
+            item.status == 'processing' and item.created_at > timezone.now() - PROCESSING_REFRESH_WINDOW
+            for item in imports
+        ),
+        'columns': COLUMNS,
+        'required_columns': REQUIRED_COLUMNS,
+    }
+    return render(request, 'website/toplu_ilan_yukle.html', context)
+
+
+@login_required
+def toplu_ilan_sablon(request):
+    """Örnek satırlı CSV şablonunu indir"""
+    response = HttpResponse(template_csv(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="toplu-ilan-sablonu.csv"'
+    return response
+
+
+@login_required
+def toplu_ilan_hata_raporu(request, import_id):
+    """Yüklemenin satır bazlı hata raporunu indir - sadece yükleyen kullanıcı"""
+    shipment_import = get_object_or_404(ShipmentImport, pk=import_id, shipper__user=request.user)
+
+    if not shipment_import.error_report:
+        raise Http404("Hata raporu bulunamadı")
+
+    return FileResponse(
+        shipment_import.error_report.open('rb'),
+        as_attachment=True,
+        filename=f'toplu-ilan-hatalar-{shipment_import.pk}.csv',
+        content_type='text/csv; charset=utf-8',
+    )
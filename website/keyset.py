@@ -0,0 +1,73 @@
+"""
+Büyük sorguları keyset sayfalama ile parça parça okuma
+
+QuerySet.iterator() PostgreSQL'de server-side cursor kullanır; pgbouncer
+transaction pooling arkasında (DB_DISABLE_SERVER_SIDE_CURSORS) cursor
+kapalıdır ve psycopg2 tüm sonucu ilk satırdan önce belleğe alır. iterate()
+bunun yerine sıralama anahtarına göre "son satırdan sonrası" + LIMIT ile
+ardışık kısa sorgular çalıştırır; bellek kullanımı chunk_size ile sınırlı
+kalır ve bağlantı ayarından bağımsızdır.
+
+- ordering'in son alanı tekil olmalı (genelde 'pk'), alanlar NULL olmamalı.
+- values() / values_list() / model queryset'leriyle çalışır; satırlar
+  queryset'in kendi biçiminde döner.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, Q
+
+ALIAS = 'keyset_{}'
+
+
+def _after(ordering, last):
+    """Sıralamada last anahtarından sonra gelen satırların koşulu"""
+    conditions = []
+    for i, name in enumerate(ordering):
+        equal = {ALIAS.format(j): last[j] for j in range(i)}
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        conditions.append(Q(**equal, **{f'{ALIAS.format(i)}__{lookup}': last[i]}))
+    condition = reduce(or_, conditions)
+    # İlk anahtar üzerindeki aralık koşulu planner'ın index'i kullanmasını kolaylaştırır
+    first = 'lte' if ordering[0].startswith('-') else 'gte'
+    return Q(**{f'{ALIAS.format(0)}__{first}': last[0]}) & condition
+
+
+def iterate(queryset, ordering, chunk_size):
+    """queryset satırlarını ordering sırasıyla, chunk_size'lık sorgularla üret"""
+    names = [ALIAS.format(i) for i in range(len(ordering))]
+    keyed = queryset.annotate(**{
+        alias: F(name.lstrip('-')) for alias, name in zip(names, ordering)
+    }).order_by(*[
+        f'-{alias}' if name.startswith('-') else alias for alias, name in zip(names, ordering)
+    ])
+
+    last = None
+    while True:
+        page = keyed if last is None else keyed.filter(_after(ordering, last))
+        rows = list(page[:chunk_size])
+        if rows:
+            last = _key(rows[-1], names)
+        for row in rows:
+            yield _strip(row, names)
+        if len(rows) < chunk_size:
+            return
+
+
+def _key(row, names):
+    if isinstance(row, dict):
+        return [row[name] for name in names]
+    if isinstance(row, tuple):
+        return list(row[-len(names):])
+    return [getattr(row, name) for name in names]
+
+
+def _strip(row, names):
+    """Sıralama için eklenen alanları satırdan çıkar"""
+    if isinstance(row, dict):
+        for name in names:
+            del row[name]
+        return row
+    if isinstance(row, tuple):
+        return row[:-len(names)]
+    return row
@@ -0,0 +1,224 @@
+"""
+Çift taraflı muhasebe defteri (ledger)
+
+Para durumu Payment.amount / platform_fee / carrier_amount / status /
+admin_transferred alanlarına dağılmıştı; "taşıyıcıya ne kadar borçluyuz" veya
+"bu ayki komisyon" sorusu tüm ödemeleri taramayı gerektiriyordu.
+
+Her ödeme geçişi, geçişle aynı transaction içinde bir yevmiye kaydı yazar:
+- payment_received:   B cash (sanal POS)        / A escrow (emanet)
+- delivery_confirmed: B escrow                  / A carrier_payable:<profil> + platform_revenue
+- payout:             B carrier_payable:<profil> / A cash (parti başına tek kayıt)
+
+Hesap bakiyeleri (LedgerAccount.balance) ve günlük özetler
+(LedgerDailyBalance) kayıtla birlikte güncellenir; raporlar ve admin
+dashboard'u Sum() yerine bu satırları okur. Hesap satırları
+select_for_update ile pk sırasıyla kilitlenir; aynı hesaba eşzamanlı iki
+kayıt bakiyeyi kaybetmez ve kilitlenme (deadlock) oluşmaz.
+
+Kayıtlar idempotenttir: aynı ödeme geçişi ikinci kez kaydedilmez.
+"""
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import JournalEntry, LedgerAccount, LedgerDailyBalance, LedgerLine
+
+ZERO = Decimal('0.00')
+
+CASH = 'cash'
+ESCROW = 'escrow'
+PLATFORM_REVENUE = 'platform_revenue'
+CARRIER_PAYABLE = 'carrier_payable'
+
+# kod -> (ad, tür)
+SYSTEM_ACCOUNTS = {
+    CASH: ('Banka / Sanal POS', 'asset'),
+    ESCROW: ('Emanetteki Ödemeler', 'liability'),
+    PLATFORM_REVENUE: ('Platform Komisyon Geliri', 'revenue'),
+    CARRIER_PAYABLE: ('Taşıyıcılara Borçlar', 'liability'),
+}
+
+DEBIT_NORMAL = ('asset',)
+
+
+class UnbalancedEntry(ValueError):
+    """Borç toplamı alacak toplamına eşit değil"""
+
+
+def system_account(code):
+    name, account_type = SYSTEM_ACCOUNTS[code]
+    account, _ = LedgerAccount.objects.get_or_create(
+        code=code, defaults={'name': name, 'account_type': account_type},
+    )
+    return account
+
+
+def carrier_account(profile_id):
+    """Taşıyıcının alt hesabı (ilk kullanımda oluşturulur)"""
+    account = LedgerAccount.objects.filter(profile_id=profile_id).first()
+    if account is None:
+        account, _ = LedgerAccount.objects.get_or_create(
+            code=f'{CARRIER_PAYABLE}:{profile_id}',
+            defaults={
+                'name': f'Taşıyıcı #{profile_id}',
+                'account_type': 'liability',
+                'parent': system_account(CARRIER_PAYABLE),
+                'profile_id': profile_id,
+            },
+        )
+    return account
+
+
+def post_entry(entry_type, lines, description='', payment=None, payout_batch=None, posted_at=None):
+    """
+    Yevmiye kaydı yaz. lines: [(hesap, borç, alacak), ...]
+    Hesap ve üst hesap bakiyeleri, günlük özetler aynı transaction'da güncellenir.
+    """
+    lines = [(account, Decimal(debit), Decimal(credit)) for account, debit, credit in lines if debit or credit]
+    total_debit = sum((debit for _, debit, _ in lines), ZERO)
+    total_credit = sum((credit for _, _, credit in lines), ZERO)
+    if total_debit != total_credit:
+        raise UnbalancedEntry(f'{entry_type}: borç {total_debit} != alacak {total_credit}')
+
+    posted_at = posted_at or timezone.now()
+    day = timezone.localdate(posted_at)
+
+    with transaction.atomic():
+        account_ids = {account.pk for account, _, _ in lines}
+        account_ids |= {account.parent_id for account, _, _ in lines if account.parent_id}
+        locked = {
+            account.pk: account
+            for account in LedgerAccount.objects.select_for_update().filter(pk__in=account_ids).order_by('pk')
+        }
+
+        entry = JournalEntry.objects.create(
+            entry_type=entry_type,
+            description=description[:255],
+            payment=payment,
+            payout_batch=payout_batch,
+            amount=total_debit,
+            posted_at=posted_at,
+        )
+
+        # hesap pk -> [günlük borç, günlük alacak]
+        changes = OrderedDict()
+        ledger_lines = []
+        for account, debit, credit in lines:
+            account = locked[account.pk]
+            for target in (account, locked.get(account.parent_id)):
+                if target is None:
+                    continue
+                _apply(target, debit, credit)
+                change = changes.setdefault(target.pk, [ZERO, ZERO])
+                change[0] += debit
+                change[1] += credit
+            ledger_lines.append(LedgerLine(
+                entry=entry, account=account, debit=debit, credit=credit, balance_after=account.balance,
+            ))
+
+        LedgerLine.objects.bulk_create(ledger_lines)
+        for account_id in changes:
+            locked[account_id].updated_at = posted_at
+        LedgerAccount.objects.bulk_update(
+            [locked[account_id] for account_id in changes],
+            ['balance', 'debit_total', 'credit_total', 'updated_at'],
+        )
+
+        # Hesap satırı kilitli olduğu için aynı günün özeti eşzamanlı oluşturulamaz
+        for account_id, (debit, credit) in changes.items():
+            closing = locked[account_id].balance
+            updated = LedgerDailyBalance.objects.filter(account_id=account_id, date=day).update(
+                debit_total=F('debit_total') + debit,
+                credit_total=F('credit_total') + credit,
+                closing_balance=closing,
+            )
+            if not updated:
+                LedgerDailyBalance.objects.create(
+                    account_id=account_id, date=day,
+                    debit_total=debit, credit_total=credit, closing_balance=closing,
+                )
+
+    return entry
+
+
+def _apply(account, debit, credit):
+    account.debit_total += debit
+    account.credit_total += credit
+    if account.account_type in DEBIT_NORMAL:
+        account.balance += debit - credit
+    else:
+        account.balance += credit - debit
+
+
+def record_payment_received(payment):
+    """Yük sahibi ödedi: para emanete alınır"""
+    if JournalEntry.objects.filter(payment=payment, entry_type='payment_received').exists():
+        return None
+    return post_entry(
+        'payment_received',
+        [
+            (system_account(CASH), payment.amount, ZERO),
+            (system_account(ESCROW), ZERO, payment.amount),
+        ],
+        description=f'Ödeme alındı {payment.transaction_id}'.strip(),
+        payment=payment,
+        posted_at=payment.paid_at,
+    )
+
+
+def record_delivery(payment, posted_at=None):
+    """İki taraf teslimi onayladı: emanet taşıyıcı borcuna ve komisyona ayrılır"""
+    if JournalEntry.objects.filter(payment=payment, entry_type='delivery_confirmed').exists():
+        return None
+    return post_entry(
+        'delivery_confirmed',
+        [
+            (system_account(ESCROW), payment.amount, ZERO),
+            (carrier_account(payment.carrier_id), ZERO, payment.carrier_amount),
+            (system_account(PLATFORM_REVENUE), ZERO, payment.platform_fee),
+        ],
+        description='Teslim onaylandı',
+        payment=payment,
+        posted_at=posted_at,
+    )
+
+
+def record_payout(batch, carrier_amounts):
+    """
+    Ödeme partisi: taşıyıcı borçları bankadan kapatılır.
+    carrier_amounts: {taşıyıcı profil pk: tutar}
+    """
+    if JournalEntry.objects.filter(payout_batch=batch, entry_type='payout').exists():
+        return None
+    total = sum(carrier_amounts.values(), ZERO)
+    lines = [(carrier_account(carrier_id), amount, ZERO) for carrier_id, amount in carrier_amounts.items()]
+    lines.append((system_account(CASH), ZERO, total))
+    return post_entry(
+        'payout', lines,
+        description=f'Ödeme partisi {batch.reference}',
+        payout_batch=batch,
+        posted_at=batch.created_at,
+    )
+
+
+def balances():
+    """Sistem hesaplarının bakiyeleri, tek sorgu: {kod: LedgerAccount}"""
+    accounts = {account.code: account for account in LedgerAccount.objects.filter(code__in=SYSTEM_ACCOUNTS)}
+    for code, (name, account_type) in SYSTEM_ACCOUNTS.items():
+        accounts.setdefault(code, LedgerAccount(code=code, name=name, account_type=account_type))
+    return accounts
+
+
+def period_movement(code, start, end=None):
+    """Hesabın [start, end] günleri arasındaki net hareketi (günlük özetlerden)"""
+    account = LedgerAccount(account_type=SYSTEM_ACCOUNTS[code][1])
+    queryset = LedgerDailyBalance.objects.filter(account__code=code, date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(date__lte=end)
+    totals = queryset.aggregate(debit=Sum('debit_total'), credit=Sum('credit_total'))
+    _apply(account, totals['debit'] or ZERO, totals['credit'] or ZERO)
+    return account.balance
@@ -0,0 +1,95 @@
+"""
+Management command to compare primary key layouts
+
+uuid4 in varchar(128) (old Shipment/Bid/Payment keys), native UUIDv7 and
+bigint are inserted into throwaway tables; insert throughput and primary
+key index size are reported for each.
+"""
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from website.ids import uuid7
+
+
+class Command(BaseCommand):
+    help = 'Benchmark insert throughput and index size of uuid4/varchar, uuid7 and bigint primary keys'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000, help='Her tablo için eklenecek satır sayısı')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tek executemany çağrısındaki satır sayısı')
+
+    def handle(self, *args, **options):
+        rows, batch_size = options['rows'], options['batch_size']
+        vendor = connection.vendor
+        native_uuid = connection.features.has_native_uuid_field
+
+        counter = iter(range(1, rows + 1))
+        variants = [
+            ('uuid4_varchar', 'varchar(128)', lambda: str(uuid.uuid4())),
+            ('uuid7_native', 'uuid' if native_uuid else 'char(32)',
+             (lambda: str(uuid7())) if native_uuid else (lambda: uuid7().hex)),
+            ('bigint', 'bigint', lambda: next(counter)),
+        ]
+
+        self.stdout.write(f'{vendor}: {rows} satır, batch {batch_size}\n')
+        self.stdout.write(f'{"anahtar":<16}{"satır/sn":>12}{"index (KB)":>14}{"tablo (KB)":>14}')
+
+        for name, column_type, make_id in variants:
+            table = f'benchmark_pk_{name}'
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {table}')
+                cursor.execute(f'CREATE TABLE {table} (id {column_type} PRIMARY KEY, created_at timestamp, amount numeric(10, 2))')
+            try:
+                rate = self._insert(table, rows, batch_size, make_id)
+                index_kb, table_kb = self._sizes(table)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+            self.stdout.write(f'{name:<16}{rate:>12,.0f}{self._kb(index_kb):>14}{self._kb(table_kb):>14}')
+
+    def _insert(self, table, rows, batch_size, make_id):
+        """Satırları batch'ler halinde ekle, saniyedeki satır sayısını döndür"""
+        started = time.perf_counter()
+        inserted = 0
+        with connection.cursor() as cursor:
+            while inserted < rows:
+                count = min(batch_size, rows - inserted)
+                batch = [(make_id(), '2025-01-01 00:00:00', 100) for _ in range(count)]
+                with transaction.atomic():
+                    cursor.executemany(f'INSERT INTO {table} (id, created_at, amount) VALUES (%s, %s, %s)', batch)
+                inserted += count
+        return rows / (time.perf_counter() - started)
+
+    def _sizes(self, table):
+        """(birincil anahtar index boyutu, tablo boyutu) KB; desteklenmiyorsa None"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('ANALYZE ' + table)
+                cursor.execute(
+                    'SELECT pg_relation_size(%s), pg_relation_size(%s)',
+                    [f'{table}_pkey', table],
+                )
+                index_size, table_size = cursor.fetchone()
+                return index_size / 1024, table_size / 1024
+            if connection.vendor == 'sqlite':
+                try:
+                    cursor.execute(
+                        "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN (%s, %s) GROUP BY name",
+                        [f'sqlite_autoindex_{table}_1', table],
+                    )
+                except Exception:
+                    # dbstat sanal tablosu olmadan derlenmiş SQLite
+                    return None, None
+                sizes = dict(cursor.fetchall())
+                index_size = sizes.get(f'sqlite_autoindex_{table}_1')
+                table_size = sizes.get(table)
+                return (index_size or 0) / 1024, (table_size or 0) / 1024
+        return None, None
+
+    @staticmethod
+    def _kb(value):
+        return '-' if value is None else f'{value:,.0f}'
@@ -0,0 +1,102 @@
+"""
+Management command to build responsive variants of static images
+
+static/images altındaki PNG/JPEG dosyaları için images/responsive/ altına
+genişlik kovalarına göre AVIF/WebP varyantları ve manifest.json yazar.
+collectstatic'ten önce çalıştırılmalıdır; içerik hash'li adları
+CompressedManifestStaticFilesStorage üretir.
+"""
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from website.responsive_images import (
+    STATIC_MANIFEST, STATIC_OUTPUT_DIR, STATIC_SOURCE_DIR, available_formats, build_entry, render_variants,
+)
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+class Command(BaseCommand):
+    help = 'Build AVIF/WebP width variants and a manifest for static images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Değişmemiş kaynakları da yeniden üret')
+        parser.add_argument('--uploads', action='store_true',
+                            help='Varyantı olmayan blog görsellerini de işle (veritabanı gerekir)')
+
+    def handle(self, *args, **options):
+        if not settings.STATICFILES_DIRS:
+            raise CommandError('STATICFILES_DIRS tanımlı değil')
+        if not available_formats():
+            raise CommandError('Pillow WebP/AVIF desteği olmadan derlenmiş')
+
+        root = str(settings.STATICFILES_DIRS[0])
+        source_dir = os.path.join(root, STATIC_SOURCE_DIR)
+        output_dir = os.path.join(root, STATIC_OUTPUT_DIR)
+        manifest_path = os.path.join(root, STATIC_MANIFEST)
+        os.makedirs(output_dir, exist_ok=True)
+
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as handle:
+                manifest = json.load(handle)
+
+        self.stdout.write(f"Formatlar: {', '.join(available_formats())}")
+        built = skipped = 0
+        for dirpath, dirnames, filenames in os.walk(source_dir):
+            # Üretilen varyantları tekrar kaynak olarak alma
+            dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != output_dir]
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(SOURCE_EXTENSIONS):
+                    continue
+                path = os.path.join(dirpath, filename)
+                static_name = os.path.relpath(path, root).replace(os.sep, '/')
+                with open(path, 'rb') as handle:
+                    data = handle.read()
+                source_hash = hashlib.sha256(data).hexdigest()
+
+                if not options['force'] and manifest.get(static_name, {}).get('source_hash') == source_hash:
+                    skipped += 1
+                    continue
+
+                width, height, variants = render_variants(data)
+                stem = os.path.splitext(static_name[len(STATIC_SOURCE_DIR) + 1:])[0].replace('/', '-')
+                saved = []
+                total = 0
+                for fmt, variant_width, content in variants:
+                    name = f'{STATIC_OUTPUT_DIR}/{stem}-{variant_width}w.{fmt}'
+                    with open(os.path.join(root, name), 'wb') as handle:
+                        handle.write(content)
+                    saved.append((fmt, variant_width, name))
+                    total += len(content)
+
+                entry = build_entry(width, height, static_name, saved)
+                entry['source_hash'] = source_hash
+                manifest[static_name] = entry
+                built += 1
+                self.stdout.write(
+                    f'  {static_name}: {len(data) / 1024:.0f} KB -> {len(saved)} varyant ({total / 1024:.0f} KB toplam)'
+                )
+
+        with open(manifest_path, 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+
+        self.stdout.write(self.style.SUCCESS(f'{built} görsel işlendi, {skipped} değişmemiş'))
+
+        if options['uploads']:
+            self._build_uploads()
+
+    def _build_uploads(self):
+        """Daha önce yüklenmiş blog görselleri için varyant üret"""
+        from blog.models import BlogPost
+
+        posts = BlogPost.objects.exclude(featured_image='').exclude(featured_image__isnull=True)
+        count = 0
+        for post in posts.filter(featured_image_variants={}).iterator():
+            post.update_image_variants()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'{count} blog görseli işlendi'))
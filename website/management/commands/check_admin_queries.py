@@ -0,0 +1,254 @@
+"""
+Management command to check the query count of every admin changelist
+
+Her kayıtlı ModelAdmin'in changelist sayfası (sayfa başına --per-page satır)
+render edilir ve çalışan SQL sorguları sayılır. list_display'deki bir kolon
+ilişkili satırı lazy-load ederse sorgu sayısı satır sayısıyla büyür ve
+bütçe aşılır.
+
+--seed N her model için N satır (her biri farklı kullanıcı/profil ile)
+oluşturur; böylece boş veritabanında da (CI) N+1 görünür olur. Her şey tek
+transaction içinde çalışır ve sonunda geri alınır.
+
+Bütçe ModelAdmin üzerinde changelist_query_budget ile ezilebilir.
+Bütçe aşılırsa komut hata ile çıkar. Regresyon testi website.tests'te
+(manage.py test website) aynı seed ile admin başına sabit sayıyı kontrol eder.
+"""
+from decimal import Decimal
+
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from website.admin import admin_site
+from website.models import (
+    AdminActivity, Bid, JournalEntry, LedgerAccount, Payment, PaymentWebhookEvent,
+    PayoutBatch, Shipment, ShipmentImport, UserDocument, UserProfile, Vehicle,
+)
+
+# Sayım, sayfa sorgusu, list_filter seçenekleri ve oturum/izin sorguları için pay
+DEFAULT_BUDGET = 8
+
+
+class Command(BaseCommand):
+    help = 'Render every admin changelist and fail if it exceeds its query budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Model başına geçici olarak oluşturulacak satır')
+        parser.add_argument('--per-page', type=int, default=100, help='Changelist sayfa boyutu')
+        parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='Varsayılan sorgu bütçesi')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = self._measure(options)
+            # Seed verisi ve geçici admin kullanıcısı kalıcı olmasın
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{"changelist":<40}{"satır":>8}{"sorgu":>8}{"bütçe":>8}')
+        over = []
+        for label, rows, queries, budget in results:
+            line = f'{label:<40}{rows:>8}{queries:>8}{budget:>8}'
+            if queries > budget:
+                over.append(label)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if over:
+            raise CommandError(f'Sorgu bütçesi aşıldı: {", ".join(over)}')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} changelist bütçe içinde'))
+
+    def _measure(self, options):
+        if options['seed']:
+            seed(options['seed'])
+
+        admin_user = User.objects.create_superuser(
+            'query-budget-check', 'query-budget-check@example.com', None,
+        )
+        factory = RequestFactory()
+        results = []
+
+        for model, model_admin in admin_site._registry.items():
+            opts = model._meta
+            url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            request = factory.get(url)
+            request.user = admin_user
+
+            original_per_page = model_admin.list_per_page
+            model_admin.list_per_page = options['per_page']
+            try:
+                with CaptureQueriesContext(connection) as captured:
+                    response = model_admin.changelist_view(request)
+                    response.render()
+            finally:
+                model_admin.list_per_page = original_per_page
+
+            rows = len(response.context_data['cl'].result_list)
+            budget = getattr(model_admin, 'changelist_query_budget', options['budget'])
+            results.append((f'{opts.app_label}.{opts.model_name}', rows, len(captured), budget))
+
+        return results
+
+
+def seed(count):
+    """Her changelist'te count satır olacak şekilde birbirinden bağımsız kayıtlar oluştur"""
+    now = timezone.now()
+    today = now.date()
+
+    # bulk_create sinyal göndermez; profiller burada açıkça oluşturulur
+    users = User.objects.bulk_create([
+        User(username=f'qb-{i}', email=f'qb-{i}@example.com', first_name='Test', last_name=str(i))
+        for i in range(count * 2)
+    ])
+    profiles = UserProfile.objects.bulk_create([
+        UserProfile(user=user, user_type=0 if i < count else 1, iban='TR000000000000000000000000')
+        for i, user in enumerate(users)
+    ])
+    shippers, carriers = profiles[:count], profiles[count:]
+
+    shipments = Shipment.objects.bulk_create([
+        Shipment(
+            tracking_number=f'QB-{i:07d}',
+            shipper=shipper,
+            shipper_email=shipper.user.email,
+            shipper_phone='05000000000',
+            title=f'Test ilanı {i}',
+            description='Sorgu bütçesi kontrolü',
+            from_address_city='İstanbul',
+            from_address_district='Kadıköy',
+            from_address_full='-',
+            to_address_city='Ankara',
+            to_address_district='Çankaya',
+            to_address_full='-',
+            weight=Decimal('100'),
+            suggested_price=Decimal('1000'),
+            pickup_date=today,
+            bid_count=1,
+        )
+        for i, shipper in enumerate(shippers)
+    ])
+    bids = Bid.objects.bulk_create([
+        Bid(
+            shipment=shipment,
+            tracking_number=shipment.tracking_number,
+            carrier=carrier,
+            carrier_email=carrier.user.email,
+            shipper_email=shipment.shipper_email,
+            offered_price=Decimal('900'),
+            status='accepted',
+        )
+        for shipment, carrier in zip(shipments, carriers)
+    ])
+    batches = PayoutBatch.objects.bulk_create([
+        PayoutBatch(
+            reference=f'QB-{i:07d}',
+            created_by=user,
+            payment_count=1,
+            transfer_count=1,
+            total_amount=Decimal('810'),
+            file_name=f'qb-{i}.csv',
+        )
+        for i, user in enumerate(users[:count])
+    ])
+    payments = Payment.objects.bulk_create([
+        Payment(
+            shipment=bid.shipment,
+            bid=bid,
+            shipper=bid.shipment.shipper,
+            carrier=bid.carrier,
+            amount=Decimal('900'),
+            platform_fee=Decimal('90'),
+            carrier_amount=Decimal('810'),
+            status='completed',
+            admin_transferred=True,
+            payout_batch=batch,
+        )
+        for bid, batch in zip(bids, batches)
+    ])
+    Vehicle.objects.bulk_create([
+        Vehicle(
+            carrier_profile=carrier,
+            plate_number=f'QB {i:05d}',
+            brand='Ford',
+            model='Transit',
+            year=2020,
+            max_weight_kg=1500,
+            max_volume_m3=Decimal('12'),
+        )
+        for i, carrier in enumerate(carriers)
+    ])
+    UserDocument.objects.bulk_create([
+        UserDocument(
+            user_email=carrier.user.email,
+            document_type='license',
+            document_url=f'https://example.com/{i}.jpg',
+            status='approved',
+            verified_at=now,
+            verified_by=user,
+        )
+        for i, (carrier, user) in enumerate(zip(carriers, users))
+    ])
+    AdminActivity.objects.bulk_create([
+        AdminActivity(
+            admin_user=user,
+            action_type='document_approved',
+            target_type='document',
+            target_id=str(i),
+            description='Sorgu bütçesi kontrolü',
+        )
+        for i, user in enumerate(users[:count])
+    ])
+    ShipmentImport.objects.bulk_create([
+        ShipmentImport(shipper=shipper, file_name=f'qb-{i}.csv', status='completed')
+        for i, shipper in enumerate(shippers)
+    ])
+
+    # Taşıyıcı alt hesapları tek üst hesaba bağlı (carrier_payable)
+    payable = LedgerAccount.objects.create(code='qb-carrier-payable', name='Taşıyıcı borcu', account_type='liability')
+    LedgerAccount.objects.bulk_create([
+        LedgerAccount(
+            code=f'qb-carrier-payable:{carrier.pk}',
+            name=f'Taşıyıcı {i}',
+            account_type='liability',
+            parent=payable,
+            profile=carrier,
+        )
+        for i, carrier in enumerate(carriers)
+    ])
+    JournalEntry.objects.bulk_create([
+        JournalEntry(entry_type='payout', payment=payment, payout_batch=payment.payout_batch, amount=Decimal('810'))
+        for payment in payments
+    ])
+    PaymentWebhookEvent.objects.bulk_create([
+        PaymentWebhookEvent(
+            provider='iyzico',
+            event_id=f'qb-{i}',
+            event_type='payment',
+            payment_reference=str(payment.pk),
+            payment=payment,
+            succeeded=True,
+            amount=Decimal('900'),
+            status='processed',
+        )
+        for i, payment in enumerate(payments)
+    ])
+    Site.objects.bulk_create([Site(domain=f'qb-{i}.example.com', name=f'qb-{i}') for i in range(count)])
+
+    apps = SocialApp.objects.bulk_create([
+        SocialApp(provider='google', name=f'qb-{i}', client_id=f'qb-{i}', secret='qb')
+        for i in range(count)
+    ])
+    accounts = SocialAccount.objects.bulk_create([
+        SocialAccount(user=user, provider='google', uid=f'qb-{i}')
+        for i, user in enumerate(users[:count])
+    ])
+    SocialToken.objects.bulk_create([
+        SocialToken(app=app, account=account, token=f'qb-{i}')
+        for i, (app, account) in enumerate(zip(apps, accounts))
+    ])
@@ -0,0 +1,49 @@
+"""
+Management command to transfer all eligible payments in one payout batch
+
+Haftalık ödeme çalıştırması için: teslim edilmiş, iki tarafça onaylanmış ve
+henüz transfer edilmemiş tüm ödemeler tek partide transfer edildi olarak
+işaretlenir ve banka dosyası yazılır (--output verilmezse sadece
+veritabanında saklanır, admin'den indirilebilir).
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from website.payouts import create_payout_batch, eligible_payments
+
+
+class Command(BaseCommand):
+    help = 'Create a payout batch and bank transfer file for all eligible payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='Partiyi oluşturan admin kullanıcı adı')
+        parser.add_argument('--format', choices=['csv', 'xml'], default='xml', help='Banka dosyası formatı')
+        parser.add_argument('--output', help='Banka dosyasının yazılacağı yol')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece uygun ödeme sayısını göster')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'], is_staff=True)
+        except User.DoesNotExist:
+            raise CommandError(f"Admin kullanıcı bulunamadı: {options['username']}")
+
+        if options['dry_run']:
+            self.stdout.write(f'{eligible_payments().count()} uygun ödeme')
+            return
+
+        result = create_payout_batch(user, file_format=options['format'])
+        for email in result.skipped_no_iban:
+            self.stdout.write(self.style.WARNING(f'IBAN eksik, atlandı: {email}'))
+
+        batch = result.batch
+        if batch is None:
+            self.stdout.write('Transfer edilecek ödeme yok')
+            return
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as handle:
+                handle.write(batch.file_content)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{batch.reference}: {batch.payment_count} ödeme, {batch.transfer_count} IBAN, toplam {batch.total_amount} ₺'
+        ))
@@ -0,0 +1,104 @@
+"""
+Management command to load test a page with and without persistent connections
+
+Each scenario runs the same requests through the Django stack (test
+client) from several threads, mimicking gunicorn gthread workers. The test
+client does not run close_old_connections on request start/finish, so it is
+called around each request the same way the WSGI handler does. Only
+CONN_MAX_AGE changes between scenarios, so the latency difference is the
+cost of opening a database connection per request.
+"""
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+
+from website.db_metrics import opened_total
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency for different CONN_MAX_AGE values'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/nakliye/istanbul/', help='İstek atılacak sayfa')
+        parser.add_argument('--requests', type=int, default=400, help='Senaryo başına toplam istek')
+        parser.add_argument('--threads', type=int, default=4, help='Eşzamanlı thread (gunicorn --threads)')
+        parser.add_argument('--max-ages', default='0,60', help='Denenecek CONN_MAX_AGE değerleri')
+
+    def handle(self, *args, **options):
+        max_ages = [int(value) for value in options['max_ages'].split(',') if value.strip()]
+        if not max_ages:
+            raise CommandError('--max-ages boş olamaz')
+
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS and settings.ALLOWED_HOSTS[0] != '*' else 'localhost'
+        original = {alias: connections[alias].settings_dict.get('CONN_MAX_AGE', 0) for alias in connections}
+
+        self.stdout.write(
+            f"{options['path']} - {options['requests']} istek, {options['threads']} thread ({connections['default'].vendor})\n"
+        )
+        self.stdout.write(f'{"CONN_MAX_AGE":>12}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"istek/sn":>10}{"yeni bağlantı":>15}')
+
+        try:
+            for max_age in max_ages:
+                for alias in connections:
+                    connections[alias].settings_dict['CONN_MAX_AGE'] = max_age
+                latencies, elapsed, opened = self._run(options['path'], options['requests'], options['threads'], host)
+                latencies.sort()
+                self.stdout.write(
+                    f'{max_age:>12}'
+                    f'{self._percentile(latencies, 50):>10.2f}'
+                    f'{self._percentile(latencies, 95):>10.2f}'
+                    f'{self._percentile(latencies, 99):>10.2f}'
+                    f'{len(latencies) / elapsed:>10.0f}'
+                    f'{opened:>15}'
+                )
+        finally:
+            for alias, value in original.items():
+                connections[alias].settings_dict['CONN_MAX_AGE'] = value
+
+    def _run(self, path, total, thread_count, host):
+        """İstekleri thread'lere böl, gecikmeleri (ms) topla"""
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        per_thread = [total // thread_count + (1 if i < total % thread_count else 0) for i in range(thread_count)]
+        opened_before = sum(opened_total().values())
+
+        def worker(count):
+            client = Client(HTTP_HOST=host)
+            local = []
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    close_old_connections()
+                    response = client.get(path, secure=True)
+                    close_old_connections()
+                    local.append((time.perf_counter() - started) * 1000)
+                    if response.status_code >= 500:
+                        errors.append(response.status_code)
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=worker, args=(count,)) for count in per_thread]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(f'{len(errors)} istek 5xx döndü ({path})')
+        return latencies, elapsed, sum(opened_total().values()) - opened_before
+
+    @staticmethod
+    def _percentile(values, percent):
+        if len(values) < 2:
+            return values[0] if values else 0.0
+        return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
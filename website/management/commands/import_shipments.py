@@ -0,0 +1,48 @@
+"""
+Management command to bulk import shipments from a CSV/XLSX file
+"""
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from website.bulk_import import run_import
+from website.models import ShipmentImport, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Import shipments for a shipper from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV veya XLSX dosya yolu')
+        parser.add_argument('--email', required=True, help='Yük sahibinin e-posta adresi')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'Dosya bulunamadı: {path}')
+
+        try:
+            profile = UserProfile.objects.select_related('user').get(user__email=options['email'])
+        except UserProfile.DoesNotExist:
+            raise CommandError(f"Profil bulunamadı: {options['email']}")
+
+        if profile.user_type != 0:
+            raise CommandError('Toplu ilan yükleme sadece yük sahipleri içindir.')
+
+        shipment_import = ShipmentImport.objects.create(
+            shipper=profile,
+            file_name=os.path.basename(path)[:255],
+        )
+        with open(path, 'rb') as handle:
+            run_import(shipment_import, File(handle, name=os.path.basename(path)))
+
+        if shipment_import.status == 'failed':
+            raise CommandError(f'Dosya işlenemedi: {shipment_import.error_message}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{shipment_import.total_rows} satır işlendi: '
+            f'{shipment_import.created_count} ilan oluşturuldu, {shipment_import.error_count} hatalı satır'
+        ))
+        if shipment_import.error_report:
+            self.stdout.write(f'Hata raporu: {shipment_import.error_report.name}')
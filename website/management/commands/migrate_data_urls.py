@@ -0,0 +1,99 @@
+"""
+Management command to move document/proof files into private storage
+
+DeliveryProof.file_url ve UserDocument.document_url alanlarında tutulan
+data:<mime>;base64,... değerleri ve bu komutun önceki sürümünün /media/
+altına yazdığı dosyalar (documents/<pk>_<tür>, delivery_proofs/<ilan>/<pk>)
+rastgele adlarla özel storage'a (website.private_media) taşınır; alan
+'private:<ad>' ile güncellenir ve /media/ altındaki kopya silinir.
+/media/thumbnails/ altında kalmış eski küçük resimler de silinir.
+"""
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from website import private_media
+from website.models import DeliveryProof, UserDocument
+from website.thumbnails import ThumbnailError, decode_data_url
+
+
+class Command(BaseCommand):
+    help = 'Move data: URLs and public media files of DeliveryProof/UserDocument rows to private storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Sadece sayıları göster, değişiklik yapma')
+        parser.add_argument('--chunk-size', type=int, default=50, help='Bellekte aynı anda tutulacak satır sayısı')
+
+    def handle(self, *args, **options):
+        targets = [
+            (DeliveryProof, 'file_url', 'delivery_proofs'),
+            (UserDocument, 'document_url', 'documents'),
+        ]
+
+        for model, field, folder in targets:
+            # Önce sadece pk'ler; büyük data URL'ler chunk chunk yüklenir
+            pending = Q(**{f'{field}__startswith': 'data:'}) | Q(**{f'{field}__startswith': settings.MEDIA_URL})
+            pks = list(model.objects.filter(pending).values_list('pk', flat=True))
+            self.stdout.write(f'{model.__name__}.{field}: {len(pks)} data URL / public media dosyası')
+            if options['dry_run'] or not pks:
+                continue
+
+            moved = failed = removed_bytes = 0
+            chunk_size = options['chunk_size']
+            for start in range(0, len(pks), chunk_size):
+                for obj in model.objects.filter(pk__in=pks[start:start + chunk_size]):
+                    size = self._move(model, field, folder, obj)
+                    if size is None:
+                        failed += 1
+                    else:
+                        moved += 1
+                        removed_bytes += size
+
+            self.stdout.write(self.style.SUCCESS(
+                f'  {moved} taşındı, {failed} hatalı, veritabanından {removed_bytes / 1024 / 1024:.1f} MB çıkarıldı'
+            ))
+
+        if not options['dry_run']:
+            removed = self._remove_public_tree('thumbnails')
+            self.stdout.write(f'/media/thumbnails/: {removed} eski küçük resim silindi')
+
+    def _move(self, model, field, folder, obj):
+        """Satırın dosyasını özel storage'a yaz; veritabanından kaldırılan bayt sayısı (hata: None)"""
+        value = getattr(obj, field)
+        public_name = None
+        try:
+            if value.startswith('data:'):
+                content_type, data = decode_data_url(value)
+            else:
+                public_name = value[len(settings.MEDIA_URL):]
+                content_type = mimetypes.guess_type(public_name)[0] or 'application/octet-stream'
+                with default_storage.open(public_name, 'rb') as handle:
+                    data = handle.read()
+        except (ThumbnailError, OSError) as e:
+            self.stderr.write(f'  {model.__name__} {obj.pk}: {e}')
+            return None
+
+        extension = mimetypes.guess_extension(content_type) or '.bin'
+        source = private_media.save(folder, data, extension)
+        # Sadece bu alanı güncelle (save() diğer alanları ve signal'ları tetikler)
+        model.objects.filter(pk=obj.pk).update(**{field: source})
+        if public_name:
+            default_storage.delete(public_name)
+            return 0
+        return len(value)
+
+    def _remove_public_tree(self, path):
+        if not default_storage.exists(path):
+            return 0
+        directories, files = default_storage.listdir(path)
+        removed = 0
+        for name in files:
+            default_storage.delete(os.path.join(path, name))
+            removed += 1
+        for name in directories:
+            removed += self._remove_public_tree(os.path.join(path, name))
+        return removed
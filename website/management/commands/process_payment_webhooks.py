@@ -0,0 +1,48 @@
+"""
+Management command to process queued or failed payment webhook events
+
+Bildirimler normalde alındıkları worker'ın thread havuzunda işlenir.
+Worker yeniden başlarken kuyrukta kalan veya hata alan olaylar bu komutla
+(cron, birkaç dakikada bir) işlenir. PAYMENT_WEBHOOK_MAX_ATTEMPTS denemeye
+ulaşan olaylar atlanır; admin'den incelenmelidir.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from website.models import PaymentWebhookEvent
+from website.payment_webhooks import process_event
+
+
+class Command(BaseCommand):
+    help = 'Process received and failed payment webhook events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000, help='En fazla işlenecek olay')
+        parser.add_argument(
+            '--min-age', type=int, default=60,
+            help='Bu kadar saniyeden yeni olaylar atlanır (thread havuzu işliyor olabilir)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['min_age'])
+        event_ids = list(
+            PaymentWebhookEvent.objects.filter(
+                status__in=('received', 'failed'),
+                attempts__lt=settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS,
+                received_at__lt=cutoff,
+            )
+            .order_by('received_at')
+            .values_list('pk', flat=True)[:options['limit']]
+        )
+
+        counts = {}
+        for event_id in event_ids:
+            event = process_event(event_id)
+            status = event.status if event else 'skipped'
+            counts[status] = counts.get(status, 0) + 1
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(counts.items())) or '-'
+        self.stdout.write(f'{len(event_ids)} olay ({summary})')
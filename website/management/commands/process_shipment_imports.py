@@ -0,0 +1,44 @@
+"""
+Management command to resume bulk imports left in 'processing'
+
+Web yüklemeleri worker'ın arka plan thread'inde işlenir. Worker yeniden
+başlarken thread kaybolur ve kayıt 'processing' kalır; bu komut (cron,
+birkaç dakikada bir) --min-age'den eski yüklemeleri özel storage'daki
+kopyasından baştan işler. Kopyası olmayan yüklemeler hatalı olarak kapatılır.
+Yazma kayıt kilitlenerek yapıldığı için hâlâ çalışan bir thread ile aynı
+yükleme iki kez yazılmaz.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from website.bulk_import import resume_import
+from website.models import ShipmentImport
+
+
+class Command(BaseCommand):
+    help = 'Resume bulk shipment imports whose background thread was lost'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age', type=int, default=1800,
+            help='Bu kadar saniyeden yeni yüklemeler atlanır (thread hâlâ işliyor olabilir)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['min_age'])
+        imports = (
+            ShipmentImport.objects.filter(status='processing', created_at__lt=cutoff)
+            .select_related('shipper__user')
+            .order_by('created_at')
+        )
+
+        counts = {}
+        for shipment_import in imports:
+            result = resume_import(shipment_import)
+            status = result.status if result else 'skipped'
+            counts[status] = counts.get(status, 0) + 1
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(counts.items())) or '-'
+        self.stdout.write(f'{sum(counts.values())} yükleme ({summary})')
@@ -0,0 +1,42 @@
+"""
+Management command to delete expired sessions in small batches
+
+Django'nun clearsessions komutu tek bir DELETE ile tüm süresi dolmuş
+satırları siler; büyük tabloda bu uzun süren kilit ve WAL patlaması
+demektir. Bu komut satırları batch'ler halinde siler, arada bekleyebilir.
+Cron ile düzenli çalıştırılması önerilir.
+"""
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Delete expired rows from django_session in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Tek DELETE ile silinecek satır sayısı')
+        parser.add_argument('--sleep', type=float, default=0.1, help='Batch\'ler arası bekleme (saniye)')
+        parser.add_argument('--max-batches', type=int, default=0, help='En fazla batch sayısı (0 = sınırsız)')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)
+        deleted_total = 0
+        batches = 0
+
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            deleted_total += deleted
+            batches += 1
+            if options['max_batches'] and batches >= options['max_batches']:
+                break
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'{deleted_total} süresi dolmuş oturum silindi ({batches} batch)'))
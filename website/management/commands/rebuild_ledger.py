@@ -0,0 +1,138 @@
+"""
+Management command to backfill and verify the double-entry ledger
+
+Defterden önce oluşmuş ödemeler için eksik yevmiye kayıtları olayların
+zaman sırasıyla yazılır (ödeme alındı -> teslim -> transfer). Kayıtlar
+idempotent olduğu için komut tekrar çalıştırılabilir. Kayıt yazıldıysa
+dashboard özetleri (website.rollups) baştan hesaplanır.
+
+--verify: hesap bakiyelerini satır toplamlarıyla, üst hesapları alt
+hesaplarla karşılaştırır ve toplam borç = toplam alacak kontrolü yapar.
+Fark bulunursa komut hata ile çıkar.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+
+from website import keyset, ledger, rollups
+from website.models import JournalEntry, LedgerAccount, LedgerLine, Payment
+
+RECEIVED = ('paid', 'in_transit', 'delivered', 'completed')
+DELIVERED = ('delivered', 'completed')
+
+
+class Command(BaseCommand):
+    help = 'Post missing ledger entries for existing payments and verify account balances'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Sadece bakiyeleri doğrula')
+
+    def handle(self, *args, **options):
+        if not options['verify']:
+            self.backfill()
+        self.verify()
+
+    def backfill(self):
+        posted = set(
+            JournalEntry.objects.filter(payment__isnull=False).values_list('payment_id', 'entry_type')
+        )
+        posted_batches = set(
+            JournalEntry.objects.filter(payout_batch__isnull=False).values_list('payout_batch_id', flat=True)
+        )
+
+        payments = (
+            Payment.objects.filter(status__in=RECEIVED)
+            .select_related('shipment', 'payout_batch')
+            .defer('payout_batch__file_content')
+        )
+
+        # (zaman, sıra, işlem) - aynı anda olan olaylar mantıksal sırayla yazılır
+        events = []
+        batches = defaultdict(dict)
+        for payment in keyset.iterate(payments, ('created_at', 'pk'), 1000):
+            paid_at = payment.paid_at or payment.created_at
+            if (payment.pk, 'payment_received') not in posted:
+                events.append((paid_at, 0, ledger.record_payment_received, (payment,)))
+
+            if payment.status in DELIVERED and (payment.pk, 'delivery_confirmed') not in posted:
+                delivered_at = max(
+                    filter(None, [payment.shipper_confirmed_at, payment.carrier_confirmed_at, paid_at])
+                )
+                events.append((delivered_at, 1, ledger.record_delivery, (payment, delivered_at)))
+
+            if payment.status == 'completed' and payment.admin_transferred:
+                batch = payment.payout_batch
+                if batch is not None:
+                    if batch.pk not in posted_batches:
+                        amounts = batches[batch]
+                        amounts[payment.carrier_id] = amounts.get(payment.carrier_id, Decimal('0')) + payment.carrier_amount
+                elif (payment.pk, 'payout') not in posted:
+                    transferred_at = payment.admin_transferred_at or payment.completed_at or paid_at
+                    events.append((transferred_at, 2, record_single_payout, (payment, transferred_at)))
+
+        for batch, amounts in batches.items():
+            events.append((batch.created_at, 2, ledger.record_payout, (batch, amounts)))
+
+        events.sort(key=lambda event: (event[0], event[1]))
+        for _, _, record, arguments in events:
+            with transaction.atomic():
+                record(*arguments)
+
+        self.stdout.write(f'{len(events)} yevmiye kaydı yazıldı')
+
+        # Geçmiş tarihli kayıtlar rollup watermark'ının gerisinde kalır; ödeme/komisyon
+        # serileri refresh ile güncellenmez, özetler baştan hesaplanır
+        if events:
+            processed = rollups.rebuild()
+            self.stdout.write(f"Dashboard özetleri yeniden hesaplandı ({sum(processed.values())} satır)")
+
+    def verify(self):
+        errors = []
+
+        line_totals = {
+            row['account_id']: row
+            for row in LedgerLine.objects.values('account_id').annotate(debit=Sum('debit'), credit=Sum('credit'))
+        }
+        accounts = list(LedgerAccount.objects.all())
+        children = defaultdict(lambda: [Decimal('0'), Decimal('0')])
+        for account in accounts:
+            if account.parent_id:
+                children[account.parent_id][0] += account.debit_total
+                children[account.parent_id][1] += account.credit_total
+
+        for account in accounts:
+            if account.pk in children:
+                debit, credit = children[account.pk]
+            else:
+                totals = line_totals.get(account.pk, {})
+                debit, credit = totals.get('debit') or Decimal('0'), totals.get('credit') or Decimal('0')
+            expected = debit - credit if account.account_type in ledger.DEBIT_NORMAL else credit - debit
+            if (debit, credit, expected) != (account.debit_total, account.credit_total, account.balance):
+                errors.append(f'{account.code}: bakiye {account.balance}, satırlardan {expected}')
+
+        totals = LedgerLine.objects.aggregate(debit=Sum('debit'), credit=Sum('credit'))
+        if totals['debit'] != totals['credit']:
+            errors.append(f"Mizan dengesiz: borç {totals['debit']} != alacak {totals['credit']}")
+
+        if errors:
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            raise CommandError(f'{len(errors)} hesapta fark var')
+        self.stdout.write(self.style.SUCCESS(f'{len(accounts)} hesap doğrulandı'))
+
+
+def record_single_payout(payment, posted_at):
+    """Partiden önce tek tek transfer edilmiş ödeme"""
+    return ledger.post_entry(
+        'payout',
+        [
+            (ledger.carrier_account(payment.carrier_id), payment.carrier_amount, Decimal('0')),
+            (ledger.system_account(ledger.CASH), Decimal('0'), payment.carrier_amount),
+        ],
+        description='Tekil transfer',
+        payment=payment,
+        posted_at=posted_at,
+    )
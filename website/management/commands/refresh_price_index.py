@@ -0,0 +1,33 @@
+"""
+Management command to refresh the route price index
+
+Son çalıştırmadan sonra kabul edilmiş teklifler güzergah fiyat endeksine
+eklenir (website.pricing). refresh_rollups ile birlikte cron'dan
+çalıştırılır; ilan formundaki fiyat önerileri bu aralık kadar geriden gelir.
+
+--rebuild: endeksi silip tüm geçmişten yeniden hesaplar (yarı ömür veya
+ağırlık aralıkları değiştiğinde).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from website import pricing
+from website.models import RoutePriceIndex
+
+
+class Command(BaseCommand):
+    help = 'Add newly accepted bid prices to the route price index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Endeksi sil ve baştan hesapla')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = pricing.rebuild() if options['rebuild'] else pricing.refresh()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} kabul edilmiş teklif {elapsed:.2f} sn içinde işlendi '
+            f'({RoutePriceIndex.objects.count()} endeks satırı)'
+        ))
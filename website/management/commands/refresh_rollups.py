@@ -0,0 +1,40 @@
+"""
+Management command to refresh the dashboard rollup tables
+
+Her kaynak için watermark'tan sonraki yeni satırlar saatlik/günlük
+özetlere eklenir (website.rollups). Cron ile birkaç dakikada bir
+çalıştırılır; dashboard grafikleri bu aralık kadar geriden gelir.
+
+--rebuild: özetleri silip tüm geçmişi yeniden hesaplar (şema veya
+kaynak tanımı değiştiğinde).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from website import rollups
+
+
+class Command(BaseCommand):
+    help = 'Aggregate new shipments, bids, payments and fees into hourly/daily rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Özetleri sil ve baştan hesapla')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        processed = rollups.rebuild() if options['rebuild'] else rollups.refresh()
+        elapsed = time.perf_counter() - started
+
+        for source, count in processed.items():
+            self.stdout.write(f'{source:<15}{count:>10}')
+
+        until = rollups.last_refreshed()
+        if until is None:
+            self.stdout.write('İşlenecek satır yok')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{sum(processed.values())} satır {elapsed:.2f} sn içinde işlendi '
+            f'(özetler {timezone.localtime(until):%d.%m.%Y %H:%M} itibarıyla güncel)'
+        ))
@@ -0,0 +1,34 @@
+"""
+Management command to refresh route landing page stats
+
+Son çalıştırmadan sonra ilanı veya teklifi değişen güzergahların
+RouteStats satırları yeniden hesaplanır ve sayfa içerikleri cache'e
+yazılır (website.route_stats). cron'dan çalıştırılır; /nakliye/<il>-<il>/
+sayfaları bu aralık kadar geriden gelir.
+
+--rebuild: penceredeki tüm güzergahları yeniden hesaplar; pencereden düşen
+ilanlar için günde bir çalıştırılır.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from website import route_stats
+from website.models import RouteStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute materialized stats for routes with changed shipments or bids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Tüm güzergahları yeniden hesapla')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = route_stats.rebuild() if options['rebuild'] else route_stats.refresh()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} güzergah {elapsed:.2f} sn içinde güncellendi '
+            f'({RouteStats.objects.count()} güzergah satırı)'
+        ))
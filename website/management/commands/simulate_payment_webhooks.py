@@ -0,0 +1,185 @@
+"""
+Management command to simulate iyzico/PayTR payment callbacks
+
+Sağlayıcının göndereceği imzalı bildirimler üretilir ve her biri --retries
+kez (karışık sırayla) gönderilir; sağlayıcı tekrar deneme fırtınası taklit
+edilir. Sonunda her ödemenin tek kez ödendi yapıldığı ve deftere tek kayıt
+yazıldığı kontrol edilir.
+
+Varsayılan (süreç içi): --payments kadar bekleyen ödeme geçici olarak
+oluşturulur, istekler Django test client'ı ile gönderilir ve olaylar istek
+içinde işlenir (PAYMENT_WEBHOOK_INLINE). Her şey tek transaction içinde
+çalışır ve sonunda geri alınır; anahtar tanımlı değilse simülatör anahtarı
+kullanılır.
+
+--url: çalışan bir sunucuya (runserver/gunicorn) --concurrency eşzamanlı
+bağlantıyla gönderir. Mevcut 'pending' ödemeler kullanılır ve gerçekten
+ödendi yapılır; sadece DEBUG=True iken çalışır. Anahtarlar sunucuyla aynı
+olmalıdır.
+"""
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from website.management.commands.check_admin_queries import seed
+from website.models import JournalEntry, Payment, PaymentWebhookEvent
+from website.payment_providers import PROVIDERS
+
+SIMULATOR_KEYS = {
+    'IYZICO_SECRET_KEY': 'simulator-iyzico-secret',
+    'PAYTR_MERCHANT_KEY': 'simulator-paytr-key',
+    'PAYTR_MERCHANT_SALT': 'simulator-paytr-salt',
+}
+
+
+class Command(BaseCommand):
+    help = 'Send signed virtual POS callbacks (with retries) and verify idempotent processing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', choices=sorted(PROVIDERS), default='iyzico')
+        parser.add_argument('--payments', type=int, default=200, help='Bildirim gönderilecek ödeme sayısı')
+        parser.add_argument('--retries', type=int, default=5, help='Her bildirimin gönderilme sayısı')
+        parser.add_argument('--url', help='Çalışan sunucu adresi, örn. http://localhost:8000')
+        parser.add_argument('--concurrency', type=int, default=16, help='--url ile eşzamanlı bağlantı')
+        parser.add_argument('--wait', type=int, default=30, help='--url ile işlenmeyi bekleme süresi (sn)')
+
+    def handle(self, *args, **options):
+        provider = PROVIDERS[options['provider']]
+        if options['url']:
+            self._run_remote(provider, options)
+        else:
+            keys = {name: getattr(settings, name) or value for name, value in SIMULATOR_KEYS.items()}
+            # Bildirim e-postaları konsola basılmasın
+            email_backend = 'django.core.mail.backends.locmem.EmailBackend'
+            with override_settings(PAYMENT_WEBHOOK_INLINE=True, EMAIL_BACKEND=email_backend, **keys):
+                self._run_local(provider, options)
+
+    def _run_local(self, provider, options):
+        path = reverse('website:payment_webhook', args=[provider.name])
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS and settings.ALLOWED_HOSTS[0] != '*' else 'localhost'
+        client = Client(HTTP_HOST=host)
+
+        with transaction.atomic():
+            seed(options['payments'])
+            payments = Payment.objects.filter(shipment__tracking_number__startswith='QB-')
+            payments.update(status='pending', paid_at=None)
+            requests = self._build_requests(provider, payments, options['retries'])
+
+            first, duplicate, statuses = [], [], {}
+            seen = set()
+            started = time.perf_counter()
+            for index, (content_type, body, headers) in requests:
+                request_started = time.perf_counter()
+                response = client.post(path, data=body, content_type=content_type, headers=headers, secure=True)
+                elapsed = (time.perf_counter() - request_started) * 1000
+                (duplicate if index in seen else first).append(elapsed)
+                seen.add(index)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            total_elapsed = time.perf_counter() - started
+
+            self._report(len(requests), total_elapsed, statuses, [('ilk', first), ('tekrar', duplicate)])
+            payment_ids = list(payments.values_list('pk', flat=True))
+            ok = self._verify(payment_ids)
+            transaction.set_rollback(True)
+
+        if not ok:
+            raise CommandError('Idempotency kontrolü başarısız')
+
+    def _run_remote(self, provider, options):
+        if not settings.DEBUG:
+            raise CommandError('--url sadece DEBUG=True iken kullanılabilir (ödemeler gerçekten ödendi yapılır)')
+        if not all(getattr(settings, name) for name in SIMULATOR_KEYS):
+            raise CommandError('Sağlayıcı anahtarları tanımlı değil (sunucuyla aynı .env kullanılmalı)')
+
+        payments = Payment.objects.filter(status='pending').order_by('created_at')[:options['payments']]
+        payment_ids = list(payments.values_list('pk', flat=True))
+        if not payment_ids:
+            raise CommandError("Bekleyen ('pending') ödeme yok")
+
+        url = options['url'].rstrip('/') + reverse('website:payment_webhook', args=[provider.name])
+        requests = self._build_requests(provider, Payment.objects.filter(pk__in=payment_ids), options['retries'])
+        latencies, statuses = [], {}
+
+        def send(request):
+            _, (content_type, body, headers) = request
+            request_started = time.perf_counter()
+            response = client.post(url, content=body, headers={'Content-Type': content_type, **headers})
+            return (time.perf_counter() - request_started) * 1000, response.status_code
+
+        limits = httpx.Limits(max_connections=options['concurrency'])
+        with httpx.Client(timeout=10.0, limits=limits) as client:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                for elapsed, status in pool.map(send, requests):
+                    latencies.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+            total_elapsed = time.perf_counter() - started
+
+        self._report(len(requests), total_elapsed, statuses, [('tümü', latencies)])
+
+        # Olaylar sunucunun thread havuzunda işlenir
+        deadline = time.monotonic() + options['wait']
+        while time.monotonic() < deadline:
+            if not Payment.objects.filter(pk__in=payment_ids, status='pending').exists():
+                break
+            time.sleep(0.5)
+        if not self._verify(payment_ids):
+            raise CommandError('Idempotency kontrolü başarısız')
+
+    @staticmethod
+    def _build_requests(provider, payments, retries):
+        """Her ödeme için tek imzalı bildirim; retries kez, karışık sırayla"""
+        callbacks = [provider.build_callback(payment) for payment in payments]
+        requests = [(index, callback) for index, callback in enumerate(callbacks) for _ in range(retries)]
+        random.shuffle(requests)
+        return requests
+
+    def _report(self, count, elapsed, statuses, groups):
+        codes = ', '.join(f'{status}: {total}' for status, total in sorted(statuses.items()))
+        self.stdout.write(f'{count} istek, {elapsed:.2f} sn, {count / elapsed:.0f} istek/sn ({codes})')
+        self.stdout.write(f'{"":>8}{"adet":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+        for label, values in groups:
+            values = sorted(values)
+            if not values:
+                continue
+            self.stdout.write(
+                f'{label:>8}{len(values):>8}'
+                f'{self._percentile(values, 50):>10.2f}'
+                f'{self._percentile(values, 95):>10.2f}'
+                f'{self._percentile(values, 99):>10.2f}'
+            )
+
+    def _verify(self, payment_ids):
+        expected = len(payment_ids)
+        checks = [
+            ('ödendi', Payment.objects.filter(pk__in=payment_ids, status='paid').count()),
+            ('olay', PaymentWebhookEvent.objects.filter(payment_id__in=payment_ids).count()),
+            ('işlendi', PaymentWebhookEvent.objects.filter(payment_id__in=payment_ids, status='processed').count()),
+            ('yevmiye', JournalEntry.objects.filter(payment_id__in=payment_ids, entry_type='payment_received').count()),
+        ]
+        ok = True
+        for label, value in checks:
+            line = f'{label:>10}: {value}/{expected}'
+            if value == expected:
+                self.stdout.write(line)
+            else:
+                ok = False
+                self.stdout.write(self.style.ERROR(line))
+        if ok:
+            self.stdout.write(self.style.SUCCESS('Her ödeme tek kez işlendi'))
+        return ok
+
+    @staticmethod
+    def _percentile(values, percent):
+        if len(values) < 2:
+            return values[0] if values else 0.0
+        return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
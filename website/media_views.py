@@ -0,0 +1,78 @@
+"""
+Media Views - Belge ve teslimat kanıtı dosyaları
+Kimlik belgeleri ve teslimat kanıtları sadece sahibine ve staff'a, imzalı
+bağlantı üzerinden sunulur (website.private_media). Yanıtlar paylaşılan
+önbelleklere (CDN, proxy) girmez.
+"""
+import logging
+import mimetypes
+
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
+
+from . import private_media
+from .thumbnails import THUMBNAIL_SIZES, ThumbnailError, get_thumbnail
+
+logger = logging.getLogger(__name__)
+
+# Küçük resim içeriği URL'e (kaynak + boyut) bağlı; sadece kullanıcının tarayıcısında saklanır
+CACHE_SECONDS = 60 * 60 * 24
+
+
+def _authorized_source(request, token):
+    """İmzalı bağlantının nesnesi ve kaynağı; kullanıcı sahibi veya staff değilse 404"""
+    try:
+        obj, source = private_media.resolve(token)
+    except (signing.BadSignature, LookupError, ValueError):
+        raise Http404
+    # Bağlantının varlığı sızmasın diye yetkisiz istek de 404 alır
+    if not private_media.can_view(request.user, obj):
+        raise Http404
+    return source
+
+
+def _private_cache(response):
+    response['Cache-Control'] = f'private, max-age={CACHE_SECONDS}'
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+@require_GET
+def thumbnail(request, size, token):
+    """Belge veya kanıt için WebP küçük resim"""
+    if size not in THUMBNAIL_SIZES:
+        raise Http404
+    source = _authorized_source(request, token)
+
+    # İmza kısmı kaynağı tekil olarak tanımlar
+    etag = f'"{size}-{token.rsplit(":", 1)[-1]}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    else:
+        try:
+            name = get_thumbnail(source, size)
+        except ThumbnailError as e:
+            logger.warning(f"Thumbnail failed ({size}): {e}")
+            raise Http404
+        with private_media.private_storage.open(name, 'rb') as handle:
+            response = HttpResponse(handle.read(), content_type='image/webp')
+
+    response['ETag'] = etag
+    return _private_cache(response)
+
+
+@require_GET
+def private_file(request, token):
+    """Özel storage'daki orijinal belge veya kanıt dosyası"""
+    source = _authorized_source(request, token)
+    if not private_media.is_private(source):
+        raise Http404
+
+    name = private_media.storage_name(source)
+    if not private_media.private_storage.exists(name):
+        raise Http404
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    response = FileResponse(private_media.private_storage.open(name, 'rb'), content_type=content_type)
+    return _private_cache(response)
@@ -0,0 +1,59 @@
+"""
+ASGI uyumlu middleware'ler
+
+Zincirde sync-only tek bir middleware olması, ASGI altında async view'ların
+da bir thread'de çalıştırılmasına yol açar. WhiteNoise 6.6 ve allauth 0.57
+middleware'leri sadece sync olduğu için burada async destekli alt sınıfları
+tanımlanır; WSGI altında orijinalleri ile aynı davranırlar.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from allauth.account.middleware import AccountMiddleware as BaseAccountMiddleware
+from allauth.core import context
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """Statik dosyaları sunar; ASGI'de istek zincirini async olarak sürdürür"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class AccountMiddleware(BaseAccountMiddleware):
+    """allauth AccountMiddleware; oturum erişimi ASGI'de thread'e taşınır"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        with context.request_context(request):
+            response = await self.get_response(request)
+            await sync_to_async(self._remove_dangling_login)(request, response)
+            return response
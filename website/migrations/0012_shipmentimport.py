@@ -0,0 +1,37 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0011_add_moving_details'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShipmentImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(help_text='Yüklenen dosya adı', max_length=255)),
+                ('status', models.CharField(choices=[('processing', 'İşleniyor'), ('completed', 'Tamamlandı'), ('failed', 'Başarısız')], default='processing', max_length=20)),
+                ('total_rows', models.IntegerField(default=0, help_text='İşlenen satır sayısı')),
+                ('created_count', models.IntegerField(default=0, help_text='Oluşturulan ilan sayısı')),
+                ('error_count', models.IntegerField(default=0, help_text='Hatalı satır sayısı')),
+                ('error_report', models.FileField(blank=True, help_text='Satır bazlı hata raporu (CSV)', upload_to='imports/errors/')),
+                ('error_message', models.TextField(blank=True, help_text='Dosya seviyesindeki hata')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('shipper', models.ForeignKey(help_text='Yükleyen yük sahibi', on_delete=django.db.models.deletion.CASCADE, related_name='shipment_imports', to='website.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Toplu İlan Yükleme',
+                'verbose_name_plural': 'Toplu İlan Yüklemeleri',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['shipper', '-created_at'], name='website_shi_shipper_ba116c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0012_shipmentimport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackingNumberSequence',
+            fields=[
+                ('year', models.IntegerField(primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0, help_text='Son verilen sıra numarası')),
+            ],
+            options={
+                'verbose_name': 'Takip Numarası Sayacı',
+                'verbose_name_plural': 'Takip Numarası Sayaçları',
+            },
+        ),
+        migrations.AlterField(
+            model_name='shipment',
+            name='tracking_number',
+            field=models.CharField(db_index=True, help_text='YN-2025-0000013 (yıl + sıra + kontrol hanesi)', max_length=50, unique=True),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:30
+
+import uuid
+
+from django.db import migrations, models
+import website.ids
+
+
+TARGETS = [('shipment', 'shipment_id'), ('bid', 'bid_id'), ('payment', 'payment_id')]
+
+
+def _referencing_columns(model):
+    """(model, column) pairs pointing at model's primary key"""
+    return [
+        (rel.related_model, rel.field.column)
+        for rel in model._meta.related_objects
+        if rel.field.concrete
+    ]
+
+
+def prepare_ids(apps, schema_editor):
+    """
+    Rewrite primary keys that are not canonical UUID strings before the type
+    change. Legacy ids map to website.ids.legacy_uuid() so old URLs keep
+    resolving through parse_id(). Referencing rows are updated in the same
+    transaction (FK constraints are deferred).
+    """
+    Shipment = apps.get_model('website', 'Shipment')
+
+    for model_name, pk_name in TARGETS:
+        model = apps.get_model('website', model_name)
+        remap = {}
+        for value in model.objects.values_list(pk_name, flat=True).iterator():
+            try:
+                canonical = str(uuid.UUID(value))
+            except ValueError:
+                canonical = str(website.ids.legacy_uuid(value))
+            if canonical != value:
+                remap[value] = canonical
+
+        for old, new in remap.items():
+            for related_model, column in _referencing_columns(model):
+                attname = next(f.attname for f in related_model._meta.concrete_fields if f.column == column)
+                related_model.objects.filter(**{attname: old}).update(**{attname: new})
+            if model_name == 'bid':
+                Shipment.objects.filter(assigned_bid_id=old).update(assigned_bid_id=new)
+            model.objects.filter(pk=old).update(**{pk_name: new})
+
+    if schema_editor.connection.vendor == 'postgresql':
+        # The UPDATEs above queue deferred FK checks; PostgreSQL refuses to
+        # ALTER a table with pending trigger events, so run them now.
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    # varchar_pattern_ops indexes cannot survive a cast to uuid on PostgreSQL
+    if schema_editor.connection.vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            for model_name, pk_name in TARGETS:
+                model = apps.get_model('website', model_name)
+                columns = [(model._meta.db_table, pk_name)]
+                columns += [(related._meta.db_table, column) for related, column in _referencing_columns(model)]
+                for table, column in columns:
+                    cursor.execute(
+                        "SELECT indexname FROM pg_indexes WHERE tablename = %s "
+                        "AND indexdef LIKE %s",
+                        [table, f'%({column} varchar_pattern_ops)%'],
+                    )
+                    for (index_name,) in cursor.fetchall():
+                        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index_name)}')
+
+
+def normalize_uuid_columns(apps, schema_editor):
+    """
+    Backends without a native uuid type (SQLite) store UUIDField as 32 hex
+    chars; the table rebuild copied the old hyphenated strings verbatim.
+    """
+    if schema_editor.connection.features.has_native_uuid_field:
+        return
+
+    for model_name, pk_name in TARGETS:
+        model = apps.get_model('website', model_name)
+        columns = [(model._meta.db_table, pk_name)]
+        columns += [(related._meta.db_table, column) for related, column in _referencing_columns(model)]
+        for table, column in columns:
+            table, column = schema_editor.quote_name(table), schema_editor.quote_name(column)
+            schema_editor.execute(f"UPDATE {table} SET {column} = REPLACE(LOWER({column}), '-', '') WHERE {column} LIKE '%%-%%'")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0013_tracking_number_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(prepare_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='bid',
+            name='bid_id',
+            field=models.UUIDField(default=website.ids.uuid7, editable=False, help_text='Unique ID (UUIDv7)', primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='payment_id',
+            field=models.UUIDField(default=website.ids.uuid7, editable=False, help_text='Unique ID (UUIDv7)', primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='shipment',
+            name='shipment_id',
+            field=models.UUIDField(default=website.ids.uuid7, editable=False, help_text='Unique ID (UUIDv7)', primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(normalize_uuid_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:42
+
+from django.db import migrations, models
+from django.db.models import Count
+
+DOCUMENT_TYPE_BITS = {'license': 1, 'registration': 2, 'src': 4, 'psychotech': 8}
+
+
+def backfill_document_summary(apps, schema_editor):
+    """Mevcut belgelerden profil özetlerini hesapla (tek GROUP BY)"""
+    UserDocument = apps.get_model('website', 'UserDocument')
+    UserProfile = apps.get_model('website', 'UserProfile')
+
+    summaries = {}
+    rows = (
+        UserDocument.objects.values_list('user_email', 'document_type', 'status')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for email, doc_type, status, total in rows:
+        summary = summaries.setdefault(email, [0, 0, 0])
+        summary[0] += total
+        if status == 'approved':
+            summary[1] += total
+            summary[2] |= DOCUMENT_TYPE_BITS.get(doc_type, 0)
+
+    for profile in UserProfile.objects.filter(user__email__in=summaries).select_related('user'):
+        profile.document_count, profile.approved_document_count, profile.approved_document_types = summaries[profile.user.email]
+        profile.save(update_fields=['document_count', 'approved_document_count', 'approved_document_types'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0014_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='approved_document_count',
+            field=models.PositiveIntegerField(default=0, help_text='Onaylı belge sayısı'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='approved_document_types',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Onaylı belge türleri (bitmask)'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='document_count',
+            field=models.PositiveIntegerField(default=0, help_text='Yüklenen belge sayısı'),
+        ),
+        migrations.AddIndex(
+            model_name='userdocument',
+            index=models.Index(fields=['user_email', 'document_type'], name='website_use_user_em_378e84_idx'),
+        ),
+        migrations.RunPython(backfill_document_summary, migrations.RunPython.noop),
+    ]
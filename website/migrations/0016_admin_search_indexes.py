@@ -0,0 +1,65 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:10
+
+from django.db import migrations
+
+# (index adı, tablo, index ifadesi)
+# gin_trgm_ops: admin'in icontains aramaları için eklendi; çıplak kolon
+# üzerinde oldukları için kullanılmıyorlardı, 0023 UPPER() ifadesiyle değiştirir
+# UPPER(...): iexact (e-posta / '=' search_fields) kısayolları
+INDEXES = [
+    ('shipment_title_trgm', 'website_shipment', 'USING gin (title gin_trgm_ops)'),
+    ('shipment_description_trgm', 'website_shipment', 'USING gin (description gin_trgm_ops)'),
+    ('shipment_from_city_trgm', 'website_shipment', 'USING gin (from_address_city gin_trgm_ops)'),
+    ('shipment_to_city_trgm', 'website_shipment', 'USING gin (to_address_city gin_trgm_ops)'),
+    ('shipment_shipper_email_upper', 'website_shipment', '(UPPER(shipper_email::text))'),
+    ('bid_carrier_name_trgm', 'website_bid', 'USING gin (carrier_name gin_trgm_ops)'),
+    ('bid_carrier_email_upper', 'website_bid', '(UPPER(carrier_email::text))'),
+    ('bid_shipper_email_upper', 'website_bid', '(UPPER(shipper_email::text))'),
+    ('payment_transaction_id_upper', 'website_payment', '(UPPER(transaction_id::text))'),
+    ('adminactivity_description_trgm', 'website_adminactivity', 'USING gin (description gin_trgm_ops)'),
+    ('adminactivity_target_id', 'website_adminactivity', '(target_id)'),
+    ('userprofile_phone_trgm', 'website_userprofile', 'USING gin (phone_number gin_trgm_ops)'),
+    ('auth_user_username_trgm', 'auth_user', 'USING gin (username gin_trgm_ops)'),
+    ('auth_user_username_upper', 'auth_user', '(UPPER(username::text))'),
+    ('auth_user_email_upper', 'auth_user', '(UPPER(email::text))'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    """
+    Sadece PostgreSQL. Index'ler CONCURRENTLY oluşturulur; büyük tablolarda
+    yazmalar kilitlenmez. SQLite'ta icontains/iexact LIKE ile çalıştığı için
+    bu index'ler kullanılmaz, atlanır.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, definition in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {schema_editor.quote_name(name)} '
+            f'ON {schema_editor.quote_name(table)} {definition}'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('website', '0015_user_document_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
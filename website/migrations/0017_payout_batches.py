@@ -0,0 +1,47 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('website', '0016_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminactivity',
+            name='action_type',
+            field=models.CharField(choices=[('document_approved', 'Belge Onaylandı'), ('document_rejected', 'Belge Reddedildi'), ('shipment_approved', 'İlan Onaylandı'), ('shipment_rejected', 'İlan Reddedildi'), ('user_suspended', 'Kullanıcı Askıya Alındı'), ('user_activated', 'Kullanıcı Aktif Edildi'), ('payment_transferred', 'Ödeme Transfer Edildi')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='PayoutBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reference', models.CharField(help_text='Parti referansı (banka dosyasında MsgId)', max_length=50, unique=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('payment_count', models.IntegerField(default=0, help_text='Partideki ödeme sayısı')),
+                ('transfer_count', models.IntegerField(default=0, help_text='Banka transferi sayısı (IBAN başına bir)')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, help_text='Toplam transfer tutarı (TRY)', max_digits=14)),
+                ('file_format', models.CharField(choices=[('csv', 'CSV'), ('xml', 'ISO 20022 pain.001 XML')], default='csv', max_length=10)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('file_content', models.TextField(blank=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payout_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Ödeme Partisi',
+                'verbose_name_plural': 'Ödeme Partileri',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='payout_batch',
+            field=models.ForeignKey(blank=True, help_text='Transferin yapıldığı ödeme partisi', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='website.payoutbatch'),
+        ),
+    ]
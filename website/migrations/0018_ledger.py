@@ -0,0 +1,101 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0017_payout_batches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_type', models.CharField(choices=[('payment_received', 'Ödeme Alındı'), ('delivery_confirmed', 'Teslim Onaylandı'), ('payout', 'Taşıyıcı Transferi')], max_length=30)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Kayıt tutarı (borç toplamı = alacak toplamı)', max_digits=16)),
+                ('posted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='journal_entries', to='website.payment')),
+                ('payout_batch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='journal_entries', to='website.payoutbatch')),
+            ],
+            options={
+                'verbose_name': 'Yevmiye Kaydı',
+                'verbose_name_plural': 'Yevmiye Kayıtları',
+                'ordering': ['-posted_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='Hesap kodu (örn. escrow, carrier_payable:12)', max_length=100, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('account_type', models.CharField(choices=[('asset', 'Varlık'), ('liability', 'Yükümlülük'), ('revenue', 'Gelir')], max_length=20)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, help_text='Toplam borç', max_digits=16)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, help_text='Toplam alacak', max_digits=16)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('parent', models.ForeignKey(blank=True, help_text='Bakiyesi alt hesapların toplamı olan üst hesap', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='website.ledgeraccount')),
+                ('profile', models.OneToOneField(blank=True, help_text='Taşıyıcı alt hesabı ise profil', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ledger_account', to='website.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Muhasebe Hesabı',
+                'verbose_name_plural': 'Muhasebe Hesapları',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerDailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to='website.ledgeraccount')),
+            ],
+            options={
+                'verbose_name': 'Günlük Hesap Özeti',
+                'verbose_name_plural': 'Günlük Hesap Özetleri',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('balance_after', models.DecimalField(decimal_places=2, help_text='Kayıttan sonraki hesap bakiyesi', max_digits=16)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='website.ledgeraccount')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='website.journalentry')),
+            ],
+            options={
+                'verbose_name': 'Muhasebe Satırı',
+                'verbose_name_plural': 'Muhasebe Satırları',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['account', 'id'], name='website_led_account_036f80_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ledgerdailybalance',
+            constraint=models.UniqueConstraint(fields=('account', 'date'), name='ledger_daily_balance_unique_day'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['entry_type', '-posted_at'], name='website_jou_entry_t_41fa36_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='journalentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('payment__isnull', False)), fields=('payment', 'entry_type'), name='journal_entry_unique_payment_transition'),
+        ),
+        migrations.AddConstraint(
+            model_name='journalentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('payout_batch__isnull', False)), fields=('payout_batch', 'entry_type'), name='journal_entry_unique_payout_batch'),
+        ),
+    ]
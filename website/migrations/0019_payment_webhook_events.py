@@ -0,0 +1,45 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0018_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(help_text='Ödeme sağlayıcı (iyzico, paytr)', max_length=30)),
+                ('event_id', models.CharField(help_text="Sağlayıcının olay ID'si", max_length=255)),
+                ('event_type', models.CharField(blank=True, max_length=50)),
+                ('payment_reference', models.CharField(blank=True, help_text='Bildirimdeki ödeme referansı (Payment.payment_id)', max_length=100)),
+                ('transaction_id', models.CharField(blank=True, help_text='Sanal POS işlem ID', max_length=255)),
+                ('succeeded', models.BooleanField(default=False, help_text='Sağlayıcıya göre ödeme başarılı mı?')),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, help_text='Bildirimdeki tutar (TRY)', max_digits=10, null=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('received', 'Alındı'), ('processed', 'İşlendi'), ('ignored', 'Yok Sayıldı'), ('failed', 'Hata')], default='received', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('payment', models.ForeignKey(blank=True, help_text='İşlenirken eşleşen ödeme', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='webhook_events', to='website.payment')),
+            ],
+            options={
+                'verbose_name': 'Ödeme Bildirimi',
+                'verbose_name_plural': 'Ödeme Bildirimleri',
+                'ordering': ['-received_at'],
+                'indexes': [models.Index(fields=['status', 'received_at'], name='website_pay_status_049918_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='paymentwebhookevent',
+            constraint=models.UniqueConstraint(fields=('provider', 'event_id'), name='payment_webhook_event_unique'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0019_payment_webhook_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Saatlik'), ('day', 'Günlük')], max_length=10)),
+                ('bucket', models.DateTimeField(help_text='Dönem başlangıcı (yerel saat)')),
+                ('from_city', models.CharField(blank=True, max_length=100)),
+                ('to_city', models.CharField(blank=True, max_length=100)),
+                ('cargo_type', models.CharField(blank=True, max_length=50)),
+                ('shipments', models.IntegerField(default=0, help_text='Oluşturulan ilan')),
+                ('bids', models.IntegerField(default=0, help_text='Verilen teklif')),
+                ('accepted_bids', models.IntegerField(default=0, help_text='Kabul edilen teklif')),
+                ('payments', models.IntegerField(default=0, help_text='Alınan ödeme')),
+                ('gmv', models.DecimalField(decimal_places=2, default=0, help_text='Alınan ödeme tutarı (TRY)', max_digits=16)),
+                ('platform_fees', models.DecimalField(decimal_places=2, default=0, help_text='Teslimle kesinleşen komisyon (TRY)', max_digits=16)),
+            ],
+            options={
+                'verbose_name': 'Metrik Özeti',
+                'verbose_name_plural': 'Metrik Özetleri',
+                'ordering': ['-bucket'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Özet İşaretçisi',
+                'verbose_name_plural': 'Özet İşaretçileri',
+                'ordering': ['source'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['created_at'], name='website_bid_created_6a7383_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['accepted_at'], name='website_bid_accepte_8c0ef7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shipment',
+            index=models.Index(fields=['created_at'], name='website_shi_created_c21386_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='metricrollup',
+            constraint=models.UniqueConstraint(fields=('granularity', 'bucket', 'from_city', 'to_city', 'cargo_type'), name='metric_rollup_unique_bucket'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0020_metric_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoutePriceIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_city', models.CharField(max_length=100)),
+                ('to_city', models.CharField(max_length=100)),
+                ('cargo_type', models.CharField(blank=True, max_length=50)),
+                ('weight_band', models.SmallIntegerField(default=0, help_text='Ağırlık aralığı (0 = tümü)')),
+                ('sample_count', models.IntegerField(default=0, help_text='Toplam gözlem sayısı')),
+                ('weight', models.FloatField(default=0, help_text='Azalan ağırlıkların toplamı (decayed_at anında)')),
+                ('sum_log_price', models.FloatField(default=0)),
+                ('sum_log_price_sq', models.FloatField(default=0)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('decayed_at', models.DateTimeField(help_text='Ağırlıkların en son azaltıldığı an (son gözlem)')),
+            ],
+            options={
+                'verbose_name': 'Güzergah Fiyat Endeksi',
+                'verbose_name_plural': 'Güzergah Fiyat Endeksi',
+                'ordering': ['from_city', 'to_city', 'cargo_type', 'weight_band'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='routepriceindex',
+            constraint=models.UniqueConstraint(fields=('from_city', 'to_city', 'cargo_type', 'weight_band'), name='route_price_index_unique_key'),
+        ),
+    ]
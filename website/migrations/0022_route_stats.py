@@ -0,0 +1,47 @@
+# Generated by Django 4.2.8 on 2026-10-19 16:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0021_route_price_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_city', models.CharField(max_length=100)),
+                ('to_city', models.CharField(max_length=100)),
+                ('slug', models.CharField(help_text='istanbul-ankara', max_length=120, unique=True)),
+                ('active_loads', models.IntegerField(default=0, help_text='Aktif ilan sayısı')),
+                ('total_loads', models.IntegerField(default=0, help_text='Son ROUTE_STATS_DAYS gündeki ilan sayısı')),
+                ('median_price', models.DecimalField(blank=True, decimal_places=2, help_text='Kesinleşen (yoksa önerilen) fiyatların medyanı', max_digits=10, null=True)),
+                ('avg_bids_per_load', models.FloatField(default=0)),
+                ('typical_transit_days', models.SmallIntegerField(blank=True, help_text='Kabul edilen tekliflerdeki teslim süresinin medyanı', null=True)),
+                ('distance_km', models.IntegerField(blank=True, null=True)),
+                ('last_listing_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Güzergah İstatistiği',
+                'verbose_name_plural': 'Güzergah İstatistikleri',
+                'ordering': ['-total_loads'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['updated_at'], name='website_bid_updated_aa3849_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shipment',
+            index=models.Index(fields=['updated_at'], name='website_shi_updated_225d48_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='routestats',
+            index=models.Index(fields=['from_city', '-total_loads'], name='website_rou_from_ci_ae39cd_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# 0016'daki trigram index'leri çıplak kolon üzerindeydi; PostgreSQL'de Django
+# icontains'i UPPER("kolon"::text) LIKE UPPER(%s) olarak yazar ve planner
+# ifade index'i ister. Index'ler aynı ifadeyle yeniden oluşturulur.
+OLD_INDEXES = [
+    'shipment_title_trgm',
+    'shipment_description_trgm',
+    'shipment_from_city_trgm',
+    'shipment_to_city_trgm',
+    'bid_carrier_name_trgm',
+    'adminactivity_description_trgm',
+    'userprofile_phone_trgm',
+    'auth_user_username_trgm',
+    # Kullanıcı adı artık iexact ile aranmıyor
+    'auth_user_username_upper',
+]
+
+# (index adı, tablo, kolon): admin search_fields'taki her icontains kolonu
+INDEXES = [
+    ('shipment_tracking_number_utrgm', 'website_shipment', 'tracking_number'),
+    ('shipment_title_utrgm', 'website_shipment', 'title'),
+    ('shipment_description_utrgm', 'website_shipment', 'description'),
+    ('shipment_from_city_utrgm', 'website_shipment', 'from_address_city'),
+    ('shipment_to_city_utrgm', 'website_shipment', 'to_address_city'),
+    ('bid_tracking_number_utrgm', 'website_bid', 'tracking_number'),
+    ('bid_carrier_email_utrgm', 'website_bid', 'carrier_email'),
+    ('bid_carrier_name_utrgm', 'website_bid', 'carrier_name'),
+    ('bid_shipper_email_utrgm', 'website_bid', 'shipper_email'),
+    ('bid_bid_id_utrgm', 'website_bid', 'bid_id'),
+    ('payment_payment_id_utrgm', 'website_payment', 'payment_id'),
+    ('payment_transaction_id_utrgm', 'website_payment', 'transaction_id'),
+    ('adminactivity_description_utrgm', 'website_adminactivity', 'description'),
+    ('adminactivity_target_id_utrgm', 'website_adminactivity', 'target_id'),
+    ('userprofile_phone_utrgm', 'website_userprofile', 'phone_number'),
+    ('auth_user_username_utrgm', 'auth_user', 'username'),
+    ('auth_user_email_utrgm', 'auth_user', 'email'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    """Sadece PostgreSQL; 0016 gibi CONCURRENTLY (yazmalar kilitlenmez)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} '
+            f'ON {quote(table)} USING gin (UPPER({quote(column)}::text) gin_trgm_ops)'
+        )
+    for name in OLD_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {quote(name)}')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY transaction içinde çalışamaz
+    atomic = False
+
+    dependencies = [
+        ('website', '0022_route_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
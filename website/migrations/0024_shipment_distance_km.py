@@ -0,0 +1,56 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:10
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+CHUNK_SIZE = 2000
+
+
+def backfill_distance_km(apps, schema_editor):
+    """
+    Mevcut ilanların mesafesi: pk sırasıyla parça parça okunur, mesafe güzergah
+    başına bir kez hesaplanır; parçadaki satırlar mesafeye göre gruplanıp
+    pk__in ile güncellenir (tablo bir kez taranır, UPDATE'ler pk index'ini kullanır)
+    """
+    from website import distances
+
+    Shipment = apps.get_model('website', 'Shipment')
+    fields = ('from_address_city', 'to_address_city', 'from_address_district', 'to_address_district')
+    known = {}
+    last = None
+    while True:
+        rows = Shipment.objects.order_by('pk').values_list('pk', *fields)
+        if last is not None:
+            rows = rows.filter(pk__gt=last)
+        rows = list(rows[:CHUNK_SIZE])
+        if not rows:
+            break
+        last = rows[-1][0]
+
+        by_distance = defaultdict(list)
+        for pk, *route in rows:
+            route = tuple(route)
+            if route not in known:
+                known[route] = distances.distance_km(*route)
+            if known[route] is not None:
+                by_distance[known[route]].append(pk)
+        for km, pks in by_distance.items():
+            Shipment.objects.filter(pk__in=pks).update(distance_km=km)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0023_admin_search_upper_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shipment',
+            name='distance_km',
+            field=models.PositiveIntegerField(blank=True, help_text='Tahmini karayolu mesafesi (km)', null=True),
+        ),
+        migrations.RunPython(backfill_distance_km, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.8 on 2026-10-19 18:40
+
+from django.conf import settings
+from django.db import migrations
+
+
+def merge_city_keys(apps, schema_editor):
+    """
+    Ham yazımla ("istanbul", "ISTANBUL ") anahtarlanmış endeks satırlarını
+    ilin standart adına (pricing.city_key) taşı. Aynı anahtarda satır varsa
+    toplamlar birleştirilir: iki satır da son gözlem anına azaltılıp toplanır
+    (pricing._observe ile aynı yarı ömür).
+    """
+    from website import gazetteer
+
+    RoutePriceIndex = apps.get_model('website', 'RoutePriceIndex')
+
+    def city_key(city):
+        return (gazetteer.province_name(city) or (city or '').strip())[:100]
+
+    def decayed(index, at):
+        days = max((at - index.decayed_at).total_seconds(), 0) / 86400
+        return 0.5 ** (days / settings.PRICE_INDEX_HALF_LIFE_DAYS)
+
+    rows = list(RoutePriceIndex.objects.order_by('pk'))
+    canonical, changed = {}, {}
+    stale = []
+    for row in rows:
+        key = (row.from_city, row.to_city, row.cargo_type, row.weight_band)
+        if (city_key(row.from_city), city_key(row.to_city)) == key[:2]:
+            canonical.setdefault(key, row)
+    for row in rows:
+        from_city, to_city = city_key(row.from_city), city_key(row.to_city)
+        if (from_city, to_city) == (row.from_city, row.to_city):
+            continue
+        key = (from_city, to_city, row.cargo_type, row.weight_band)
+        target = canonical.get(key)
+        if target is None:
+            row.from_city, row.to_city = from_city, to_city
+            canonical[key] = changed[key] = row
+            stale.append(row.pk)  # Yeni satır olarak yazılır, eskisi silinir
+            row.pk = None
+            continue
+        at = max(target.decayed_at, row.decayed_at)
+        target_factor, row_factor = decayed(target, at), decayed(row, at)
+        target.weight = target.weight * target_factor + row.weight * row_factor
+        target.sum_log_price = target.sum_log_price * target_factor + row.sum_log_price * row_factor
+        target.sum_log_price_sq = target.sum_log_price_sq * target_factor + row.sum_log_price_sq * row_factor
+        target.sample_count += row.sample_count
+        prices = [price for price in (target.min_price, row.min_price) if price is not None]
+        target.min_price = min(prices) if prices else None
+        prices = [price for price in (target.max_price, row.max_price) if price is not None]
+        target.max_price = max(prices) if prices else None
+        target.decayed_at = at
+        changed[key] = target
+        stale.append(row.pk)
+
+    RoutePriceIndex.objects.filter(pk__in=stale).delete()
+    for row in changed.values():
+        row.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0024_shipment_distance_km'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_city_keys, migrations.RunPython.noop),
+    ]
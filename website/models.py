@@ -3,12 +3,14 @@ Django Models for Admin Panel
 These models are used for admin verification and monitoring
 Actual data is stored in Firebase Firestore (shared with mobile app)
 """
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from .ids import uuid7
+
 
 class UserDocument(models.Model):
     """
@@ -49,12 +51,77 @@ class UserDocument(models.Model):
         verbose_name_plural = "Kullanıcı Belgeleri"
         indexes = [
             models.Index(fields=['status']),
+            models.Index(fields=['user_email', 'document_type']),
         ]
 
     def __str__(self):
         return f"{self.user_email} - {self.get_document_type_display()} ({self.get_status_display()})"
 
 
+# Onaylı belge türleri UserProfile.approved_document_types içinde bit olarak tutulur
+DOCUMENT_TYPE_BITS = {doc_type: 1 << index for index, (doc_type, _) in enumerate(UserDocument.DOCUMENT_TYPES)}
+REQUIRED_DOCUMENTS_MASK = sum(DOCUMENT_TYPE_BITS.values())
+
+DOCUMENT_SUMMARY_FIELDS = ['document_count', 'approved_document_count', 'approved_document_types']
+
+
+def document_summaries(emails):
+    """
+    email -> (belge sayısı, onaylı belge sayısı, onaylı tür bitmask'i)
+    Tüm e-postalar için tek GROUP BY sorgusu
+    """
+    summaries = {email: [0, 0, 0] for email in emails}
+    rows = (
+        UserDocument.objects.filter(user_email__in=summaries)
+        .values_list('user_email', 'document_type', 'status')
+        .annotate(total=models.Count('id'))
+        .order_by()
+    )
+    for email, doc_type, status, total in rows:
+        summary = summaries[email]
+        summary[0] += total
+        if status == 'approved':
+            summary[1] += total
+            summary[2] |= DOCUMENT_TYPE_BITS.get(doc_type, 0)
+    return {email: tuple(summary) for email, summary in summaries.items()}
+
+
+def refresh_document_summaries(emails, mark_verified=False):
+    """
+    Verilen e-postalara ait profillerin belge özetini yeniden hesapla
+
+    Özetler tek GROUP BY ile hesaplanır, değişen profiller tek bulk_update
+    ile yazılır. mark_verified=True ise tüm gerekli belgeleri onaylı olan
+    profiller documents_verified=True yapılır. Yeni doğrulanan profilleri
+    döndürür.
+    """
+    from .user_cache import invalidate_users
+
+    summaries = document_summaries(set(emails))
+    if not summaries:
+        return []
+
+    now = timezone.now()
+    changed, verified = [], []
+    for profile in UserProfile.objects.filter(user__email__in=summaries).select_related('user'):
+        updated = profile.set_document_summary(*summaries[profile.user.email])
+        if mark_verified and not profile.documents_verified and profile.check_documents_verified():
+            profile.documents_verified = True
+            verified.append(profile)
+            updated = True
+        if updated:
+            profile.updated_at = now
+            changed.append(profile)
+
+    if changed:
+        UserProfile.objects.bulk_update(changed, DOCUMENT_SUMMARY_FIELDS + ['documents_verified', 'updated_at'])
+        # bulk_update post_save göndermez; çağıranın transaction'ı commit
+        # edilmeden temizlenirse eski satır yeniden önbelleğe girebilir
+        user_ids = [profile.user_id for profile in changed]
+        transaction.on_commit(lambda: invalidate_users(user_ids))
+    return verified
+
+
 class AdminActivity(models.Model):
     """
     Admin activity log
@@ -67,6 +134,7 @@ class AdminActivity(models.Model):
         ('shipment_rejected', 'İlan Reddedildi'),
         ('user_suspended', 'Kullanıcı Askıya Alındı'),
         ('user_activated', 'Kullanıcı Aktif Edildi'),
+        ('payment_transferred', 'Ödeme Transfer Edildi'),
     ]
 
     admin_user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -124,6 +192,11 @@ class UserProfile(models.Model):
     profile_completed = models.BooleanField(default=False)
     documents_verified = models.BooleanField(default=False)
 
+    # Document summary (UserDocument değişince signals ile güncellenir)
+    document_count = models.PositiveIntegerField(default=0, help_text="Yüklenen belge sayısı")
+    approved_document_count = models.PositiveIntegerField(default=0, help_text="Onaylı belge sayısı")
+    approved_document_types = models.PositiveSmallIntegerField(default=0, help_text="Onaylı belge türleri (bitmask)")
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -137,11 +210,11 @@ class UserProfile(models.Model):
 
     def get_document_count(self):
         """Get count of uploaded documents"""
-        return UserDocument.objects.filter(user_email=self.user.email).count()
+        return self.document_count
 
     def get_approved_document_count(self):
         """Get count of approved documents"""
-        return UserDocument.objects.filter(user_email=self.user.email, status='approved').count()
+        return self.approved_document_count
 
     def check_documents_verified(self):
         """Check if all required documents are approved (only for carriers)"""
@@ -150,16 +223,26 @@ class UserProfile(models.Model):
             return True
 
         # Taşıyıcılar için tüm belgeler gerekli
-        required_docs = ['license', 'registration', 'src', 'psychotech']
-        for doc_type in required_docs:
-            if not UserDocument.objects.filter(
-                user_email=self.user.email,
-                document_type=doc_type,
-                status='approved'
-            ).exists():
-                return False
+        return self.approved_document_types & REQUIRED_DOCUMENTS_MASK == REQUIRED_DOCUMENTS_MASK
+
+    def set_document_summary(self, document_count, approved_count, approved_types):
+        """Belge özetini ata (kaydetmez); değiştiyse True döndür"""
+        if (self.document_count, self.approved_document_count, self.approved_document_types) == (
+            document_count, approved_count, approved_types
+        ):
+            return False
+        self.document_count = document_count
+        self.approved_document_count = approved_count
+        self.approved_document_types = approved_types
         return True
 
+    def refresh_document_summary(self):
+        """Bu profilin belge özetini yeniden hesapla ve kaydet"""
+        if self.set_document_summary(*document_summaries([self.user.email])[self.user.email]):
+            self.save(update_fields=DOCUMENT_SUMMARY_FIELDS + ['updated_at'])
+            return True
+        return False
+
     def is_carrier(self):
         """Check if user is a carrier"""
         return self.user_type == 1
@@ -232,6 +315,10 @@ class Vehicle(models.Model):
         return f"{self.plate_number} - {self.brand} {self.model}"
 
 
+# Shipment.distance_km bu alanlardan hesaplanır
+ROUTE_FIELDS = frozenset({'from_address_city', 'from_address_district', 'to_address_city', 'to_address_district'})
+
+
 class Shipment(models.Model):
     """
     Shipment/İlan model - Main shipment listings
@@ -258,8 +345,8 @@ class Shipment(models.Model):
     ]
 
     # Shipment identification
-    shipment_id = models.CharField(max_length=128, unique=True, db_index=True, primary_key=True, help_text="Unique ID")
-    tracking_number = models.CharField(max_length=50, unique=True, db_index=True, help_text="YN-2025-001234")
+    shipment_id = models.UUIDField(primary_key=True, default=uuid7, editable=False, help_text="Unique ID (UUIDv7)")
+    tracking_number = models.CharField(max_length=50, unique=True, db_index=True, help_text="YN-2025-0000013 (yıl + sıra + kontrol hanesi)")
 
     # Shipper information
     shipper = models.ForeignKey('UserProfile', on_delete=models.CASCADE, related_name='shipments', help_text="Yük sahibi")
@@ -284,6 +371,9 @@ class Shipment(models.Model):
     to_address_lat = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
     to_address_lng = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
 
+    # Güzergah mesafesi: adreslerden website.distances ile hesaplanır (save())
+    distance_km = models.PositiveIntegerField(null=True, blank=True, help_text="Tahmini karayolu mesafesi (km)")
+
     # Cargo details
     weight = models.DecimalField(max_digits=10, decimal_places=2, help_text="Ağırlık (kg)")
 
@@ -317,6 +407,16 @@ class Shipment(models.Model):
         help_text="İndirme sorumluluğu"
     )
 
+    # Moving details (evden eve / ofis taşıma)
+    from_floor = models.IntegerField(null=True, blank=True, help_text="Alış adresi kat numarası")
+    from_has_elevator = models.BooleanField(null=True, blank=True, help_text="Alış adresinde normal asansör var mı?")
+    from_has_freight_elevator = models.BooleanField(null=True, blank=True, help_text="Alış adresinde yük asansörü var mı?")
+    from_room_count = models.CharField(max_length=10, null=True, blank=True, help_text="Alış adresi oda sayısı (2+1, 3+1, vb.)")
+    to_floor = models.IntegerField(null=True, blank=True, help_text="Teslimat adresi kat numarası")
+    to_has_elevator = models.BooleanField(null=True, blank=True, help_text="Teslimat adresinde normal asansör var mı?")
+    to_has_freight_elevator = models.BooleanField(null=True, blank=True, help_text="Teslimat adresinde yük asansörü var mı?")
+    to_room_count = models.CharField(max_length=10, null=True, blank=True, help_text="Teslimat adresi oda sayısı (2+1, 3+1, vb.)")
+
     # Pricing
     suggested_price = models.DecimalField(max_digits=10, decimal_places=2, help_text="Önerilen fiyat (TRY)")
     final_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Kesinleşen fiyat")
@@ -349,11 +449,37 @@ class Shipment(models.Model):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['tracking_number']),
             models.Index(fields=['from_address_city', 'to_address_city']),
+            # website.rollups watermark taraması
+            models.Index(fields=['created_at']),
+            # website.route_stats değişen güzergahlar taraması
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
         return f"{self.tracking_number} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        """Adres şehir/ilçe alanları yazılıyorsa güzergah mesafesini yeniden hesapla"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or ROUTE_FIELDS.intersection(update_fields):
+            self.distance_km = self.route_distance_km()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'distance_km'}
+        super().save(*args, **kwargs)
+
+    def route_distance_km(self):
+        from . import distances
+
+        return distances.distance_km(
+            self.from_address_city, self.to_address_city, self.from_address_district, self.to_address_district,
+        )
+
+    @property
+    def price_per_km(self):
+        from . import distances
+
+        return distances.price_per_km(self.suggested_price, self.distance_km)
+
     def increment_view_count(self):
         """Increment view count"""
         self.view_count += 1
@@ -378,7 +504,7 @@ class Bid(models.Model):
     ]
 
     # Bid identification
-    bid_id = models.CharField(max_length=128, unique=True, db_index=True, primary_key=True, help_text="Unique ID")
+    bid_id = models.UUIDField(primary_key=True, default=uuid7, editable=False, help_text="Unique ID (UUIDv7)")
 
     # Shipment information (ForeignKey to Shipment)
     shipment = models.ForeignKey('Shipment', on_delete=models.CASCADE, related_name='bids', help_text="İlan")
@@ -420,6 +546,11 @@ class Bid(models.Model):
         indexes = [
             models.Index(fields=['shipment_id', 'status']),
             models.Index(fields=['tracking_number']),
+            # website.rollups watermark taramaları
+            models.Index(fields=['created_at']),
+            models.Index(fields=['accepted_at']),
+            # website.route_stats değişen güzergahlar taraması
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
@@ -481,7 +612,7 @@ class Payment(models.Model):
     ]
 
     # Payment identification
-    payment_id = models.CharField(max_length=128, unique=True, db_index=True, primary_key=True)
+    payment_id = models.UUIDField(primary_key=True, default=uuid7, editable=False, help_text="Unique ID (UUIDv7)")
 
     # Related objects
     shipment = models.OneToOneField('Shipment', on_delete=models.CASCADE, related_name='payment')
@@ -515,6 +646,7 @@ class Payment(models.Model):
     admin_transferred_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='transferred_payments')
     admin_transferred_at = models.DateTimeField(null=True, blank=True)
     admin_notes = models.TextField(blank=True, help_text="Admin notları")
+    payout_batch = models.ForeignKey('PayoutBatch', on_delete=models.SET_NULL, null=True, blank=True, related_name='payments', help_text="Transferin yapıldığı ödeme partisi")
 
     # Timestamps
     created_at = models.DateTimeField(default=timezone.now)
@@ -701,3 +833,377 @@ class Review(models.Model):
             self.reviewed.rating_avg = round(avg_rating, 2)
             self.reviewed.rating_count = reviews.count()
             self.reviewed.save(update_fields=['rating_avg', 'rating_count'])
+
+
+class ShipmentImport(models.Model):
+    """
+    Toplu ilan yükleme kaydı (CSV/XLSX)
+    Her yükleme için satır sayıları ve indirilebilir hata raporu tutulur
+    """
+    STATUS_CHOICES = [
+        ('processing', 'İşleniyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+    ]
+
+    # Uploader
+    shipper = models.ForeignKey('UserProfile', on_delete=models.CASCADE, related_name='shipment_imports', help_text="Yükleyen yük sahibi")
+    file_name = models.CharField(max_length=255, help_text="Yüklenen dosya adı")
+
+    # Result
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='processing')
+    total_rows = models.IntegerField(default=0, help_text="İşlenen satır sayısı")
+    created_count = models.IntegerField(default=0, help_text="Oluşturulan ilan sayısı")
+    error_count = models.IntegerField(default=0, help_text="Hatalı satır sayısı")
+    error_report = models.FileField(upload_to='imports/errors/', blank=True, help_text="Satır bazlı hata raporu (CSV)")
+    error_message = models.TextField(blank=True, help_text="Dosya seviyesindeki hata")
+
+    # Timestamps
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Toplu İlan Yükleme"
+        verbose_name_plural = "Toplu İlan Yüklemeleri"
+        indexes = [
+            models.Index(fields=['shipper', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} - {self.created_count}/{self.total_rows} ({self.get_status_display()})"
+
+
+class TrackingNumberSequence(models.Model):
+    """
+    Yıllık takip numarası sayacı
+    Her yıl için tek satır; numaralar website.tracking_numbers ile ayrılır
+    """
+    year = models.IntegerField(primary_key=True)
+    last_value = models.BigIntegerField(default=0, help_text="Son verilen sıra numarası")
+
+    class Meta:
+        verbose_name = "Takip Numarası Sayacı"
+        verbose_name_plural = "Takip Numarası Sayaçları"
+
+    def __str__(self):
+        return f"{self.year}: {self.last_value}"
+
+
+class PayoutBatch(models.Model):
+    """
+    Taşıyıcı ödeme partisi
+    Uygun ödemeler tek seferde transfer edilir ve bankaya yüklenecek
+    tek bir transfer dosyası (CSV / pain.001 XML) üretilir
+    """
+    FILE_FORMATS = [
+        ('csv', 'CSV'),
+        ('xml', 'ISO 20022 pain.001 XML'),
+    ]
+
+    reference = models.CharField(max_length=50, unique=True, help_text="Parti referansı (banka dosyasında MsgId)")
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='payout_batches')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    # Özet
+    payment_count = models.IntegerField(default=0, help_text="Partideki ödeme sayısı")
+    transfer_count = models.IntegerField(default=0, help_text="Banka transferi sayısı (IBAN başına bir)")
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Toplam transfer tutarı (TRY)")
+
+    # Banka dosyası - IBAN içerdiği için public media yerine veritabanında tutulur
+    file_format = models.CharField(max_length=10, choices=FILE_FORMATS, default='csv')
+    file_name = models.CharField(max_length=255, blank=True)
+    file_content = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Ödeme Partisi"
+        verbose_name_plural = "Ödeme Partileri"
+
+    def __str__(self):
+        return f"{self.reference} - {self.payment_count} ödeme - {self.total_amount} TL"
+
+
+class LedgerAccount(models.Model):
+    """
+    Çift taraflı muhasebe hesabı
+    balance her kayıtla aynı transaction içinde güncellenir (normal tarafına göre:
+    varlık için borç - alacak, yükümlülük/gelir için alacak - borç).
+    Taşıyıcı alt hesaplarının toplamı üst hesapta (carrier_payable) tutulur.
+    """
+    ACCOUNT_TYPES = [
+        ('asset', 'Varlık'),
+        ('liability', 'Yükümlülük'),
+        ('revenue', 'Gelir'),
+    ]
+
+    code = models.CharField(max_length=100, unique=True, help_text="Hesap kodu (örn. escrow, carrier_payable:12)")
+    name = models.CharField(max_length=200)
+    account_type = models.CharField(max_length=20, choices=ACCOUNT_TYPES)
+    parent = models.ForeignKey('self', on_delete=models.PROTECT, null=True, blank=True, related_name='children', help_text="Bakiyesi alt hesapların toplamı olan üst hesap")
+    profile = models.OneToOneField('UserProfile', on_delete=models.PROTECT, null=True, blank=True, related_name='ledger_account', help_text="Taşıyıcı alt hesabı ise profil")
+
+    # Önceden hesaplanmış bakiyeler
+    balance = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    debit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0, help_text="Toplam borç")
+    credit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0, help_text="Toplam alacak")
+
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['code']
+        verbose_name = "Muhasebe Hesabı"
+        verbose_name_plural = "Muhasebe Hesapları"
+
+    def __str__(self):
+        return f"{self.name} ({self.balance} TL)"
+
+
+class JournalEntry(models.Model):
+    """
+    Yevmiye kaydı - sadece eklenir, güncellenmez/silinmez
+    Her ödeme geçişi için tek kayıt (payment + entry_type benzersiz)
+    """
+    ENTRY_TYPES = [
+        ('payment_received', 'Ödeme Alındı'),       # Sanal POS -> emanet
+        ('delivery_confirmed', 'Teslim Onaylandı'),  # Emanet -> taşıyıcı borcu + komisyon
+        ('payout', 'Taşıyıcı Transferi'),            # Taşıyıcı borcu -> banka
+    ]
+
+    entry_type = models.CharField(max_length=30, choices=ENTRY_TYPES)
+    description = models.CharField(max_length=255, blank=True)
+    payment = models.ForeignKey('Payment', on_delete=models.PROTECT, null=True, blank=True, related_name='journal_entries')
+    payout_batch = models.ForeignKey('PayoutBatch', on_delete=models.PROTECT, null=True, blank=True, related_name='journal_entries')
+    amount = models.DecimalField(max_digits=16, decimal_places=2, help_text="Kayıt tutarı (borç toplamı = alacak toplamı)")
+    posted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-posted_at']
+        verbose_name = "Yevmiye Kaydı"
+        verbose_name_plural = "Yevmiye Kayıtları"
+        indexes = [
+            models.Index(fields=['entry_type', '-posted_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['payment', 'entry_type'],
+                condition=models.Q(payment__isnull=False),
+                name='journal_entry_unique_payment_transition',
+            ),
+            models.UniqueConstraint(
+                fields=['payout_batch', 'entry_type'],
+                condition=models.Q(payout_batch__isnull=False),
+                name='journal_entry_unique_payout_batch',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_entry_type_display()} - {self.amount} TL - {self.posted_at:%d.%m.%Y %H:%M}"
+
+
+class LedgerLine(models.Model):
+    """Yevmiye kaydının hesap satırı; balance_after hesap ekstresi içindir"""
+    entry = models.ForeignKey('JournalEntry', on_delete=models.PROTECT, related_name='lines')
+    account = models.ForeignKey('LedgerAccount', on_delete=models.PROTECT, related_name='lines')
+    debit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    balance_after = models.DecimalField(max_digits=16, decimal_places=2, help_text="Kayıttan sonraki hesap bakiyesi")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Muhasebe Satırı"
+        verbose_name_plural = "Muhasebe Satırları"
+        indexes = [
+            models.Index(fields=['account', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.account.code} B:{self.debit} A:{self.credit}"
+
+
+class LedgerDailyBalance(models.Model):
+    """Hesap başına günlük borç/alacak toplamı ve gün sonu bakiyesi"""
+    account = models.ForeignKey('LedgerAccount', on_delete=models.CASCADE, related_name='daily_balances')
+    date = models.DateField()
+    debit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    closing_balance = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = "Günlük Hesap Özeti"
+        verbose_name_plural = "Günlük Hesap Özetleri"
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'date'], name='ledger_daily_balance_unique_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.account.code} {self.date} - {self.closing_balance} TL"
+
+
+class PaymentWebhookEvent(models.Model):
+    """
+    Sanal POS bildirimi (webhook)
+    Sağlayıcı + olay ID benzersizdir; aynı bildirimin tekrarları tek satırdır.
+    Tablo aynı zamanda işlenecek olayların kalıcı kuyruğudur.
+    """
+    STATUS_CHOICES = [
+        ('received', 'Alındı'),        # Kuyrukta
+        ('processed', 'İşlendi'),
+        ('ignored', 'Yok Sayıldı'),    # Ödeme zaten işlenmiş / olay türü ilgisiz
+        ('failed', 'Hata'),            # Tekrar denenecek
+    ]
+
+    provider = models.CharField(max_length=30, help_text="Ödeme sağlayıcı (iyzico, paytr)")
+    event_id = models.CharField(max_length=255, help_text="Sağlayıcının olay ID'si")
+    event_type = models.CharField(max_length=50, blank=True)
+    payment_reference = models.CharField(max_length=100, blank=True, help_text="Bildirimdeki ödeme referansı (Payment.payment_id)")
+    payment = models.ForeignKey('Payment', on_delete=models.SET_NULL, null=True, blank=True, related_name='webhook_events', help_text="İşlenirken eşleşen ödeme")
+    transaction_id = models.CharField(max_length=255, blank=True, help_text="Sanal POS işlem ID")
+    succeeded = models.BooleanField(default=False, help_text="Sağlayıcıya göre ödeme başarılı mı?")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Bildirimdeki tutar (TRY)")
+    payload = models.JSONField(default=dict)
+
+    # İşleme durumu
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='received')
+    attempts = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True)
+
+    # Timestamps
+    received_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-received_at']
+        verbose_name = "Ödeme Bildirimi"
+        verbose_name_plural = "Ödeme Bildirimleri"
+        indexes = [
+            models.Index(fields=['status', 'received_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'event_id'], name='payment_webhook_event_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.provider} {self.event_id} - {self.get_status_display()}"
+
+
+class MetricRollup(models.Model):
+    """
+    Saatlik / günlük özet satırı (website.rollups)
+    Dönem başı + şehir çifti + yük tipi başına sayaçlar ve tutarlar
+    """
+    GRANULARITIES = [
+        ('hour', 'Saatlik'),
+        ('day', 'Günlük'),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITIES)
+    bucket = models.DateTimeField(help_text="Dönem başlangıcı (yerel saat)")
+    from_city = models.CharField(max_length=100, blank=True)
+    to_city = models.CharField(max_length=100, blank=True)
+    cargo_type = models.CharField(max_length=50, blank=True)
+
+    # Sayaçlar
+    shipments = models.IntegerField(default=0, help_text="Oluşturulan ilan")
+    bids = models.IntegerField(default=0, help_text="Verilen teklif")
+    accepted_bids = models.IntegerField(default=0, help_text="Kabul edilen teklif")
+    payments = models.IntegerField(default=0, help_text="Alınan ödeme")
+    gmv = models.DecimalField(max_digits=16, decimal_places=2, default=0, help_text="Alınan ödeme tutarı (TRY)")
+    platform_fees = models.DecimalField(max_digits=16, decimal_places=2, default=0, help_text="Teslimle kesinleşen komisyon (TRY)")
+
+    class Meta:
+        ordering = ['-bucket']
+        verbose_name = "Metrik Özeti"
+        verbose_name_plural = "Metrik Özetleri"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket', 'from_city', 'to_city', 'cargo_type'],
+                name='metric_rollup_unique_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket:%d.%m.%Y %H:%M} {self.from_city}-{self.to_city} {self.cargo_type}"
+
+
+class RollupWatermark(models.Model):
+    """Kaynak başına işlenmiş son zaman; sonraki çalıştırma sadece sonrasını okur"""
+    source = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['source']
+        verbose_name = "Özet İşaretçisi"
+        verbose_name_plural = "Özet İşaretçileri"
+
+    def __str__(self):
+        return f"{self.source} - {self.processed_until:%d.%m.%Y %H:%M}"
+
+
+class RoutePriceIndex(models.Model):
+    """
+    Güzergah fiyat endeksi (website.pricing)
+    Kabul edilmiş fiyatların zamanla azalan ağırlıklı log-ortalaması ve
+    varyansı. cargo_type='' ve weight_band=0 satırları üst seviye
+    (tüm yük tipleri / tüm ağırlıklar) toplamlarıdır.
+    """
+    from_city = models.CharField(max_length=100)
+    to_city = models.CharField(max_length=100)
+    cargo_type = models.CharField(max_length=50, blank=True)
+    weight_band = models.SmallIntegerField(default=0, help_text="Ağırlık aralığı (0 = tümü)")
+
+    sample_count = models.IntegerField(default=0, help_text="Toplam gözlem sayısı")
+    weight = models.FloatField(default=0, help_text="Azalan ağırlıkların toplamı (decayed_at anında)")
+    sum_log_price = models.FloatField(default=0)
+    sum_log_price_sq = models.FloatField(default=0)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    decayed_at = models.DateTimeField(help_text="Ağırlıkların en son azaltıldığı an (son gözlem)")
+
+    class Meta:
+        ordering = ['from_city', 'to_city', 'cargo_type', 'weight_band']
+        verbose_name = "Güzergah Fiyat Endeksi"
+        verbose_name_plural = "Güzergah Fiyat Endeksi"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['from_city', 'to_city', 'cargo_type', 'weight_band'],
+                name='route_price_index_unique_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.from_city} → {self.to_city} {self.cargo_type or '*'} #{self.weight_band} ({self.sample_count})"
+
+
+class RouteStats(models.Model):
+    """
+    Güzergah sayfası özeti (website.route_stats)
+    /nakliye/<il>-<il>/ sayfaları ilan ve teklif tabloları yerine bu
+    tablodan okunur; değişen güzergahlar refresh_route_stats ile güncellenir.
+    """
+    from_city = models.CharField(max_length=100)
+    to_city = models.CharField(max_length=100)
+    slug = models.CharField(max_length=120, unique=True, help_text="istanbul-ankara")
+
+    active_loads = models.IntegerField(default=0, help_text="Aktif ilan sayısı")
+    total_loads = models.IntegerField(default=0, help_text="Son ROUTE_STATS_DAYS gündeki ilan sayısı")
+    median_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Kesinleşen (yoksa önerilen) fiyatların medyanı")
+    avg_bids_per_load = models.FloatField(default=0)
+    typical_transit_days = models.SmallIntegerField(null=True, blank=True, help_text="Kabul edilen tekliflerdeki teslim süresinin medyanı")
+    distance_km = models.IntegerField(null=True, blank=True)
+    last_listing_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_loads']
+        verbose_name = "Güzergah İstatistiği"
+        verbose_name_plural = "Güzergah İstatistikleri"
+        indexes = [
+            # Sayfadaki "bu şehirden diğer güzergahlar" listesi
+            models.Index(fields=['from_city', '-total_loads']),
+        ]
+
+    def __str__(self):
+        return f"{self.from_city} → {self.to_city} ({self.active_loads}/{self.total_loads})"
@@ -0,0 +1,29 @@
+"""
+E-posta bildirimleri - SMTP gönderimi istek thread'inin dışında yapılır
+
+SMTP bağlantısı saniyeler sürebilir; view'lar mesajı hazırlayıp küçük bir
+thread havuzuna bırakır ve yanıtı beklemeden döner. Hatalar loglanır.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='mail')
+
+
+def _send(subject, message, recipient_list, from_email):
+    try:
+        send_mail(subject, message, from_email, recipient_list, fail_silently=False)
+    except Exception as e:
+        logger.error(f"Error sending email '{subject}' to {recipient_list}: {e}")
+
+
+def send_mail_in_background(subject, message, recipient_list, from_email=None):
+    """E-postayı arka planda gönder (veritabanına erişmez)"""
+    if not recipient_list:
+        return None
+    return _executor.submit(_send, subject, message, list(recipient_list), from_email or settings.DEFAULT_FROM_EMAIL)
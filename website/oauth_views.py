@@ -4,16 +4,25 @@ Custom Google OAuth Views - Simple and reliable
 from django.shortcuts import redirect
 from django.contrib.auth import login as auth_login
 from django.http import HttpResponse
-from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
 from .models import UserProfile
+from .http_client import get_json_cached, request_with_retry, scoped_async_client
 from django.conf import settings
-import requests
+from asgiref.sync import sync_to_async
+import httpx
+import jwt
 import logging
 import secrets
 
 logger = logging.getLogger(__name__)
 
+# Google OpenID Connect endpoints (defaults if the discovery document is unavailable)
+GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
 
 def google_login_start(request):
     """
@@ -50,10 +59,99 @@ def google_login_start(request):
     return redirect(google_auth_url)
 
 
-@csrf_exempt
-def google_oauth_callback(request):
+def _pop_oauth_state(request, state):
+    """Verify and clear the OAuth state stored in the session"""
+    saved_state = request.session.get('oauth_state')
+    if state and saved_state and state != saved_state:
+        logger.warning(f"OAuth state mismatch: received={state}, saved={saved_state}")
+        # Continue anyway - Google has already authenticated the user
+    # Clear the state after verification
+    request.session.pop('oauth_state', None)
+
+
+def _login_google_user(request, user_info):
+    """Get or create the user for a Google profile and log them in"""
+    email = user_info.get('email')
+    given_name = user_info.get('given_name', '')
+    family_name = user_info.get('family_name', '')
+
+    # Get or create user
+    try:
+        user = User.objects.get(email=email)
+        logger.info(f"Existing user found: {email}")
+    except User.DoesNotExist:
+        # Create new user
+        user = User.objects.create_user(
+            username=email,
+            email=email,
+            first_name=given_name,
+            last_name=family_name
+        )
+        user.set_unusable_password()  # No password for OAuth users
+        user.save()
+        logger.info(f"New user created: {email}")
+
+    # Ensure UserProfile exists (get_or_create to avoid duplicate error)
+    try:
+        profile, created = UserProfile.objects.get_or_create(
+            user=user,
+            defaults={
+                'user_type': 0,  # Default: shipper (Yük Veren)
+            }
+        )
+        if created:
+            logger.info(f"UserProfile created for: {email}")
+        else:
+            logger.info(f"UserProfile already exists for: {email}")
+    except Exception as e:
+        logger.error(f"Failed to get/create UserProfile: {e}")
+        # Continue anyway - profile might already exist
+
+    # Log the user in
+    auth_login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+    logger.info(f"User logged in: {email}")
+
+
+async def verify_google_id_token(id_token, client_id, discovery=None):
+    """
+    Verify a Google ID token (signature, audience, issuer, expiry) and
+    return its claims
+
+    Signing keys come from the cached JWKS document; an unknown key id
+    forces one refresh in case Google rotated its keys.
+    """
+    discovery = discovery or {}
+    jwks_uri = discovery.get('jwks_uri', GOOGLE_JWKS_URL)
+    kid = jwt.get_unverified_header(id_token).get('kid')
+
+    jwks = await get_json_cached(jwks_uri)
+    if kid not in {key.get('kid') for key in jwks.get('keys', [])}:
+        jwks = await get_json_cached(jwks_uri, force_refresh=True)
+
+    try:
+        signing_key = jwt.PyJWKSet.from_dict(jwks)[kid]
+    except KeyError:
+        # Yenilemeden sonra da yoksa anahtar Google'ın değil
+        raise jwt.InvalidTokenError(f'Unknown signing key id: {kid}')
+    return jwt.decode(
+        id_token,
+        key=signing_key.key,
+        algorithms=['RS256'],
+        audience=client_id,
+        issuer=GOOGLE_ISSUERS,
+        leeway=60,
+    )
+
+
+@scoped_async_client
+async def google_oauth_callback(request):
     """
     Handle Google OAuth callback
+
+    Async view: the token exchange is awaited on the shared httpx client
+    (keep-alive, timeouts, retry) and the returned ID token is verified
+    locally against Google's cached JWKS, so a login costs one round-trip
+    to Google. Session/auth work runs via sync_to_async.
     """
     # Get authorization code from Google
     code = request.GET.get('code')
@@ -78,29 +176,28 @@ def google_oauth_callback(request):
         return HttpResponse("No authorization code received", status=400)
 
     # Verify state (CSRF protection)
-    saved_state = request.session.get('oauth_state')
-    if state and saved_state and state != saved_state:
-        logger.warning(f"OAuth state mismatch: received={state}, saved={saved_state}")
-        # Clear the old state
-        request.session.pop('oauth_state', None)
-        # Continue anyway - Google has already authenticated the user
-    else:
-        # Clear the state after successful verification
-        request.session.pop('oauth_state', None)
+    await sync_to_async(_pop_oauth_state)(request, state)
 
     # Get Google credentials
     from allauth.socialaccount.models import SocialApp
     try:
-        google_app = SocialApp.objects.get(provider='google')
+        google_app = await SocialApp.objects.aget(provider='google')
         client_id = google_app.client_id
         client_secret = google_app.secret
     except Exception as e:
         logger.error(f"Failed to get Google app: {e}")
         return HttpResponse(f"Configuration error: {e}", status=500)
 
-    # Exchange code for access token
+    # Exchange code for tokens
     redirect_uri = request.build_absolute_uri('/oauth/google/callback/')
-    token_url = "https://oauth2.googleapis.com/token"
+
+    try:
+        discovery = await get_json_cached(GOOGLE_DISCOVERY_URL)
+        token_url = discovery.get('token_endpoint', GOOGLE_TOKEN_URL)
+    except Exception as e:
+        logger.warning(f"Google discovery document unavailable, using defaults: {e}")
+        discovery = {}
+        token_url = GOOGLE_TOKEN_URL
 
     token_data = {
         'code': code,
@@ -111,10 +208,10 @@ def google_oauth_callback(request):
     }
 
     try:
-        token_response = requests.post(token_url, data=token_data, timeout=10)
+        token_response = await request_with_retry('POST', token_url, data=token_data)
         token_response.raise_for_status()
         tokens = token_response.json()
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         logger.error(f"Failed to exchange code for token: HTTP {e.response.status_code}")
         logger.error(f"Response body: {e.response.text}")
         return HttpResponse(
@@ -125,71 +222,50 @@ def google_oauth_callback(request):
         logger.error(f"Failed to exchange code for token: {e}")
         return HttpResponse(f"Token exchange failed: {str(e)}", status=500)
 
-    access_token = tokens.get('access_token')
-    if not access_token:
-        return HttpResponse("No access token received", status=500)
-
-    # Get user info from Google
-    userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
-    headers = {'Authorization': f'Bearer {access_token}'}
-
-    try:
-        userinfo_response = requests.get(userinfo_url, headers=headers)
-        userinfo_response.raise_for_status()
-        user_info = userinfo_response.json()
-    except Exception as e:
-        logger.error(f"Failed to get user info: {e}")
-        return HttpResponse(f"Failed to get user info: {e}", status=500)
+    # Verify the ID token locally (no extra round-trip to the userinfo endpoint)
+    id_token = tokens.get('id_token')
+    if id_token:
+        try:
+            user_info = await verify_google_id_token(id_token, client_id, discovery)
+        except jwt.InvalidTokenError as e:
+            logger.error(f"Invalid Google ID token: {e}")
+            return HttpResponse("Invalid ID token", status=400)
+        except Exception as e:
+            logger.error(f"Failed to verify ID token: {e}")
+            return HttpResponse(f"ID token verification failed: {e}", status=500)
+    else:
+        # Fallback: no openid scope granted, ask the userinfo endpoint
+        access_token = tokens.get('access_token')
+        if not access_token:
+            return HttpResponse("No access token received", status=500)
 
-    # Extract user data
-    email = user_info.get('email')
-    given_name = user_info.get('given_name', '')
-    family_name = user_info.get('family_name', '')
-    google_id = user_info.get('id')
+        userinfo_url = discovery.get('userinfo_endpoint', GOOGLE_USERINFO_URL)
+        headers = {'Authorization': f'Bearer {access_token}'}
 
-    if not email:
+        try:
+            userinfo_response = await request_with_retry('GET', userinfo_url, headers=headers)
+            userinfo_response.raise_for_status()
+            user_info = userinfo_response.json()
+        except Exception as e:
+            logger.error(f"Failed to get user info: {e}")
+            return HttpResponse(f"Failed to get user info: {e}", status=500)
+
+    if not user_info.get('email'):
         return HttpResponse("No email in Google response", status=400)
 
-    # Get or create user
-    try:
-        user = User.objects.get(email=email)
-        logger.info(f"Existing user found: {email}")
-    except User.DoesNotExist:
-        # Create new user
-        user = User.objects.create_user(
-            username=email,
-            email=email,
-            first_name=given_name,
-            last_name=family_name
-        )
-        user.set_unusable_password()  # No password for OAuth users
-        user.save()
-        logger.info(f"New user created: {email}")
-
-    # Ensure UserProfile exists (get_or_create to avoid duplicate error)
-    try:
-        profile, created = UserProfile.objects.get_or_create(
-            user=user,
-            defaults={
-                'user_type': 0,  # Default: shipper (Yük Veren)
-            }
-        )
-        if created:
-            logger.info(f"UserProfile created for: {email}")
-        else:
-            logger.info(f"UserProfile already exists for: {email}")
-    except Exception as e:
-        logger.error(f"Failed to get/create UserProfile: {e}")
-        # Continue anyway - profile might already exist
+    if user_info.get('email_verified') is False or user_info.get('verified_email') is False:
+        return HttpResponse("Google email address is not verified", status=400)
 
-    # Log the user in
-    auth_login(request, user, backend='django.contrib.auth.backends.ModelBackend')
-    logger.info(f"User logged in: {email}")
+    await sync_to_async(_login_google_user)(request, user_info)
 
     # Redirect to create shipment page
     return redirect('/ilan-olustur/')
 
 
+# csrf_exempt() in Django 4.2 wraps the view in a sync function; set the flag directly
+google_oauth_callback.csrf_exempt = True
+
+
 def google_login_debug(request):
     """
     Google OAuth callback - Debug version
@@ -0,0 +1,187 @@
+"""
+Sanal POS sağlayıcıları - bildirim (webhook) doğrulama ve ayrıştırma
+
+Her sağlayıcı kendi imza şemasını doğrular ve bildirimi ortak bir
+ProviderEvent'e çevirir; website.payment_webhooks olayları sağlayıcıdan
+bağımsız işler. build_callback simülatör içindir: gerçek sağlayıcının
+göndereceği imzalı isteği üretir (simulate_payment_webhooks komutu).
+
+- iyzico: JSON gövde, X-IYZ-SIGNATURE-V3 başlığında HMAC-SHA256 (hex).
+  Olay ID'si iyziReferenceCode.
+- PayTR: form gövdesi, hash alanında HMAC-SHA256 (base64). PayTR olay ID'si
+  göndermez; merchant_oid + status aynı bildirimin tekrarlarında sabittir.
+  Yanıt gövdesi "OK" olmadıkça PayTR bildirimi tekrarlar.
+
+Anahtarlar settings'ten çağrı anında okunur; anahtarı tanımlı olmayan
+sağlayıcının tüm bildirimleri reddedilir.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponse
+
+
+class InvalidCallback(ValueError):
+    """Bildirim gövdesi eksik veya hatalı"""
+
+
+class InvalidSignature(InvalidCallback):
+    """İmza doğrulanamadı"""
+
+
+class ProviderEvent:
+    """Sağlayıcıdan bağımsız ödeme bildirimi"""
+
+    def __init__(self, event_id, event_type, payment_reference, succeeded, transaction_id='', amount=None, payload=None):
+        self.event_id = event_id
+        self.event_type = event_type
+        self.payment_reference = payment_reference
+        self.succeeded = succeeded
+        self.transaction_id = transaction_id
+        self.amount = amount
+        self.payload = payload or {}
+
+
+def hmac_sha256(key, message):
+    return hmac.new(key.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
+
+
+class PaymentProvider:
+    """Sağlayıcı arayüzü"""
+    name = None
+    display_name = None
+
+    def parse(self, request):
+        """İmzayı doğrula ve ProviderEvent döndür (InvalidCallback / InvalidSignature)"""
+        raise NotImplementedError
+
+    def acknowledge(self):
+        """Sağlayıcının tekrar denemeyi bırakması için beklediği yanıt"""
+        return HttpResponse('OK', content_type='text/plain')
+
+    def build_callback(self, payment, succeeded=True):
+        """Simülatör: (content_type, gövde, başlıklar)"""
+        raise NotImplementedError
+
+
+class IyzicoProvider(PaymentProvider):
+    name = 'iyzico'
+    display_name = 'iyzico'
+    signature_header = 'X-IYZ-SIGNATURE-V3'
+
+    def secret(self):
+        return settings.IYZICO_SECRET_KEY
+
+    def signature(self, data):
+        secret = self.secret()
+        message = (
+            f"{secret}{data.get('iyziEventType', '')}{data.get('paymentId', '')}"
+            f"{data.get('paymentConversationId', '')}{data.get('status', '')}"
+        )
+        return hmac_sha256(secret, message).hex()
+
+    def parse(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            raise InvalidCallback('Geçersiz JSON')
+        if not isinstance(data, dict):
+            raise InvalidCallback('Geçersiz JSON')
+
+        received = request.headers.get(self.signature_header, '')
+        if not self.secret() or not hmac.compare_digest(received, self.signature(data)):
+            raise InvalidSignature(self.name)
+
+        for field in ('iyziReferenceCode', 'paymentConversationId', 'status'):
+            if not data.get(field):
+                raise InvalidCallback(f'{field} eksik')
+
+        return ProviderEvent(
+            event_id=str(data['iyziReferenceCode']),
+            event_type=str(data.get('iyziEventType', '')),
+            payment_reference=str(data['paymentConversationId']),
+            succeeded=data['status'] == 'SUCCESS',
+            transaction_id=str(data.get('paymentId', '')),
+            payload=data,
+        )
+
+    def acknowledge(self):
+        return HttpResponse(status=200)
+
+    def build_callback(self, payment, succeeded=True):
+        data = {
+            'iyziEventType': 'CHECKOUT_FORM_AUTH',
+            'iyziEventTime': int(time.time() * 1000),
+            'iyziReferenceCode': str(uuid.uuid4()),
+            'paymentId': str(int(time.time() * 1000) % 10 ** 8),
+            'paymentConversationId': str(payment.payment_id),
+            'status': 'SUCCESS' if succeeded else 'FAILURE',
+        }
+        return 'application/json', json.dumps(data), {self.signature_header: self.signature(data)}
+
+
+class PayTRProvider(PaymentProvider):
+    name = 'paytr'
+    display_name = 'PayTR'
+
+    def signature(self, merchant_oid, status, total_amount):
+        key, salt = settings.PAYTR_MERCHANT_KEY, settings.PAYTR_MERCHANT_SALT
+        digest = hmac_sha256(key, f'{merchant_oid}{salt}{status}{total_amount}')
+        return base64.b64encode(digest).decode('ascii')
+
+    def parse(self, request):
+        data = request.POST
+        merchant_oid = data.get('merchant_oid', '')
+        status = data.get('status', '')
+        total_amount = data.get('total_amount', '')
+
+        expected = self.signature(merchant_oid, status, total_amount)
+        if not settings.PAYTR_MERCHANT_KEY or not hmac.compare_digest(data.get('hash', ''), expected):
+            raise InvalidSignature(self.name)
+
+        if not merchant_oid or status not in ('success', 'failed'):
+            raise InvalidCallback('merchant_oid veya status eksik')
+        try:
+            # Tutar kuruş cinsinden gelir
+            amount = Decimal(total_amount) / 100
+        except InvalidOperation:
+            raise InvalidCallback('Geçersiz total_amount')
+
+        return ProviderEvent(
+            event_id=f'{merchant_oid}:{status}',
+            event_type=status,
+            payment_reference=merchant_oid,
+            succeeded=status == 'success',
+            transaction_id=merchant_oid,
+            amount=amount,
+            payload=data.dict(),
+        )
+
+    def build_callback(self, payment, succeeded=True):
+        # merchant_oid sadece harf/rakam içerebilir
+        merchant_oid = payment.payment_id.hex
+        status = 'success' if succeeded else 'failed'
+        total_amount = str(int(payment.amount * 100))
+        data = {
+            'merchant_oid': merchant_oid,
+            'status': status,
+            'total_amount': total_amount,
+            'payment_type': 'card',
+            'currency': 'TL',
+            'hash': self.signature(merchant_oid, status, total_amount),
+        }
+        return 'application/x-www-form-urlencoded', urlencode(data), {}
+
+
+PROVIDERS = {provider.name: provider for provider in (IyzicoProvider(), PayTRProvider())}
+
+
+def get_provider(name):
+    return PROVIDERS.get(name)
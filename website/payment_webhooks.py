@@ -0,0 +1,199 @@
+"""
+Sanal POS bildirimlerinin idempotent alınması ve işlenmesi
+
+Sağlayıcılar bildirimi yanıt alamadıkları sürece (ve bazen aldıktan sonra da)
+tekrar gönderir; yoğun anlarda aynı olay saniyede onlarca kez gelebilir.
+
+Alım (istek içinde, ödeme tablosuna dokunmadan):
+1. İmza doğrulanır (website.payment_providers)
+2. Olay ID'si cache'te işaretliyse (kayıt commit edilmiş) tekrar veritabanına
+   gitmeden onaylanır (Redis'te tüm worker'lar arasında ortak)
+3. Olay PaymentWebhookEvent'e yazılır; (provider, event_id) benzersiz
+   kısıtı cache'i kaçıran tekrarları yakalar
+4. Commit sonrası olay ID'si cache'e işaretlenir ve olay işleme havuzuna
+   bırakılır, sağlayıcıya hemen yanıt döner. İşaret kayıttan önce konmaz:
+   worker kayıt ile commit arasında ölürse sağlayıcının tekrarı kaybolmaz.
+
+İşleme (arka plan thread'i veya process_payment_webhooks komutu):
+olay ve ödeme satırı kilitlenir, ödeme hâlâ 'pending' ise ödendi yapılır ve
+deftere yazılır. Aynı ödemenin farklı olayları sırayla işlenir; ikincisi
+'ignored' olur. Hata alan olaylar 'failed' kalır ve komutla tekrar denenir.
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from . import ledger
+from .models import Payment, PaymentWebhookEvent
+from .notifications import send_mail_in_background
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.PAYMENT_WEBHOOK_WORKERS, thread_name_prefix='webhook')
+
+# Sağlayıcıların tekrar deneme penceresinden uzun
+DEDUP_TIMEOUT = 60 * 60 * 24 * 3
+
+
+class WebhookError(Exception):
+    """Olay işlenemedi (tekrar denenebilir)"""
+
+
+def dedup_key(provider_name, event_id):
+    return f'payment-webhook:{provider_name}:{event_id}'
+
+
+def ingest(provider, event):
+    """
+    Olayı kaydet ve kuyruğa al. Yeni olaysa kayıt, tekrarsa None döner.
+    Cache sadece ipucudur; olayın kaydedildiğinin kaynağı benzersiz kısıttır.
+    """
+    key = dedup_key(provider.name, event.event_id)
+    if cache.get(key):
+        return None
+
+    try:
+        with transaction.atomic():
+            record = PaymentWebhookEvent.objects.create(
+                provider=provider.name,
+                event_id=event.event_id,
+                event_type=event.event_type,
+                payment_reference=event.payment_reference,
+                transaction_id=event.transaction_id,
+                succeeded=event.succeeded,
+                amount=event.amount,
+                payload=event.payload,
+            )
+    except IntegrityError:
+        # Aynı anda gelen tekrar, cache süresi dolmuş veya başka worker'ın LocMem'i: olay zaten kayıtlı
+        cache.set(key, 1, DEDUP_TIMEOUT)
+        return None
+
+    transaction.on_commit(lambda: cache.set(key, 1, DEDUP_TIMEOUT))
+    enqueue(record.pk)
+    return record
+
+
+def enqueue(event_pk):
+    """Olayı commit sonrası arka planda işle (PAYMENT_WEBHOOK_INLINE ile hemen)"""
+    if settings.PAYMENT_WEBHOOK_INLINE:
+        process_event(event_pk)
+    else:
+        transaction.on_commit(lambda: _executor.submit(_process_in_worker, event_pk))
+
+
+def _process_in_worker(event_pk):
+    try:
+        process_event(event_pk)
+    except Exception:
+        logger.exception(f'Payment webhook event {event_pk} could not be processed')
+    finally:
+        # Thread'in açtığı bağlantılar havuza dönmez
+        connections.close_all()
+
+
+def process_event(event_pk):
+    """Olayı işle; başka işlem tarafından işleniyor veya bitmişse None döner"""
+    with transaction.atomic():
+        event = (
+            PaymentWebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(pk=event_pk, status__in=('received', 'failed'))
+            .first()
+        )
+        if event is None:
+            return None
+
+        event.attempts += 1
+        try:
+            with transaction.atomic():
+                event.status = apply_event(event)
+            event.error_message = ''
+        except WebhookError as e:
+            event.status = 'failed'
+            event.error_message = str(e)
+        except Exception as e:
+            logger.exception(f'Payment webhook event {event_pk} failed')
+            event.status = 'failed'
+            event.error_message = repr(e)
+        event.processed_at = timezone.now()
+        event.save(update_fields=['status', 'payment', 'attempts', 'error_message', 'processed_at'])
+
+    if event.status == 'processed' and event.succeeded:
+        notify_payment_received(event.payment)
+    return event
+
+
+def apply_event(event):
+    """Olayı ödemeye uygula, yeni olay durumunu döndür"""
+    try:
+        payment_id = uuid.UUID(event.payment_reference)
+    except ValueError:
+        raise WebhookError(f'Geçersiz ödeme referansı: {event.payment_reference}')
+
+    payment = (
+        Payment.objects.select_for_update(of=('self',))
+        .select_related('shipment')
+        .filter(payment_id=payment_id)
+        .first()
+    )
+    if payment is None:
+        raise WebhookError(f'Ödeme bulunamadı: {payment_id}')
+    event.payment = payment
+
+    if payment.status != 'pending':
+        # Ödeme zaten alınmış (aynı ödemenin başka bir bildirimi veya odeme_yap)
+        return 'ignored'
+    if not event.succeeded:
+        # Başarısız deneme; ödeme beklemede kalır, yük sahibi tekrar deneyebilir
+        return 'processed'
+    if event.amount is not None and event.amount != payment.amount:
+        raise WebhookError(f'Tutar uyuşmuyor: bildirim {event.amount}, ödeme {payment.amount}')
+
+    mark_payment_paid(payment, event.transaction_id, event.provider)
+    return 'processed'
+
+
+def mark_payment_paid(payment, transaction_id, provider):
+    """Ödemeyi ödendi yap ve emanete alınan tutarı deftere yaz (transaction içinde çağrılır)"""
+    payment.status = 'paid'
+    payment.paid_at = timezone.now()
+    payment.transaction_id = transaction_id
+    payment.payment_provider = provider
+    payment.save()
+
+    # Update shipment status
+    payment.shipment.status = 'assigned'
+    payment.shipment.save()
+
+    ledger.record_payment_received(payment)
+
+
+def notify_payment_received(payment):
+    """Taşıyıcıya ödeme alındı e-postası"""
+    payment = Payment.objects.select_related('shipment', 'shipper__user', 'carrier__user').get(pk=payment.pk)
+    carrier_email = payment.carrier.user.email
+    if not carrier_email:
+        return None
+
+    subject = f'Ödeme Alındı! - {payment.shipment.tracking_number}'
+    email_message = f'''
+Merhaba {payment.carrier.user.get_full_name() or payment.carrier.user.username},
+
+{payment.shipper.user.get_full_name()} tarafından ödeme yapıldı!
+
+Ödeme Detayları:
+- Takip No: {payment.shipment.tracking_number}
+- Tutar: {payment.amount} TL
+- Ödeme Durumu: Ödendi (Escrow'da tutuluyor)
+
+Artık yükü teslim alabilirsiniz. Her iki taraf teslim onayı verdikten sonra para hesabınıza transfer edilecektir.
+
+Saygılarımızla,
+NAKLIYE NET Ekibi
+    '''
+    return send_mail_in_background(subject, email_message, [carrier_email])
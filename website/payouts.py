@@ -0,0 +1,222 @@
+"""
+Taşıyıcı ödeme partileri ve banka transfer dosyası
+
+Uygun ödemeler (teslim edildi, iki taraf da onayladı, henüz transfer
+edilmedi) tek bir kilitli sorguyla seçilir, taşıyıcı IBAN'ına göre
+gruplanır ve tek transaction içinde:
+- PayoutBatch kaydı ve banka dosyası (CSV veya pain.001 benzeri XML) üretilir
+- tüm ödemeler tek UPDATE ile 'completed' + admin_transferred yapılır
+- AdminActivity kayıtları bulk_create ile yazılır
+- taşıyıcı borçları deftere tek yevmiye kaydıyla kapatılır (ledger.record_payout)
+
+Satır başına save() olmadığı için binlerce ödemelik haftalık parti saniyeler
+sürer. Eşzamanlı iki parti aynı ödemeyi alamaz: ikinci işlem kilit bekler ve
+transfer edilmiş satırları artık uygun bulmaz.
+"""
+import csv
+import io
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import ledger
+from .models import AdminActivity, Payment, PayoutBatch
+
+ELIGIBLE = Q(
+    status='delivered',
+    shipper_confirmed_delivery=True,
+    carrier_confirmed_delivery=True,
+    admin_transferred=False,
+)
+
+PAIN_001_NAMESPACE = 'urn:iso:std:iso:20022:tech:xsd:pain.001.001.03'
+
+
+class PayoutResult:
+    """Parti oluşturma sonucu"""
+
+    def __init__(self, batch=None, skipped_no_iban=None):
+        self.batch = batch
+        # IBAN'ı olmayan taşıyıcıların e-postaları (ödemeleri beklemede kalır)
+        self.skipped_no_iban = skipped_no_iban or []
+
+
+def eligible_payments(queryset=None):
+    """Transfer edilebilir ödemeler (Payment.can_transfer_to_carrier ile aynı koşul)"""
+    queryset = Payment.objects.all() if queryset is None else queryset
+    return queryset.filter(ELIGIBLE)
+
+
+def normalize_iban(iban):
+    return ''.join((iban or '').split()).upper()
+
+
+def create_payout_batch(user, queryset=None, file_format='csv', ip_address=None):
+    """
+    Uygun ödemeler için parti oluştur ve transfer edildi olarak işaretle.
+    queryset verilirse sadece içindeki uygun ödemeler alınır.
+    Uygun ödeme yoksa batch None döner.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Sadece Payment satırları kilitlenir; profil/kullanıcı join'leri değil
+        rows = list(
+            eligible_payments(queryset)
+            .select_for_update(of=('self',))
+            .order_by('carrier_id', 'created_at')
+            .values(
+                'payment_id', 'carrier_id', 'carrier_amount', 'carrier__iban', 'carrier__company_name',
+                'carrier__user__first_name', 'carrier__user__last_name', 'carrier__user__email',
+                'shipment__tracking_number',
+            )
+        )
+
+        transfers = OrderedDict()
+        carrier_amounts = {}
+        skipped = set()
+        for row in rows:
+            iban = normalize_iban(row['carrier__iban'])
+            if not iban:
+                skipped.add(row['carrier__user__email'])
+                continue
+            transfer = transfers.setdefault(iban, {
+                'iban': iban,
+                'name': carrier_name(row),
+                'email': row['carrier__user__email'],
+                'amount': Decimal('0'),
+                'references': [],
+                'payment_ids': [],
+            })
+            transfer['amount'] += row['carrier_amount']
+            transfer['references'].append(row['shipment__tracking_number'])
+            transfer['payment_ids'].append(row['payment_id'])
+            carrier_amounts[row['carrier_id']] = carrier_amounts.get(row['carrier_id'], Decimal('0')) + row['carrier_amount']
+
+        if not transfers:
+            return PayoutResult(skipped_no_iban=sorted(skipped))
+
+        payment_ids = [pid for transfer in transfers.values() for pid in transfer['payment_ids']]
+        total = sum((transfer['amount'] for transfer in transfers.values()), Decimal('0'))
+
+        batch = PayoutBatch.objects.create(
+            reference=f'PO-{now:%Y%m%d%H%M%S%f}',
+            created_by=user,
+            created_at=now,
+            payment_count=len(payment_ids),
+            transfer_count=len(transfers),
+            total_amount=total,
+            file_format=file_format,
+        )
+        batch.reference = f'PO-{now:%Y%m%d}-{batch.pk:05d}'
+        batch.file_name = f'{batch.reference}.{file_format}'
+        if file_format == 'xml':
+            batch.file_content = render_pain001(batch, list(transfers.values()))
+        else:
+            batch.file_content = render_csv(list(transfers.values()))
+        batch.save(update_fields=['reference', 'file_name', 'file_content'])
+
+        Payment.objects.filter(payment_id__in=payment_ids).update(
+            status='completed',
+            admin_transferred=True,
+            admin_transferred_by=user,
+            admin_transferred_at=now,
+            completed_at=now,
+            payout_batch=batch,
+        )
+
+        ledger.record_payout(batch, carrier_amounts)
+
+        amounts = {row['payment_id']: row for row in rows}
+        AdminActivity.objects.bulk_create([
+            AdminActivity(
+                admin_user=user,
+                action_type='payment_transferred',
+                target_type='payment',
+                target_id=str(payment_id),
+                description=(
+                    f"Ödeme taşıyıcıya transfer edildi - {amounts[payment_id]['carrier_amount']} ₺ - "
+                    f"{amounts[payment_id]['carrier__user__email']} ({batch.reference})"
+                ),
+                timestamp=now,
+                ip_address=ip_address,
+            )
+            for payment_id in payment_ids
+        ], batch_size=500)
+
+    return PayoutResult(batch=batch, skipped_no_iban=sorted(skipped))
+
+
+def carrier_name(row):
+    full_name = f"{row['carrier__user__first_name']} {row['carrier__user__last_name']}".strip()
+    return row['carrier__company_name'] or full_name or row['carrier__user__email']
+
+
+def remittance_info(references):
+    """Banka açıklama alanı 140 karakterle sınırlı"""
+    text = 'NAKLIYE NET ' + ' '.join(references)
+    return text if len(text) <= 140 else text[:137] + '...'
+
+
+def render_csv(transfers):
+    """Bankanın toplu EFT yükleme ekranı için IBAN başına bir satır"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['sira', 'alici_adi', 'iban', 'tutar', 'para_birimi', 'aciklama', 'odeme_sayisi'])
+    for index, transfer in enumerate(transfers, start=1):
+        writer.writerow([
+            index,
+            transfer['name'],
+            transfer['iban'],
+            f"{transfer['amount']:.2f}",
+            'TRY',
+            remittance_info(transfer['references']),
+            len(transfer['payment_ids']),
+        ])
+    return buffer.getvalue()
+
+
+def render_pain001(batch, transfers):
+    """ISO 20022 pain.001.001.03 (CustomerCreditTransferInitiation) benzeri XML"""
+    ET.register_namespace('', PAIN_001_NAMESPACE)
+
+    def sub(parent, tag, text=None, **attrs):
+        element = ET.SubElement(parent, f'{{{PAIN_001_NAMESPACE}}}{tag}', attrs)
+        if text is not None:
+            element.text = str(text)
+        return element
+
+    control_sum = f'{batch.total_amount:.2f}'
+    document = ET.Element(f'{{{PAIN_001_NAMESPACE}}}Document')
+    initiation = sub(document, 'CstmrCdtTrfInitn')
+
+    header = sub(initiation, 'GrpHdr')
+    sub(header, 'MsgId', batch.reference)
+    sub(header, 'CreDtTm', batch.created_at.replace(microsecond=0).isoformat())
+    sub(header, 'NbOfTxs', len(transfers))
+    sub(header, 'CtrlSum', control_sum)
+    sub(sub(header, 'InitgPty'), 'Nm', settings.PAYOUT_DEBTOR_NAME)
+
+    payment_info = sub(initiation, 'PmtInf')
+    sub(payment_info, 'PmtInfId', batch.reference)
+    sub(payment_info, 'PmtMtd', 'TRF')
+    sub(payment_info, 'NbOfTxs', len(transfers))
+    sub(payment_info, 'CtrlSum', control_sum)
+    sub(payment_info, 'ReqdExctnDt', timezone.localdate(batch.created_at).isoformat())
+    sub(sub(payment_info, 'Dbtr'), 'Nm', settings.PAYOUT_DEBTOR_NAME)
+    sub(sub(sub(payment_info, 'DbtrAcct'), 'Id'), 'IBAN', normalize_iban(settings.PAYOUT_DEBTOR_IBAN))
+
+    for index, transfer in enumerate(transfers, start=1):
+        transaction_info = sub(payment_info, 'CdtTrfTxInf')
+        sub(sub(transaction_info, 'PmtId'), 'EndToEndId', f'{batch.reference}-{index}')
+        sub(sub(transaction_info, 'Amt'), 'InstdAmt', f"{transfer['amount']:.2f}", Ccy='TRY')
+        sub(sub(transaction_info, 'Cdtr'), 'Nm', transfer['name'][:70])
+        sub(sub(sub(transaction_info, 'CdtrAcct'), 'Id'), 'IBAN', transfer['iban'])
+        sub(sub(transaction_info, 'RmtInf'), 'Ustrd', remittance_info(transfer['references']))
+
+    return ET.tostring(document, encoding='unicode', xml_declaration=True)
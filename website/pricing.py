@@ -0,0 +1,233 @@
+"""
+Güzergah fiyat endeksi ve anlık fiyat önerisi
+
+Kabul edilmiş tekliflerin fiyatı (ilanın kesinleşen fiyatı, yoksa teklif
+fiyatı) RoutePriceIndex'e (çıkış şehri, varış şehri, yük tipi, ağırlık
+aralığı) başına işlenir. Satırlar fiyatın logaritmasının ağırlıklı toplam
+ve kareler toplamını tutar; ağırlıklar PRICE_INDEX_HALF_LIFE_DAYS yarı
+ömürle azalır, böylece eski fiyatlar önerileri yavaşça bırakır.
+
+- Her gözlem üç satıra yazılır: (yük tipi, ağırlık aralığı), (yük tipi,
+  tümü) ve (tümü, tümü). Öneri yeterli gözlemi olan en özel satırdan gelir.
+- refresh() RollupWatermark('route_prices')'tan sonraki kabulleri okur;
+  üst sınır rollups ile aynı (now - ROLLUP_LAG_SECONDS).
+- suggest() tek indeksli sorgu yapar ve sonucu cache'ler; ilan formu her
+  alan değişiminde API'yi çağırır (price_suggestion).
+"""
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import distances, gazetteer, keyset
+from .models import Bid, RollupWatermark, RoutePriceIndex, Shipment
+
+WATERMARK = 'route_prices'
+
+# Ağırlık aralıklarının üst sınırları (kg); sonuncusunu aşanlar son aralıktadır
+WEIGHT_BANDS = [100, 500, 1000, 3000, 5000, 10000, 20000]
+
+# Öneri fiyatları bu tutara yuvarlanır (TL)
+ROUND_TO = 10
+
+CARGO_TYPE_VALUES = frozenset(value for value, _label in Shipment.CARGO_TYPES)
+
+
+def weight_band(weight):
+    """Ağırlığın aralık numarası (1..8); ağırlık yoksa 0 (tümü)"""
+    if weight is None or weight <= 0:
+        return 0
+    for band, limit in enumerate(WEIGHT_BANDS, start=1):
+        if weight <= limit:
+            return band
+    return len(WEIGHT_BANDS) + 1
+
+
+def band_label(band):
+    if band == 0:
+        return 'Tüm ağırlıklar'
+    if band > len(WEIGHT_BANDS):
+        return f'{WEIGHT_BANDS[-1]:,} kg üzeri'.replace(',', '.')
+    lower = WEIGHT_BANDS[band - 2] if band > 1 else 0
+    return f'{lower:,}-{WEIGHT_BANDS[band - 1]:,} kg'.replace(',', '.')
+
+
+def city_key(city):
+    # Serbest yazılmış şehirler ilin standart adına çevrilir ("istanbul" -> "İstanbul")
+    return (gazetteer.province_name(city) or (city or '').strip())[:100]
+
+
+def refresh(now=None):
+    """Watermark'tan sonraki kabul edilmiş teklifleri endekse ekle; işlenen teklif sayısını döndür"""
+    upper = (now or timezone.now()) - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(source=WATERMARK).first()
+        start = watermark.processed_until if watermark else None
+        if start is not None and start >= upper:
+            return 0
+
+        bids = Bid.objects.filter(status='accepted', accepted_at__lte=upper)
+        if start is not None:
+            bids = bids.filter(accepted_at__gt=start)
+        rows = (
+            bids.annotate(price=Coalesce('shipment__final_price', 'offered_price'))
+            .filter(price__gt=0)
+            .values(
+                'accepted_at', 'price', 'shipment__from_address_city',
+                'shipment__to_address_city', 'shipment__cargo_type', 'shipment__weight',
+            )
+        )
+
+        observations = {}
+        count = 0
+        for row in keyset.iterate(rows, ('accepted_at', 'pk'), 2000):
+            from_city = city_key(row['shipment__from_address_city'])
+            to_city = city_key(row['shipment__to_address_city'])
+            if not from_city or not to_city:
+                continue
+            cargo_type = row['shipment__cargo_type'] or ''
+            band = weight_band(row['shipment__weight'])
+            observation = (row['accepted_at'], row['price'])
+            for key in {(from_city, to_city, cargo_type, band), (from_city, to_city, cargo_type, 0),
+                        (from_city, to_city, '', 0)}:
+                observations.setdefault(key, []).append(observation)
+            count += 1
+
+        if observations:
+            _apply(observations)
+        RollupWatermark.objects.update_or_create(source=WATERMARK, defaults={'processed_until': upper})
+
+    return count
+
+
+def rebuild(now=None):
+    """Endeksi sil ve tüm geçmişten yeniden hesapla"""
+    with transaction.atomic():
+        RollupWatermark.objects.select_for_update().filter(source=WATERMARK).delete()
+        RoutePriceIndex.objects.all().delete()
+    return refresh(now)
+
+
+def _apply(observations):
+    """Gözlemleri (zaman sırasıyla) mevcut satırlara işle (tek SELECT + bulk yazma)"""
+    routes = {(key[0], key[1]) for key in observations}
+    existing = {
+        (row.from_city, row.to_city, row.cargo_type, row.weight_band): row
+        for row in RoutePriceIndex.objects.filter(
+            from_city__in={route[0] for route in routes},
+            to_city__in={route[1] for route in routes},
+        )
+    }
+
+    to_update, to_create = [], []
+    for key, items in observations.items():
+        index = existing.get(key)
+        if index is None:
+            from_city, to_city, cargo_type, band = key
+            index = RoutePriceIndex(
+                from_city=from_city, to_city=to_city, cargo_type=cargo_type, weight_band=band,
+                decayed_at=items[0][0],
+            )
+            to_create.append(index)
+        else:
+            to_update.append(index)
+        for observed_at, price in items:
+            _observe(index, observed_at, price)
+
+    RoutePriceIndex.objects.bulk_create(to_create, batch_size=500)
+    RoutePriceIndex.objects.bulk_update(
+        to_update,
+        ['sample_count', 'weight', 'sum_log_price', 'sum_log_price_sq', 'min_price', 'max_price', 'decayed_at'],
+        batch_size=500,
+    )
+
+
+def _decay(index, at):
+    """decayed_at'ten `at` anına kadar geçen süre için azalma çarpanı"""
+    days = max((at - index.decayed_at).total_seconds(), 0) / 86400
+    return 0.5 ** (days / settings.PRICE_INDEX_HALF_LIFE_DAYS)
+
+
+def _observe(index, observed_at, price):
+    factor = _decay(index, observed_at)
+    log_price = math.log(float(price))
+    index.weight = index.weight * factor + 1
+    index.sum_log_price = index.sum_log_price * factor + log_price
+    index.sum_log_price_sq = index.sum_log_price_sq * factor + log_price * log_price
+    index.sample_count += 1
+    index.min_price = price if index.min_price is None else min(index.min_price, price)
+    index.max_price = price if index.max_price is None else max(index.max_price, price)
+    index.decayed_at = max(index.decayed_at, observed_at)
+
+
+def _round_price(value):
+    return Decimal(max(int(round(value / ROUND_TO)) * ROUND_TO, ROUND_TO))
+
+
+def suggestion_cache_key(from_city, to_city, cargo_type, band):
+    # Şehir adları Türkçe karakter ve boşluk içerebilir; memcached anahtarlarına uygun hale getir
+    route = f'{from_city}|{to_city}|{cargo_type}|{band}'.encode('utf-8').hex()
+    return f'price-suggestion:{route}'
+
+
+def suggest(from_city, to_city, cargo_type='', weight=None):
+    """
+    Güzergah için fiyat önerisi. Yeterli gözlem yoksa None döner.
+    low/high log-normal dağılımın ±1 standart sapma aralığıdır (~%68).
+    """
+    # Tanınmayan il/yük tipi için endeks satırı yoktur; sorgu ve cache kaydı yapılmaz
+    from_city, to_city = gazetteer.province_name(from_city), gazetteer.province_name(to_city)
+    cargo_type = cargo_type or ''
+    if not from_city or not to_city or (cargo_type and cargo_type not in CARGO_TYPE_VALUES):
+        return None
+    if weight is not None and not math.isfinite(weight):
+        weight = None
+    band = weight_band(weight)
+
+    key = suggestion_cache_key(from_city, to_city, cargo_type, band)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached.get('suggestion')
+
+    rows = {
+        (row.cargo_type, row.weight_band): row
+        for row in RoutePriceIndex.objects.filter(
+            from_city=from_city, to_city=to_city,
+            cargo_type__in={cargo_type, ''}, weight_band__in={band, 0},
+        )
+    }
+
+    suggestion = None
+    now = timezone.now()
+    km = distances.distance_km(from_city, to_city)
+    for level, level_key in (('exact', (cargo_type, band)), ('cargo_type', (cargo_type, 0)), ('route', ('', 0))):
+        index = rows.get(level_key)
+        if index is None or index.sample_count < settings.PRICE_INDEX_MIN_SAMPLES:
+            continue
+        mean = index.sum_log_price / index.weight
+        deviation = math.sqrt(max(index.sum_log_price_sq / index.weight - mean * mean, 0))
+        suggestion = {
+            'suggested_price': _round_price(math.exp(mean)),
+            'low': _round_price(math.exp(mean - deviation)),
+            'high': _round_price(math.exp(mean + deviation)),
+            'min_price': index.min_price,
+            'max_price': index.max_price,
+            'sample_count': index.sample_count,
+            # Güncel ağırlık: eski gözlemler ne kadar azaldıysa o kadar düşük güven
+            'effective_samples': round(index.weight * _decay(index, now), 1),
+            'level': level,
+            'weight_band': band_label(index.weight_band),
+            'last_observed_at': index.decayed_at,
+            'distance_km': km,
+            'price_per_km': distances.price_per_km(math.exp(mean), km),
+        }
+        break
+
+    cache.set(key, {'suggestion': suggestion}, settings.PRICE_SUGGESTION_CACHE_SECONDS)
+    return suggestion
@@ -0,0 +1,112 @@
+"""
+Kimlik belgeleri ve teslimat kanıtları için özel dosya alanı
+
+Ehliyet, ruhsat, SRC, psikoteknik raporu ve teslimat kanıtları /media/
+altına (nginx'in kontrolsüz sunduğu dizin) yazılmaz. Dosyalar
+PRIVATE_MEDIA_ROOT altında tahmin edilemeyen adlarla tutulur, veritabanında
+'private:<ad>' olarak saklanır ve sadece yetki kontrolü yapan görünümlerden
+(media_views) okunur.
+
+- UserDocument: belgenin sahibi (user_email) ve staff
+- DeliveryProof: ilanın yük sahibi, atanan taşıyıcı, kanıtı yükleyen ve staff
+- Bağlantılar (model, pk, kaynak) imzalıdır; kaynak değişince eski bağlantı
+  geçersizleşir. İmza tek başına erişim vermez, kullanıcı yine kontrol edilir.
+"""
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+
+from .models import Bid, DeliveryProof, UserDocument
+
+PREFIX = 'private:'
+
+SIGNING_SALT = 'website.private_media'
+
+# Bağlantıdaki tür adı -> (model, kaynak alanı)
+SOURCES = {
+    'document': (UserDocument, 'document_url'),
+    'proof': (DeliveryProof, 'file_url'),
+}
+
+# URL'i olmayan storage: dosyalar sadece görünümler üzerinden okunur
+private_storage = FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT, base_url=None)
+
+
+def is_private(source):
+    return bool(source) and source.startswith(PREFIX)
+
+
+def storage_name(source):
+    return source[len(PREFIX):]
+
+
+def save(folder, data, extension):
+    """Baytları rastgele adla kaydet; veritabanına yazılacak kaynak değerini döndür"""
+    name = private_storage.save(f'{folder}/{uuid.uuid4().hex}{extension}', ContentFile(data))
+    return PREFIX + name
+
+
+def _kind(obj):
+    for kind, (model, field) in SOURCES.items():
+        if isinstance(obj, model):
+            return kind, field
+    raise TypeError(f'Desteklenmeyen kaynak: {type(obj).__name__}')
+
+
+def source_of(obj):
+    return getattr(obj, _kind(obj)[1])
+
+
+def sign(obj):
+    kind, field = _kind(obj)
+    return signing.Signer(salt=SIGNING_SALT).sign_object([kind, obj.pk, getattr(obj, field)], compress=True)
+
+
+def resolve(token):
+    """
+    İmzalı bağlantı -> (nesne, kaynak). İmza geçersizse signing.BadSignature;
+    nesne silinmiş veya kaynağı değişmişse LookupError.
+    """
+    kind, pk, source = signing.Signer(salt=SIGNING_SALT).unsign_object(token)
+    if kind not in SOURCES:
+        raise LookupError(kind)
+    model, field = SOURCES[kind]
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None or getattr(obj, field) != source:
+        raise LookupError(pk)
+    return obj, source
+
+
+def can_view_shipment_media(user, shipment):
+    """İlanın yük sahibi, atanan taşıyıcısı veya staff"""
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    if shipment.shipper.user_id == user.pk:
+        return True
+    return Bid.objects.filter(shipment=shipment, status='accepted', carrier__user_id=user.pk).exists()
+
+
+def can_view(user, obj):
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    if isinstance(obj, UserDocument):
+        return bool(user.email) and obj.user_email.lower() == user.email.lower()
+    if obj.uploaded_by.user_id == user.pk:
+        return True
+    return can_view_shipment_media(user, obj.shipment)
+
+
+def file_url(obj):
+    """Orijinal dosyanın bağlantısı; özel dosyalar için yetki kontrollü görünüm"""
+    source = source_of(obj)
+    if not is_private(source):
+        return source
+    return reverse('website:private_media', args=[sign(obj)])
@@ -0,0 +1,131 @@
+"""
+Responsive görsel varyantları (statik dosyalar ve blog görselleri)
+
+Kaynak görsel genişlik kovalarına (WIDTHS) küçültülür ve her genişlik için
+AVIF (Pillow destekliyorsa) ve WebP varyantı üretilir. Varyantların listesi
+bir manifest kaydında tutulur; {% responsive_image %} etiketi bu kayıttan
+<picture> + srcset/sizes üretir.
+
+- Statik görseller: `build_responsive_images` komutu static/images altındaki
+  PNG/JPEG dosyaları için images/responsive/ altına varyantları ve
+  manifest.json'ı yazar. Dosya adlarına içerik hash'ini collectstatic
+  sırasında CompressedManifestStaticFilesStorage ekler.
+- Yüklenen görseller (BlogPost.featured_image): varyantlar default_storage'a
+  kaynağın içerik hash'i ile adlandırılarak yazılır, kayıt modelde saklanır.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from io import BytesIO
+
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+# Üretilen genişlikler (px); kaynaktan büyük olanlar atlanır
+WIDTHS = (320, 640, 960, 1280, 1920)
+
+STATIC_SOURCE_DIR = 'images'
+STATIC_OUTPUT_DIR = 'images/responsive'
+STATIC_MANIFEST = f'{STATIC_OUTPUT_DIR}/manifest.json'
+
+QUALITY = {'avif': 55, 'webp': 78}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+@lru_cache(maxsize=1)
+def available_formats():
+    """
+    Üretilebilen formatlar, tarayıcı tercih sırasıyla (AVIF önce)
+    AVIF için libavif ile derlenmiş Pillow veya pillow-avif-plugin gerekir.
+    """
+    Image.init()
+    if 'AVIF' not in Image.SAVE:
+        try:
+            import pillow_avif  # noqa: F401  (AVIF kaydedicisini kaydeder)
+        except ImportError:
+            pass
+
+    formats = []
+    if 'AVIF' in Image.SAVE:
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    return formats
+
+
+def render_variants(data, widths=WIDTHS):
+    """
+    Kaynak baytlarından varyantları üret
+    Döndürür: (genişlik, yükseklik, [(format, genişlik, bayt), ...])
+    """
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    width, height = image.size
+
+    targets = [w for w in widths if w < width] + [min(width, max(widths))]
+    variants = []
+    for target in sorted(set(targets)):
+        resized = image if target == width else image.resize(
+            (target, round(height * target / width)), Image.LANCZOS
+        )
+        for fmt in available_formats():
+            output = BytesIO()
+            resized.save(output, fmt.upper(), quality=QUALITY[fmt])
+            variants.append((fmt, target, output.getvalue()))
+    return width, height, variants
+
+
+def build_entry(width, height, fallback, saved):
+    """Manifest kaydı: boyutlar, fallback ve format -> [[ad, genişlik], ...]"""
+    entry = {'width': width, 'height': height, 'fallback': fallback, 'variants': {}}
+    for fmt, variant_width, name in saved:
+        entry['variants'].setdefault(fmt, []).append([name, variant_width])
+    return entry
+
+
+def process_upload(field_file):
+    """
+    Yüklenen görsel için varyantları default_storage'a yaz, manifest kaydını döndür
+    Adlar kaynağın içerik hash'ini içerir; aynı görsel tekrar işlenmez.
+    """
+    field_file.open('rb')
+    try:
+        data = field_file.read()
+    finally:
+        field_file.close()
+
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    directory, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+
+    width, height, variants = render_variants(data)
+    saved = []
+    for fmt, variant_width, content in variants:
+        name = f'{directory}/responsive/{stem}-{digest}-{variant_width}w.{fmt}'
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(content))
+        saved.append((fmt, variant_width, name))
+    return build_entry(width, height, field_file.name, saved)
+
+
+@lru_cache(maxsize=1)
+def static_manifest():
+    """build_responsive_images tarafından yazılan manifest (yoksa boş)"""
+    try:
+        if staticfiles_storage.exists(STATIC_MANIFEST):
+            with staticfiles_storage.open(STATIC_MANIFEST) as handle:
+                return json.load(handle)
+    except Exception:
+        # STATIC_ROOT yok (collectstatic çalışmamış)
+        pass
+
+    path = finders.find(STATIC_MANIFEST)
+    if path:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    return {}
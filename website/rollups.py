@@ -0,0 +1,218 @@
+"""
+Saatlik ve günlük özet (rollup) tabloları
+
+Dashboard'daki zaman serileri ham tablolar yerine MetricRollup'tan okunur.
+Her kaynak (ilan, teklif, kabul, ödeme, komisyon) kendi zaman alanına göre
+RollupWatermark'tan sonraki satırları saat + şehir çifti + yük tipi başına
+gruplayıp toplar; sonuç hem saatlik hem günlük satırlara eklenir. Böylece
+her çalıştırma sadece yeni satırları okur (refresh_rollups komutu, cron).
+
+- Üst sınır now - ROLLUP_LAG_SECONDS: commit'i gecikmiş transaction'ların
+  satırları bir sonraki çalıştırmaya kalır, atlanmaz.
+- İlk çalıştırma geçmişi ROLLUP_WINDOW_DAYS'lik pencerelerle işler; her
+  pencere ayrı transaction'dır, yarıda kalırsa kaldığı yerden devam eder.
+- Watermark satırları her pencerede kilitlenir; eşzamanlı iki çalıştırma
+  aynı satırları iki kez saymaz.
+- Ödeme ve komisyon defterden (JournalEntry) okunur: payment_received
+  tutarı GMV, delivery_confirmed kaydındaki komisyon platform geliridir.
+"""
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import Bid, JournalEntry, MetricRollup, RollupWatermark, Shipment
+
+METRICS = ('shipments', 'bids', 'accepted_bids', 'payments', 'gmv', 'platform_fees')
+
+Source = namedtuple('Source', 'name queryset time_field shipment_path metrics')
+
+SOURCES = [
+    Source('shipments', lambda: Shipment.objects.all(), 'created_at', '', {'shipments': Count('pk')}),
+    Source('bids', lambda: Bid.objects.all(), 'created_at', 'shipment__', {'bids': Count('pk')}),
+    Source('acceptances', lambda: Bid.objects.all(), 'accepted_at', 'shipment__', {'accepted_bids': Count('pk')}),
+    Source(
+        'payments', lambda: JournalEntry.objects.filter(entry_type='payment_received'),
+        'posted_at', 'payment__shipment__', {'payments': Count('pk'), 'gmv': Sum('amount')},
+    ),
+    Source(
+        'platform_fees', lambda: JournalEntry.objects.filter(entry_type='delivery_confirmed'),
+        'posted_at', 'payment__shipment__', {'platform_fees': Sum('payment__platform_fee')},
+    ),
+]
+
+
+def refresh(now=None):
+    """Tüm kaynakları watermark'tan itibaren işle; kaynak başına işlenen satır sayısını döndür"""
+    upper = (now or timezone.now()) - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+    window = timedelta(days=settings.ROLLUP_WINDOW_DAYS)
+    processed = {}
+
+    for source in SOURCES:
+        processed[source.name] = 0
+        while True:
+            with transaction.atomic():
+                watermark = _lock_watermarks().get(source.name)
+                start = watermark.processed_until if watermark else _first_row_time(source)
+                if start is None or start >= upper:
+                    break
+                end = min(start + window, upper)
+                processed[source.name] += _process(source, start, end)
+                RollupWatermark.objects.update_or_create(source=source.name, defaults={'processed_until': end})
+            if end >= upper:
+                break
+
+    return processed
+
+
+def rebuild(now=None):
+    """
+    Özetleri sil ve baştan hesapla
+
+    Watermark'ın gerisine yazılan satırlardan sonra gerekir (ör.
+    rebuild_ledger geçmiş tarihli yevmiye kayıtları yazar; refresh onları
+    görmez).
+    """
+    with transaction.atomic():
+        _lock_watermarks()
+        MetricRollup.objects.all().delete()
+        _watermarks().delete()
+    return refresh(now)
+
+
+def _watermarks():
+    # RollupWatermark'ı pricing ve route_stats de kullanır; sadece bu modülün kaynakları
+    return RollupWatermark.objects.filter(source__in=[source.name for source in SOURCES])
+
+
+def _lock_watermarks():
+    return {
+        watermark.source: watermark
+        for watermark in _watermarks().select_for_update().order_by('source')
+    }
+
+
+def _first_row_time(source):
+    first = source.queryset().aggregate(first=Min(source.time_field))['first']
+    # Aralık (start, end] olduğu için ilk satır dahil edilsin
+    return first - timedelta(microseconds=1) if first else None
+
+
+def _process(source, start, end):
+    """(start, end] aralığındaki satırları saatlik ve günlük özetlere ekle"""
+    path = source.shipment_path
+    rows = (
+        source.queryset()
+        .filter(**{f'{source.time_field}__gt': start, f'{source.time_field}__lte': end})
+        .annotate(hour=TruncHour(source.time_field, tzinfo=timezone.get_current_timezone()))
+        .values('hour', f'{path}from_address_city', f'{path}to_address_city', f'{path}cargo_type')
+        .annotate(rows=Count('pk'), **source.metrics)
+        .order_by()
+    )
+
+    deltas = {}
+    count = 0
+    for row in rows:
+        hour = row['hour']
+        dimensions = (
+            (row[f'{path}from_address_city'] or '').strip()[:100],
+            (row[f'{path}to_address_city'] or '').strip()[:100],
+            row[f'{path}cargo_type'] or '',
+        )
+        day = timezone.localtime(hour).replace(hour=0, minute=0, second=0, microsecond=0)
+        for key in (('hour', hour) + dimensions, ('day', day) + dimensions):
+            delta = deltas.setdefault(key, {})
+            for metric in source.metrics:
+                delta[metric] = delta.get(metric, 0) + (row[metric] or 0)
+        count += row['rows']
+
+    if deltas:
+        _apply(deltas, list(source.metrics))
+    return count
+
+
+def _apply(deltas, metrics):
+    """Delta'ları mevcut satırlara ekle, olmayanları oluştur (tek SELECT + bulk yazma)"""
+    buckets = {key[1] for key in deltas}
+    existing = {
+        (rollup.granularity, rollup.bucket, rollup.from_city, rollup.to_city, rollup.cargo_type): rollup
+        for rollup in MetricRollup.objects.filter(bucket__in=buckets)
+    }
+
+    to_update, to_create = [], []
+    for key, delta in deltas.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            granularity, bucket, from_city, to_city, cargo_type = key
+            rollup = MetricRollup(
+                granularity=granularity, bucket=bucket,
+                from_city=from_city, to_city=to_city, cargo_type=cargo_type,
+            )
+            to_create.append(rollup)
+        else:
+            to_update.append(rollup)
+        for metric, value in delta.items():
+            setattr(rollup, metric, getattr(rollup, metric) + value)
+
+    MetricRollup.objects.bulk_create(to_create, batch_size=500)
+    # Sadece bu kaynağın kolonları yazılır
+    MetricRollup.objects.bulk_update(to_update, metrics, batch_size=500)
+
+
+def daily_series(days=90, today=None):
+    """
+    Son `days` günün günlük toplamları (şehir/yük tipi üzerinden toplanmış).
+    Verisi olmayan günler sıfırla doldurulur.
+    """
+    today = today or timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+
+    totals = {
+        timezone.localdate(row['bucket']): row
+        for row in MetricRollup.objects.filter(granularity='day', bucket__gte=start)
+        .values('bucket')
+        .annotate(**{metric: Sum(metric) for metric in METRICS})
+        .order_by('bucket')
+    }
+
+    series = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        row = totals.get(day, {})
+        series.append(dict(
+            {metric: row.get(metric) or (Decimal('0') if metric in ('gmv', 'platform_fees') else 0) for metric in METRICS},
+            date=day,
+        ))
+    return series
+
+
+def top_routes(days=90, limit=10, today=None):
+    """Son `days` günde en çok ilan açılan şehir çiftleri"""
+    today = today or timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today - timedelta(days=days - 1), time.min))
+    return list(
+        MetricRollup.objects.filter(granularity='day', bucket__gte=start)
+        .exclude(from_city='')
+        .exclude(to_city='')
+        .values('from_city', 'to_city')
+        .annotate(shipments=Sum('shipments'), accepted_bids=Sum('accepted_bids'), payments=Sum('payments'), gmv=Sum('gmv'))
+        .order_by('-shipments')[:limit]
+    )
+
+
+def last_refreshed():
+    """Tüm kaynakların işlendiği en eski zaman (özetler bu ana kadar günceldir)"""
+    return _watermarks().aggregate(until=Min('processed_until'))['until']
+
+
+def is_stale(refreshed_at, now=None):
+    """Özetler hiç hesaplanmamış veya ROLLUP_STALE_SECONDS'tan eski mi (cron çalışmıyor)"""
+    if refreshed_at is None:
+        return True
+    return refreshed_at < (now or timezone.now()) - timedelta(seconds=settings.ROLLUP_STALE_SECONDS)
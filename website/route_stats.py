@@ -0,0 +1,286 @@
+"""
+Güzergah sayfaları (/nakliye/<il>-<il>/) için özet istatistikler
+
+İl çifti başına aktif ilan, medyan fiyat, ilan başına teklif ve tipik
+teslim süresi RouteStats'ta tutulur. Sayfalar sadece bu tablodan ve
+cache'ten okunur; arama motoru taramaları ilan/teklif tablolarına inmez.
+
+- refresh(): RollupWatermark('route_stats')'tan sonra değişen ilan ve
+  tekliflerin (updated_at) güzergahları bulunur, sadece o güzergahlar
+  yeniden hesaplanır. Üst sınır rollups ile aynı (now - ROLLUP_LAG_SECONDS).
+- Pencere ROUTE_STATS_DAYS gündür. Pencereden düşen ilanlar ve .update()
+  ile yapılan toplu değişiklikler updated_at'i değiştirmediği için
+  rebuild() günde bir çalıştırılır.
+- Sadece şehri il listesindeki yazımla kaydedilmiş ilanlar sayılır (ilan
+  formu, API ve toplu yükleme il adını standart yazıma çevirir).
+- Medyanlar değer sırasıyla okunan satırlardan, güzergah başına sayılarak
+  bulunur; güzergahın tüm fiyatları belleğe alınmaz.
+- Güncellenen güzergahların sayfa içeriği commit'ten sonra oluşturulup
+  cache'e yazılır (ROUTE_PAGE_CACHE_SECONDS); cache'te olmayan sayfa ilk
+  istekte oluşturulur.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import distances, gazetteer, keyset
+from .models import Bid, RollupWatermark, RouteStats, Shipment
+
+WATERMARK = 'route_stats'
+
+# Tek sorguda OR'lanan güzergah sayısı
+ROUTE_BATCH = 100
+
+# Sayfadaki "bu şehirden diğer güzergahlar" listesi
+RELATED_LIMIT = 8
+
+PROVINCE_NAMES = [province.name for province in gazetteer.PROVINCES_BY_PLATE.values()]
+
+
+def route_slug(from_city, to_city):
+    return f'{gazetteer.slugify(from_city)}-{gazetteer.slugify(to_city)}'
+
+
+def page_cache_key(slug):
+    return f'route-page:{slug}'
+
+
+def _is_route(from_city, to_city):
+    return from_city != to_city and from_city in PROVINCE_NAMES and to_city in PROVINCE_NAMES
+
+
+def refresh(now=None):
+    """Değişen güzergahları yeniden hesapla; güncellenen/silinen güzergah sayısını döndür"""
+    now = now or timezone.now()
+    upper = now - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(source=WATERMARK).first()
+        if watermark is None:
+            # İlk çalıştırma: tüm güzergahlar
+            routes = None
+        else:
+            if watermark.processed_until >= upper:
+                return 0
+            routes = _changed_routes(watermark.processed_until, upper)
+
+        changed = _recompute(routes, now)
+        RollupWatermark.objects.update_or_create(source=WATERMARK, defaults={'processed_until': upper})
+
+    prerender(changed)
+    return len(changed)
+
+
+def rebuild(now=None):
+    """Tabloyu sil ve penceredeki tüm ilanlardan yeniden hesapla"""
+    with transaction.atomic():
+        RollupWatermark.objects.select_for_update().filter(source=WATERMARK).delete()
+    return refresh(now)
+
+
+def _changed_routes(start, end):
+    """(start, end] aralığında ilanı veya teklifi değişen güzergahlar"""
+    pairs = set(
+        Shipment.objects.filter(updated_at__gt=start, updated_at__lte=end)
+        .values_list('from_address_city', 'to_address_city')
+        .distinct()
+    )
+    pairs.update(
+        Bid.objects.filter(updated_at__gt=start, updated_at__lte=end)
+        .values_list('shipment__from_address_city', 'shipment__to_address_city')
+        .distinct()
+    )
+    return {pair for pair in pairs if _is_route(*pair)}
+
+
+def _recompute(routes, now):
+    """
+    Güzergahların satırlarını yeniden yaz; routes None ise tüm güzergahlar.
+    Yazılan ve silinen güzergahların (from_city, to_city) listesini döndürür.
+    """
+    if routes is not None and not routes:
+        return []
+    since = now - timedelta(days=settings.ROUTE_STATS_DAYS)
+    shipments = (
+        Shipment.objects.filter(
+            created_at__gte=since,
+            from_address_city__in=PROVINCE_NAMES,
+            to_address_city__in=PROVINCE_NAMES,
+        )
+        .exclude(status='cancelled')
+    )
+
+    stats = {}
+    if routes is None:
+        _collect(shipments, stats)
+        existing = {(row.from_city, row.to_city): row for row in RouteStats.objects.all()}
+    else:
+        routes = sorted(routes)
+        for offset in range(0, len(routes), ROUTE_BATCH):
+            batch = routes[offset:offset + ROUTE_BATCH]
+            condition = Q()
+            for from_city, to_city in batch:
+                condition |= Q(from_address_city=from_city, to_address_city=to_city)
+            _collect(shipments.filter(condition), stats)
+        existing = {
+            (row.from_city, row.to_city): row
+            for row in RouteStats.objects.filter(slug__in=[route_slug(*route) for route in routes])
+        }
+
+    to_update, to_create = [], []
+    for key, values in stats.items():
+        row = existing.pop(key, None)
+        if row is None:
+            row = RouteStats(from_city=key[0], to_city=key[1], slug=route_slug(*key))
+            to_create.append(row)
+        else:
+            to_update.append(row)
+        for field, value in values.items():
+            setattr(row, field, value)
+        row.updated_at = now
+
+    RouteStats.objects.bulk_create(to_create, batch_size=500)
+    RouteStats.objects.bulk_update(
+        to_update,
+        ['active_loads', 'total_loads', 'median_price', 'avg_bids_per_load', 'typical_transit_days',
+         'distance_km', 'last_listing_at', 'updated_at'],
+        batch_size=500,
+    )
+    # Penceredeki ilanı kalmayan güzergahlar
+    if existing:
+        RouteStats.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+
+    return list(stats) + list(existing)
+
+
+def _collect(shipments, stats):
+    """İlan queryset'indeki güzergahların istatistiklerini stats'a ekle"""
+    shipments = shipments.annotate(price=Coalesce('final_price', 'suggested_price'))
+    route = ('from_address_city', 'to_address_city')
+
+    totals = (
+        shipments.values(*route)
+        .annotate(
+            total=Count('pk'),
+            active=Count('pk', filter=Q(status='active')),
+            priced=Count('pk', filter=Q(price__gt=0)),
+            bids=Sum('bid_count'),
+            last=Max('created_at'),
+        )
+        .order_by()
+    )
+    price_counts = {}
+    for row in totals:
+        key = (row['from_address_city'], row['to_address_city'])
+        if not _is_route(*key):
+            continue
+        km = distances.distance_km(*key)
+        stats[key] = {
+            'active_loads': row['active'],
+            'total_loads': row['total'],
+            'median_price': None,
+            'avg_bids_per_load': round((row['bids'] or 0) / row['total'], 2),
+            'typical_transit_days': distances.transit_days(km),
+            'distance_km': km,
+            'last_listing_at': row['last'],
+        }
+        price_counts[key] = row['priced']
+    if not stats:
+        return
+
+    prices = shipments.filter(price__gt=0).values_list(*route, 'price')
+    for key, median in _medians(prices, (*route, 'price', 'pk'), price_counts).items():
+        stats[key]['median_price'] = Decimal(median).quantize(Decimal('0.01'))
+
+    accepted = Bid.objects.filter(status='accepted', shipment__in=shipments, estimated_delivery_days__gt=0)
+    bid_route = ('shipment__from_address_city', 'shipment__to_address_city')
+    day_counts = {
+        (row[bid_route[0]], row[bid_route[1]]): row['count']
+        for row in accepted.values(*bid_route).annotate(count=Count('pk')).order_by()
+    }
+    days = accepted.values_list(*bid_route, 'estimated_delivery_days')
+    for key, median in _medians(days, (*bid_route, 'estimated_delivery_days', 'pk'), day_counts).items():
+        if key in stats:
+            stats[key]['typical_transit_days'] = round(median)
+
+
+def _medians(rows, ordering, counts):
+    """
+    (çıkış, varış, değer) satırları güzergah ve değere göre sıralı (ordering)
+    okunur; güzergah başına medyan, satır sayıları (counts) bilindiği için
+    sayarak bulunur.
+    """
+    medians = {}
+    current, position, low = None, 0, None
+    for from_city, to_city, value in keyset.iterate(rows, ordering, 5000):
+        key = (from_city, to_city)
+        if key != current:
+            current, position = key, 0
+        count = counts.get(key, 0)
+        if position == (count - 1) // 2:
+            low = value
+        if position == count // 2:
+            medians[key] = (low + value) / 2
+        position += 1
+    return medians
+
+
+def prerender(routes):
+    """Güzergahların sayfa içeriğini oluşturup cache'e yaz (satırı silinenlerin de)"""
+    for from_city, to_city in routes:
+        cache.set(
+            page_cache_key(route_slug(from_city, to_city)),
+            build_page(from_city, to_city),
+            settings.ROUTE_PAGE_CACHE_SECONDS,
+        )
+
+
+def page(from_city, to_city):
+    """Sayfa içeriği; cache'te yoksa oluşturulup yazılır"""
+    key = page_cache_key(route_slug(from_city, to_city))
+    content = cache.get(key)
+    if content is None:
+        content = build_page(from_city, to_city)
+        cache.set(key, content, settings.ROUTE_PAGE_CACHE_SECONDS)
+    return content
+
+
+def build_page(from_city, to_city):
+    """
+    {'html', 'active_loads', 'median_price', 'total_loads'}: istatistik
+    kartları ve bağlantılar önceden HTML'e çevrilir. Güzergahta ilan yoksa
+    sadece mesafe ve süre tahmini gösterilir.
+    """
+    slug = route_slug(from_city, to_city)
+    stats = RouteStats.objects.filter(slug=slug).first()
+    related = list(
+        RouteStats.objects.filter(from_city=from_city, total_loads__gt=0)
+        .exclude(slug=slug)
+        .values('to_city', 'slug', 'active_loads', 'median_price')[:RELATED_LIMIT]
+    )
+    eta = distances.eta(from_city, to_city)
+
+    html = render_to_string('website/partials/rota_ozet.html', {
+        'from_city': from_city,
+        'to_city': to_city,
+        'stats': stats,
+        'eta': eta,
+        'price_per_km': distances.price_per_km(stats.median_price, stats.distance_km) if stats else None,
+        'from_slug': gazetteer.slugify(from_city),
+        'to_slug': gazetteer.slugify(to_city),
+        'related': related,
+    })
+    return {
+        'html': html,
+        'active_loads': stats.active_loads if stats else 0,
+        'total_loads': stats.total_loads if stats else 0,
+        'median_price': stats.median_price if stats else None,
+        'distance_km': eta['distance_km'] if eta else None,
+    }
@@ -3,7 +3,10 @@ Django REST Framework Serializers
 API için model serileştirme
 """
 from rest_framework import serializers
+from . import distances, gazetteer
 from .models import Shipment, Bid, UserProfile, Vehicle
+from .tracking_numbers import next_tracking_number
+from .user_cache import get_user_profile
 from django.contrib.auth.models import User
 
 
@@ -82,11 +85,10 @@ class BidCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Authentication required")
 
         # Check if user has profile
-        if not hasattr(request.user, 'profile'):
+        profile = get_user_profile(request)
+        if profile is None:
             raise serializers.ValidationError("User profile not found")
 
-        profile = request.user.profile
-
         # Check if user is a carrier
         if profile.user_type != 1:
             raise serializers.ValidationError("Only carriers can submit bids")
@@ -101,18 +103,28 @@ class BidCreateSerializer(serializers.ModelSerializer):
         if existing_bid:
             raise serializers.ValidationError("You have already submitted a bid for this shipment")
 
+        # Delivery time must be physically possible for the route distance
+        km = distances.distance_km(
+            shipment.from_address_city, shipment.to_address_city,
+            shipment.from_address_district, shipment.to_address_district,
+        )
+        if km is not None and data['estimated_delivery_days'] < distances.minimum_transit_days(km):
+            raise serializers.ValidationError({
+                'estimated_delivery_days': (
+                    f"A {km} km route needs at least {distances.minimum_transit_days(km)} days"
+                )
+            })
+
         return data
 
     def create(self, validated_data):
         """Create bid with user info"""
-        import uuid
         request = self.context.get('request')
-        profile = request.user.profile
+        profile = get_user_profile(request)
         shipment = validated_data['shipment']
 
         # Create bid
         bid = Bid.objects.create(
-            bid_id=str(uuid.uuid4()),
             shipment=shipment,
             tracking_number=shipment.tracking_number,
             carrier=profile,
@@ -178,6 +190,8 @@ class ShipmentListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing shipments"""
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     cargo_type_display = serializers.CharField(source='get_cargo_type_display', read_only=True)
+    distance_km = serializers.IntegerField(read_only=True)
+    transit_days = serializers.SerializerMethodField()
 
     class Meta:
         model = Shipment
@@ -187,12 +201,17 @@ class ShipmentListSerializer(serializers.ModelSerializer):
             'from_address_city', 'from_address_district',
             'to_address_city', 'to_address_district',
             'weight', 'suggested_price',
+            'distance_km', 'transit_days',
             'pickup_date',
             'status', 'status_display',
             'view_count', 'bid_count',
             'created_at'
         ]
 
+    def get_transit_days(self, obj):
+        """Typical transit days for the stored route distance (None for unknown cities)"""
+        return distances.transit_days(obj.distance_km) if obj.distance_km is not None else None
+
 
 class ShipmentCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating shipments"""
@@ -219,33 +238,27 @@ class ShipmentCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Authentication required")
 
         # Check if user has profile
-        if not hasattr(request.user, 'profile'):
+        if get_user_profile(request) is None:
             raise serializers.ValidationError("User profile not found")
 
+        # İl adları standart yazımla kaydedilir ("istanbul" -> "İstanbul"); güzergah
+        # istatistikleri (website.route_stats) sadece bu yazımla eşleşir
+        for field in ('from_address_city', 'to_address_city'):
+            if data.get(field):
+                data[field] = gazetteer.province_name(data[field]) or data[field]
+
         return data
 
     def create(self, validated_data):
         """Create shipment with user info"""
-        import uuid
-        from datetime import datetime
-
         request = self.context.get('request')
-        profile = request.user.profile
+        profile = get_user_profile(request)
 
         # Generate tracking number
-        year = datetime.now().year
-        month = datetime.now().month
-        # Get count of shipments this month
-        month_count = Shipment.objects.filter(
-            created_at__year=year,
-            created_at__month=month
-        ).count() + 1
-
-        tracking_number = f"YN-{year}-{month:02d}{month_count:04d}"
+        tracking_number = next_tracking_number()
 
         # Create shipment
         shipment = Shipment.objects.create(
-            shipment_id=str(uuid.uuid4()),
             tracking_number=tracking_number,
             shipper=profile,
             shipper_uid=str(profile.id),
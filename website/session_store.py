@@ -0,0 +1,73 @@
+"""
+Cache-backed, write-through session engine
+
+Oturumlar cache'ten (Redis) okunur; değişiklikler hem cache'e hem
+django_session tablosuna yazılır, böylece cache boşalsa da oturum kaybolmaz.
+
+SESSION_SAVE_EVERY_REQUEST ile kayan süre (sliding expiry) kullanılırken
+verisi değişmeyen oturumlar her istekte yazılmaz: kalan süre
+SESSION_TOUCH_THRESHOLD'dan fazlaysa kayıt atlanır. Bu durumda sunucudaki
+süre çerezdekinden en fazla SESSION_TOUCH_THRESHOLD kadar önce dolar.
+
+Süresi dolmuş satırlar `purge_sessions` komutuyla temizlenir.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+KEY_PREFIX = 'nakliyenet.sessions'
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cache kaydı {'data': ..., 'expires': epoch} biçimindedir; 'expires'
+    veritabanındaki expire_date'tir ve touch kararında kullanılır
+    """
+
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._stored_expires = None
+
+    def load(self):
+        try:
+            entry = self._cache.get(self.cache_key)
+        except Exception:
+            # Geçersiz cache anahtarı (bkz. Django #17810) - oturumu sıfırla
+            entry = None
+
+        if entry is not None:
+            self._stored_expires = entry['expires']
+            return entry['data']
+
+        s = self._get_session_from_db()
+        if not s:
+            return {}
+        data = self.decode(s.session_data)
+        self._stored_expires = s.expire_date.timestamp()
+        self._cache_entry(data, self.get_expiry_age(expiry=s.expire_date))
+        return data
+
+    def save(self, must_create=False):
+        if not must_create and self._is_fresh_touch():
+            return
+        DBStore.save(self, must_create)
+        expiry_age = self.get_expiry_age()
+        self._stored_expires = time.time() + expiry_age
+        self._cache_entry(self._session, expiry_age)
+
+    def _is_fresh_touch(self):
+        """Veri değişmedi ve kalan süre eşikten fazla mı?"""
+        if self.modified or self.session_key is None or self._stored_expires is None:
+            return False
+        return self._stored_expires - time.time() > settings.SESSION_TOUCH_THRESHOLD
+
+    def _cache_entry(self, data, timeout):
+        self._cache.set(
+            self.cache_key,
+            {'data': data, 'expires': self._stored_expires},
+            timeout,
+        )
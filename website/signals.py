@@ -1,11 +1,12 @@
 """
 Signals for automatic UserProfile creation when users login via Google OAuth
+and for keeping the per-profile document summary up to date
 """
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.contrib.auth.models import User
 from allauth.socialaccount.signals import pre_social_login
-from .models import UserProfile
+from .models import UserDocument, UserProfile, refresh_document_summaries
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,3 +49,17 @@ def link_social_account(sender, request, sociallogin, **kwargs):
             logger.info(f"Ensured UserProfile exists for: {user.email}")
     except Exception as e:
         logger.error(f"Error in social login signal: {e}", exc_info=True)
+
+
+@receiver(post_save, sender=UserDocument)
+@receiver(post_delete, sender=UserDocument)
+def update_document_summary(sender, instance, **kwargs):
+    """
+    Keep UserProfile document counts and approved-type bitmask in sync
+    """
+    if kwargs.get('raw'):
+        return
+    try:
+        refresh_document_summaries([instance.user_email])
+    except Exception as e:
+        logger.error(f"Error updating document summary for {instance.user_email}: {e}", exc_info=True)
@@ -4,7 +4,8 @@ Sitemaps - Google için dinamik sitemap oluşturma
 from django.contrib.sitemaps import Sitemap
 from django.urls import reverse
 from django.conf import settings
-from .models import Shipment
+from . import gazetteer
+from .models import RouteStats, Shipment
 
 
 class ShipmentSitemap(Sitemap):
@@ -57,19 +58,32 @@ class CitySitemap(Sitemap):
     protocol = 'https'
 
     def items(self):
-        """Popüler şehirler için URL'ler"""
-        return [
-            'istanbul', 'ankara', 'izmir', 'bursa', 'antalya',
-            'adana', 'gaziantep', 'konya', 'mersin', 'kayseri',
-            'eskisehir', 'diyarbakir', 'samsun', 'denizli', 'sanliurfa',
-            'gebze', 'kocaeli', 'darica', 'adapazari', 'tekirdag',
-            'balikesir', 'aydin', 'manisa', 'trabzon', 'sakarya',
-        ]
+        """Tüm iller ve öne çıkan ilçeler (gazetteer)"""
+        return gazetteer.sitemap_slugs()
 
     def location(self, item):
         return f'/nakliye/{item}/'
 
 
+class RouteSitemap(Sitemap):
+    """
+    Güzergah sayfaları (/nakliye/istanbul-ankara/) - ilanı olan güzergahlar
+    RouteStats'tan okunur
+    """
+    priority = 0.7
+    changefreq = 'daily'
+    protocol = 'https'
+
+    def items(self):
+        return RouteStats.objects.filter(total_loads__gt=0).only('slug', 'updated_at')
+
+    def location(self, item):
+        return f'/nakliye/{item.slug}/'
+
+    def lastmod(self, item):
+        return item.updated_at
+
+
 class BlogSitemap(Sitemap):
     """
     Blog posts sitemap - SEO için içerik sayfaları
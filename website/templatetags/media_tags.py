@@ -0,0 +1,70 @@
+"""
+Media template tags
+
+{% load media_tags %}
+<img src="{% thumbnail_url proof 'md' %}">
+{% responsive_image 'images/hero-image.png' alt='...' sizes='50vw' %}
+"""
+from django import template
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from website.responsive_images import MIME_TYPES, static_manifest
+from website.thumbnails import thumbnail_url as build_thumbnail_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail_url(obj, size='md'):
+    """Belge veya teslimat kanıtı için imzalı WebP küçük resim URL'i (sahibi ve staff görür)"""
+    return build_thumbnail_url(obj, size)
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', css_class='', style='', loading='lazy', variants=None,
+                     webp_fallback='', width=None, height=None):
+    """
+    <picture> + AVIF/WebP srcset
+
+    {% responsive_image 'images/hero-image.png' alt='...' sizes='(max-width: 991px) 100vw, 50vw' %}
+    {% responsive_image post.featured_image alt=post.title variants=post.featured_image_variants %}
+
+    Statik yol için build_responsive_images manifest'i, yüklenen dosya için
+    modelde saklanan kayıt kullanılır. Manifest'te kayıt yoksa (komut
+    çalışmamış) webp_fallback ('yol 800w, yol 1536w') ve width/height ile
+    elle hazırlanmış varyantlar kullanılır; o da yoksa düz <img> üretilir.
+    """
+    if isinstance(image, str):
+        entry = static_manifest().get(image) or {}
+        url = static
+        fallback_url = static(image)
+        if not entry and webp_fallback:
+            candidates = (candidate.split() for candidate in webp_fallback.split(','))
+            entry = {'variants': {'webp': [(name, int(descriptor.rstrip('w'))) for name, descriptor in candidates]}}
+    else:
+        if not image:
+            return ''
+        entry = variants or {}
+        url = default_storage.url
+        fallback_url = image.url
+
+    sources = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[fmt], ', '.join(f'{url(name)} {width}w' for name, width in entry['variants'][fmt]), sizes)
+            for fmt in MIME_TYPES  # AVIF önce, tarayıcı ilk desteklediğini seçer
+            if fmt in entry.get('variants', {})
+        ),
+    )
+    width, height = entry.get('width', width), entry.get('height', height)
+    dimensions = format_html(' width="{}" height="{}"', width, height) if width and height else ''
+    img = format_html(
+        '<img src="{}" alt="{}" class="{}" style="{}" loading="{}" decoding="async"{}>',
+        fallback_url, alt, css_class, style, loading, dimensions,
+    )
+    if not sources:
+        return img
+    return format_html('<picture>{}{}</picture>', sources, img)
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from website.admin import admin_site
+from website.admin_tables import LargeTableAdminMixin
+from website.management.commands.check_admin_queries import seed
+
+# Changelist sayfa boyutu ve model başına oluşturulan satır
+ROWS = 100
+
+# 100 satırlık changelist başına sorgu sayısı (PostgreSQL): oturum +
+# kullanıcı, sayım, sayfa sorgusu ve list_filter seçenekleri. list_display'deki
+# bir kolon ilişkili satırı lazy-load ederse sayı satır sayısıyla büyür.
+QUERY_COUNTS = {
+    'website.userdocument': 4,
+    'website.adminactivity': 6,
+    'website.userprofile': 4,
+    'website.shipment': 6,
+    'website.bid': 5,
+    'website.vehicle': 4,
+    'website.payment': 4,
+    'website.shipmentimport': 6,
+    'website.payoutbatch': 6,
+    'website.ledgeraccount': 5,
+    'website.journalentry': 6,
+    'website.paymentwebhookevent': 7,
+    'sites.site': 4,
+    'socialaccount.socialapp': 4,
+    'socialaccount.socialaccount': 5,
+    'socialaccount.socialtoken': 5,
+}
+
+
+# Manifest storage collectstatic çıktısı ister
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminChangelistQueryTests(TestCase):
+    """Her kayıtlı admin changelist'i 100 satırla sabit sayıda sorgu çalıştırır"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(ROWS)
+        cls.admin_user = User.objects.create_superuser('query-budget', 'query-budget@example.com', None)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin_user)
+        # Oturum ve önbellekli kullanıcı ilk istekte yüklenir; sayımlar bundan sonra
+        self.client.get(reverse('admin:index'), secure=True)
+
+    def test_every_admin_has_a_query_count(self):
+        registered = {f'{model._meta.app_label}.{model._meta.model_name}' for model in admin_site._registry}
+        self.assertEqual(registered, set(QUERY_COUNTS))
+
+    def test_changelist_query_counts(self):
+        for model, model_admin in admin_site._registry.items():
+            opts = model._meta
+            label = f'{opts.app_label}.{opts.model_name}'
+            with self.subTest(label), mock.patch.object(model_admin, 'list_per_page', ROWS):
+                url = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+                expected = QUERY_COUNTS[label]
+                # SQLite'ta sqlite_stat1 yoksa satır tahmini ikinci sorguyla okunur
+                if connection.vendor == 'sqlite' and isinstance(model_admin, LargeTableAdminMixin):
+                    expected += 1
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url, secure=True)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.context['cl'].result_list), ROWS)
@@ -0,0 +1,137 @@
+"""
+Belge ve teslimat kanıtı küçük resimleri
+
+Belge ve kanıt kaynakları (özel dosya, Firebase Storage veya eski media
+URL'i) imzalı bir bağlantı üzerinden WebP küçük resme çevrilir; bağlantı
+website.private_media'daki nesne referansıdır ve görünüm sahiplik kontrolü
+yapar. Üretilen dosya özel storage'da thumbnails/<boyut>/<sha256>.webp
+olarak saklanır ve sonraki isteklerde yeniden üretilmez. Veritabanındaki eski
+data: URL'leri önce `migrate_data_urls` komutuyla özel storage'a
+taşınmalıdır; taşınana kadar olduğu gibi kullanılırlar.
+
+Uzak kaynaklar sadece THUMBNAIL_ALLOWED_HOSTS içindeki https hostlarından
+indirilir (yönlendirme takip edilmez), böylece imzalı bağlantı SSRF için
+kullanılamaz.
+"""
+import base64
+import binascii
+import hashlib
+from io import BytesIO
+from urllib.parse import urlparse
+
+import httpx
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from . import private_media
+from .http_client import get_client
+
+# Boyut adı -> en uzun kenar (px)
+THUMBNAIL_SIZES = {'sm': 160, 'md': 480, 'lg': 1024}
+
+# Kaynak dosya ve piksel sınırları (decompression bomb koruması)
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+MAX_SOURCE_PIXELS = 40_000_000
+
+WEBP_QUALITY = 80
+
+
+class ThumbnailError(Exception):
+    """Kaynak okunamadı veya resim değil"""
+
+
+def thumbnail_url(obj, size='md'):
+    """UserDocument/DeliveryProof için imzalı küçük resim URL'i; kaynak boşsa ''"""
+    source = private_media.source_of(obj)
+    if not source:
+        return ''
+    if source.startswith('data:'):
+        return source
+    if size not in THUMBNAIL_SIZES:
+        raise ValueError(f'Bilinmeyen küçük resim boyutu: {size}')
+    # Zaman damgasız imza: aynı kaynak her zaman aynı URL'i alır (tarayıcı cache)
+    return reverse('website:thumbnail', args=[size, private_media.sign(obj)])
+
+
+def decode_data_url(url):
+    """data:<mime>;base64,<veri> -> (mime, bytes)"""
+    header, _, payload = url.partition(',')
+    if not header.startswith('data:') or ';base64' not in header:
+        raise ThumbnailError('Desteklenmeyen data URL')
+    content_type = header[5:].split(';')[0] or 'application/octet-stream'
+    try:
+        return content_type, base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        raise ThumbnailError('Geçersiz base64 verisi')
+
+
+def read_source(source):
+    """Kaynak dosyanın baytlarını getir (özel dosya, eski media dosyası veya izinli host)"""
+    if private_media.is_private(source) or source.startswith(settings.MEDIA_URL):
+        if private_media.is_private(source):
+            storage, name = private_media.private_storage, private_media.storage_name(source)
+        else:
+            storage, name = default_storage, source[len(settings.MEDIA_URL):]
+        if not storage.exists(name):
+            raise ThumbnailError('Dosya bulunamadı')
+        with storage.open(name, 'rb') as handle:
+            data = handle.read(MAX_SOURCE_BYTES + 1)
+        if len(data) > MAX_SOURCE_BYTES:
+            raise ThumbnailError('Kaynak dosya çok büyük')
+        return data
+
+    parsed = urlparse(source)
+    if parsed.scheme != 'https' or parsed.hostname not in settings.THUMBNAIL_ALLOWED_HOSTS:
+        raise ThumbnailError(f'İzin verilmeyen kaynak: {parsed.hostname}')
+
+    chunks, total = [], 0
+    try:
+        with get_client().stream('GET', source) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                total += len(chunk)
+                if total > MAX_SOURCE_BYTES:
+                    raise ThumbnailError('Kaynak dosya çok büyük')
+                chunks.append(chunk)
+    except httpx.HTTPError as e:
+        raise ThumbnailError(f'Kaynak indirilemedi: {e}')
+    return b''.join(chunks)
+
+
+def render_thumbnail(data, max_side):
+    """Resim baytlarını en uzun kenarı max_side olan WebP'ye çevir"""
+    try:
+        image = Image.open(BytesIO(data))
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            raise ThumbnailError('Resim çok büyük')
+        # JPEG'i hedef boyuta yakın çözünürlükte aç (tam çözünürlük decode edilmez)
+        image.draft('RGB', (max_side * 2, max_side * 2))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ThumbnailError(f'Resim açılamadı: {e}')
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    output = BytesIO()
+    image.save(output, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return output.getvalue()
+
+
+def get_thumbnail(source, size):
+    """Küçük resmin özel storage'daki adını döndür; yoksa üret ve kaydet"""
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    name = f'thumbnails/{size}/{digest}.webp'
+    storage = private_media.private_storage
+    if storage.exists(name):
+        return name
+
+    webp = render_thumbnail(read_source(source), THUMBNAIL_SIZES[size])
+    # Aynı anda üreten başka bir istek kaydetmiş olabilir
+    if not storage.exists(name):
+        storage.save(name, ContentFile(webp))
+    return name
@@ -0,0 +1,80 @@
+"""
+Takip numarası üretimi - YN-{yıl}-{sıra:06d}{kontrol hanesi}
+
+Numaralar yıl bazında TrackingNumberSequence satırından sırayla ayrılır:
+satır kilitlenir, sayaç tek UPDATE ile n kadar ilerletilir ve kilit hemen
+bırakılır. Böylece numaralar çakışmaz, yıl içinde artan sırada olur ve
+unique index'e her zaman sondan eklenir. Toplu yüklemeler tek çağrıda
+bir blok numara alır.
+
+Son hane Luhn kontrol hanesidir; ilan detay ve takip sayfaları yanlış
+yazılan numaraları is_valid_tracking_number ile veritabanına gitmeden 404'e
+çevirir. Eski 6 karakterli (hex) numaralar 7 haneli yeni formatla çakışmaz
+ve biçimleri tutuyorsa geçerli sayılır.
+"""
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TrackingNumberSequence
+
+PREFIX = 'YN'
+
+TRACKING_NUMBER_RE = re.compile(r'^YN-(\d{4})-(\d{7,})$')
+
+# Sıra numarasından önceki format: YN-2025-A1B2C3 (uuid4 hex)
+LEGACY_TRACKING_NUMBER_RE = re.compile(r'^YN-\d{4}-[0-9A-F]{6}$')
+
+
+def luhn_check_digit(digits):
+    """Rakam dizisi için Luhn kontrol hanesi"""
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = int(char)
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def format_tracking_number(year, value):
+    """Yıl ve sıra numarasından takip numarası oluştur"""
+    sequence = f'{value:06d}'
+    return f'{PREFIX}-{year}-{sequence}{luhn_check_digit(f"{year}{sequence}")}'
+
+
+def is_valid_tracking_number(tracking_number):
+    """Yeni formatta kontrol hanesi doğru veya eski formatta olan numara"""
+    match = TRACKING_NUMBER_RE.match(tracking_number or '')
+    if not match:
+        return bool(LEGACY_TRACKING_NUMBER_RE.match(tracking_number or ''))
+    year, digits = match.groups()
+    return luhn_check_digit(f'{year}{digits[:-1]}') == digits[-1]
+
+
+def allocate_tracking_numbers(count, year=None):
+    """
+    count adet ardışık takip numarası ayır
+
+    Uzun süren bir transaction içinden çağrılmamalı; sayaç satırının kilidi
+    çevreleyen transaction bitene kadar tutulur.
+    """
+    if count <= 0:
+        return []
+    year = year or timezone.localdate().year
+
+    with transaction.atomic():
+        sequence, _ = TrackingNumberSequence.objects.select_for_update().get_or_create(year=year)
+        start = sequence.last_value + 1
+        sequence.last_value += count
+        sequence.save(update_fields=['last_value'])
+
+    return [format_tracking_number(year, value) for value in range(start, start + count)]
+
+
+def next_tracking_number(year=None):
+    """Tek ilan için sıradaki takip numarası"""
+    return allocate_tracking_numbers(1, year=year)[0]
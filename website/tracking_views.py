@@ -7,6 +7,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from .models import Shipment, Bid, ShipmentTracking, DeliveryProof, Review
+from .private_media import can_view_shipment_media
+from .tracking_numbers import is_valid_tracking_number
+from .user_cache import get_user_profile
 
 
 def shipment_tracking(request, tracking_number):
@@ -14,6 +17,10 @@ def shipment_tracking(request, tracking_number):
     Shipment tracking page - Shows tracking timeline
     Public view - anyone can see tracking info
     """
+    # Yanlış yazılmış numara veritabanına gitmez
+    if not is_valid_tracking_number(tracking_number):
+        raise Http404("İlan bulunamadı")
+
     # Get shipment
     try:
         shipment = Shipment.objects.select_related('shipper__user').get(tracking_number=tracking_number)
@@ -44,6 +51,8 @@ def shipment_tracking(request, tracking_number):
         'shipment': shipment,
         'tracking_updates': tracking_updates,
         'delivery_proofs': delivery_proofs,
+        # Teslimat kanıtları sadece ilanın tarafları ve staff'a gösterilir
+        'can_view_proofs': can_view_shipment_media(request.user, shipment),
         'assigned_bid': assigned_bid,
     }
     return render(request, 'website/shipment_tracking.html', context)
@@ -61,7 +70,7 @@ def update_tracking(request, tracking_number):
         return redirect('website:ilanlar')
 
     # Check if user is the assigned carrier
-    profile = request.user.profile
+    profile = get_user_profile(request)
     assigned_bid = Bid.objects.filter(shipment=shipment, status='accepted').first()
 
     if not assigned_bid or assigned_bid.carrier != profile:
@@ -133,7 +142,7 @@ def confirm_delivery(request, tracking_number):
         return redirect('website:ilanlar')
 
     # Check if user is the shipper
-    profile = request.user.profile
+    profile = get_user_profile(request)
     if shipment.shipper != profile:
         messages.error(request, 'Bu işlemi yapma yetkiniz yok.')
         return redirect('website:shipment_tracking', tracking_number=tracking_number)
@@ -188,7 +197,7 @@ def add_review(request, tracking_number):
         return redirect('website:shipment_tracking', tracking_number=tracking_number)
 
     # Check authorization
-    profile = request.user.profile
+    profile = get_user_profile(request)
     is_shipper = (profile == shipment.shipper)
     is_carrier = (profile == assigned_bid.carrier)
 
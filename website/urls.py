@@ -1,13 +1,21 @@
 """
 Website URL Configuration - SEO friendly URLs
 """
-from django.urls import path
+from django.urls import path, register_converter
 from . import views
 from . import auth_views
 from . import oauth_views
 from . import sentry_test
 from . import bid_views
 from . import tracking_views
+from . import import_views
+from . import media_views
+from . import webhook_views
+from .gazetteer import ProvinceSlugConverter
+from .ids import PublicIdConverter
+
+register_converter(PublicIdConverter, 'pid')
+register_converter(ProvinceSlugConverter, 'province')
 
 app_name = 'website'
 
@@ -18,6 +26,9 @@ urlpatterns = [
     # İlanlar
     path('ilanlar/', views.ilan_listesi, name='ilanlar'),
     path('ilan-olustur/', views.ilan_olustur, name='ilan_olustur'),
+    path('ilan-olustur/toplu/', import_views.toplu_ilan_yukle, name='toplu_ilan_yukle'),
+    path('ilan-olustur/toplu/sablon/', import_views.toplu_ilan_sablon, name='toplu_ilan_sablon'),
+    path('ilan-olustur/toplu/<int:import_id>/hata-raporu/', import_views.toplu_ilan_hata_raporu, name='toplu_ilan_hata_raporu'),
     path('ilan/<str:tracking_number>/', views.ilan_detay, name='ilan_detay'),
     path('ilan/<str:tracking_number>/teklif-ver/', views.teklif_ver, name='teklif_ver'),
 
@@ -28,15 +39,16 @@ urlpatterns = [
     path('tekliflerim/', views.tekliflerim, name='tekliflerim'),
 
     # Teklif aksiyonları
-    path('teklif/<str:bid_id>/kabul-et/', views.teklif_kabul_et, name='teklif_kabul_et'),
-    path('teklif/<str:bid_id>/reddet/', views.teklif_reddet, name='teklif_reddet'),
+    path('teklif/<pid:bid_id>/kabul-et/', views.teklif_kabul_et, name='teklif_kabul_et'),
+    path('teklif/<pid:bid_id>/reddet/', views.teklif_reddet, name='teklif_reddet'),
 
     # Taşıyıcı Paneli
     path('tasiyici-panel/', views.tasiyici_panel, name='tasiyici_panel'),
 
     # Ödeme ve Teslim
-    path('odeme/<str:payment_id>/', views.odeme_yap, name='odeme_yap'),
-    path('teslim-onayla/<str:payment_id>/', views.teslim_onayla, name='teslim_onayla'),
+    path('odeme/<pid:payment_id>/', views.odeme_yap, name='odeme_yap'),
+    path('teslim-onayla/<pid:payment_id>/', views.teslim_onayla, name='teslim_onayla'),
+    path('odeme/bildirim/<str:provider>/', webhook_views.payment_webhook, name='payment_webhook'),
 
     # Authentication
     path('giris/', auth_views.login_view, name='login'),
@@ -58,7 +70,8 @@ urlpatterns = [
     path('gizlilik-politikasi/', views.gizlilik_politikasi, name='gizlilik_politikasi'),
     path('kullanim-kosullari/', views.kullanim_kosullari, name='kullanim_kosullari'),
 
-    # SEO - Şehir sayfaları
+    # SEO - Güzergah ve şehir sayfaları (güzergah önce: /nakliye/istanbul-ankara/)
+    path('nakliye/<province:origin>-<province:destination>/', views.rota_nakliye, name='rota_nakliye'),
     path('nakliye/<str:sehir_slug>/', views.sehir_nakliye, name='sehir_nakliye'),
 
     # OAuth - Custom Google Login
@@ -71,14 +84,18 @@ urlpatterns = [
     path('test-sentry-status/', sentry_test.sentry_test_success, name='test_sentry_status'),
 
     # Bid Management API
-    path('teklif/<str:bid_id>/kabul/', bid_views.bid_accept, name='bid_accept'),
-    path('teklif/<str:bid_id>/reddet/', bid_views.bid_reject, name='bid_reject'),
-    path('teklif/<str:bid_id>/karsi-teklif/', bid_views.bid_counter_offer, name='bid_counter_offer'),
-    path('teklif/<str:bid_id>/yorum/', bid_views.bid_comment, name='bid_comment'),
+    path('teklif/<pid:bid_id>/kabul/', bid_views.bid_accept, name='bid_accept'),
+    path('teklif/<pid:bid_id>/reddet/', bid_views.bid_reject, name='bid_reject'),
+    path('teklif/<pid:bid_id>/karsi-teklif/', bid_views.bid_counter_offer, name='bid_counter_offer'),
+    path('teklif/<pid:bid_id>/yorum/', bid_views.bid_comment, name='bid_comment'),
 
     # Tracking & Delivery
     path('takip/<str:tracking_number>/', tracking_views.shipment_tracking, name='shipment_tracking'),
     path('takip/<str:tracking_number>/guncelle/', tracking_views.update_tracking, name='update_tracking'),
     path('takip/<str:tracking_number>/teslim-onayla/', tracking_views.confirm_delivery, name='confirm_delivery'),
     path('takip/<str:tracking_number>/degerlendirme/', tracking_views.add_review, name='add_review'),
+
+    # Küçük resimler (belge / teslimat kanıtı)
+    path('thumb/<str:size>/<str:token>/', media_views.thumbnail, name='thumbnail'),
+    path('private-media/<str:token>/', media_views.private_file, name='private_media'),
 ]
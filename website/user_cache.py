@@ -0,0 +1,138 @@
+"""
+Önbellekli kullanıcı + profil yükleme
+
+Django'nun AuthenticationMiddleware'i her istekte User'ı sorgular, ardından
+view'lar request.user.profile ile ikinci bir sorgu yapar. Burada User ve
+UserProfile tek bir select_related sorgusuyla yüklenip önbelleğe alınır;
+User veya UserProfile kaydedildiğinde/silindiğinde önbellek transaction
+commit edildikten sonra temizlenir (önce temizlenirse eşzamanlı bir istek
+commit'ten önceki satırı yeniden önbelleğe alabilir).
+
+View'lar profile her zaman get_user_profile(request) ile erişir.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserProfile
+
+CACHE_KEY = 'auth-user:{}'
+
+
+def cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def invalidate_user(user_id):
+    """Kullanıcının önbellek kaydını sil"""
+    cache.delete(cache_key(user_id))
+
+
+def invalidate_users(user_ids):
+    """Birden çok kullanıcının önbellek kaydını sil (bulk_update/update sonrası)"""
+    cache.delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+def load_user(user_id):
+    """User'ı profiliyle birlikte önbellekten veya tek sorguyla yükle"""
+    key = cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User._default_manager.select_related('profile').filter(pk=user_id).first()
+        if user is None:
+            return None
+        cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_user(request):
+    """
+    django.contrib.auth.get_user ile aynı kontroller (backend, session hash),
+    fakat User önbellekten gelir
+    """
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    backend = auth.load_backend(backend_path)
+    user = load_user(user_id)
+    if user is None or not getattr(backend, 'user_can_authenticate', lambda u: True)(user):
+        return AnonymousUser()
+
+    # Oturumu doğrula (şifre değişince eski oturumlar düşer)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    session_auth_hash = user.get_session_auth_hash()
+    if session_hash and constant_time_compare(session_hash, session_auth_hash):
+        return user
+    if session_hash and any(
+        constant_time_compare(session_hash, fallback_hash)
+        for fallback_hash in user.get_session_auth_fallback_hash()
+    ):
+        request.session.cycle_key()
+        request.session[auth.HASH_SESSION_KEY] = session_auth_hash
+        return user
+
+    request.session.flush()
+    return AnonymousUser()
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """request.user'ı önbellekli User + profil ile doldurur"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _get_request_user(request))
+
+
+def _get_request_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+def get_user_profile(request, create=False, **defaults):
+    """
+    Giriş yapmış kullanıcının UserProfile'ı; yoksa None
+
+    create=True ise eksik profil defaults ile oluşturulur.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return None
+
+    try:
+        return user.profile
+    except ObjectDoesNotExist:
+        if not create:
+            return None
+
+    profile, _ = UserProfile.objects.get_or_create(user=user, defaults=defaults)
+    user.profile = profile
+    return profile
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_on_user_change(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_on_profile_change(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user(user_id))
@@ -7,14 +7,24 @@ from django.core.paginator import Paginator
 from django.views.decorators.cache import cache_page
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from .models import UserDocument, UserProfile, Bid, Payment, Shipment
+from . import distances, gazetteer, ledger, route_stats
+from .models import UserDocument, UserProfile, Bid, Payment, RouteStats, Shipment
+from .tracking_numbers import is_valid_tracking_number, next_tracking_number
+from .db_routers import read_replica
+from .http_cache import private_page, public_page
+from .notifications import send_mail_in_background
+from .payment_webhooks import mark_payment_paid, notify_payment_received
+from .user_cache import get_user_profile
 from decimal import Decimal
 import json
 import uuid
 from datetime import datetime as dt
 
 
+@public_page
 def index(request):
     """
     Ana sayfa - SEO optimize
@@ -79,6 +89,7 @@ def index(request):
     return render(request, 'website/index.html', context)
 
 
+@read_replica
 def ilan_listesi(request):
     """
     İlan listesi - SADECE TAŞIYICILAR İÇİN
@@ -94,7 +105,7 @@ def ilan_listesi(request):
 
     # Kullanıcı taşıyıcı mı kontrol et (user_type == 1)
     try:
-        profile = request.user.profile
+        profile = get_user_profile(request)
         if profile.user_type != 1:  # 1 = Taşıyıcı
             messages.error(request, 'İlanları sadece taşıyıcılar görüntüleyebilir. Lütfen taşıyıcı hesabı ile giriş yapın.')
             return redirect('website:index')
@@ -165,6 +176,10 @@ def ilan_detay(request, tracking_number):
     from .models import Shipment, Bid
     from django.contrib import messages
 
+    # Yanlış yazılmış numara veritabanına gitmez
+    if not is_valid_tracking_number(tracking_number):
+        raise Http404("İlan bulunamadı")
+
     # Get shipment from PostgreSQL
     try:
         shipment = Shipment.objects.select_related('shipper__user').get(tracking_number=tracking_number)
@@ -179,7 +194,7 @@ def ilan_detay(request, tracking_number):
     # Kullanıcının bu ilanı görme yetkisi var mı kontrol et
     # İlan sahibi veya taşıyıcı olmalı
     try:
-        profile = request.user.profile
+        profile = get_user_profile(request)
         is_owner = (profile == shipment.shipper)
         is_carrier = (profile.user_type == 1)  # 1 = Taşıyıcı
 
@@ -236,8 +251,9 @@ def ilan_detay(request, tracking_number):
 
     # Check if current user has already bid
     user_has_bid = False
-    if request.user.is_authenticated and hasattr(request.user, 'profile'):
-        user_has_bid = bids.filter(carrier=request.user.profile).exists()
+    viewer_profile = get_user_profile(request)
+    if viewer_profile is not None:
+        user_has_bid = bids.filter(carrier=viewer_profile).exists()
 
     # Get assigned carrier if exists
     assigned_carrier = None
@@ -264,10 +280,15 @@ def ilan_detay(request, tracking_number):
         'user_has_bid': user_has_bid,
         'bid_count': bids.count(),
         'assigned_carrier': assigned_carrier,
+        'route_eta': distances.eta(
+            shipment.from_address_city, shipment.to_address_city,
+            shipment.from_address_district, shipment.to_address_district,
+        ),
     }
     return render(request, 'website/ilan_detay.html', context)
 
 
+@public_page
 def hakkimizda(request):
     """Hakkımızda sayfası - Canlı istatistiklerle"""
     from .models import UserProfile, Shipment
@@ -335,6 +356,7 @@ def hakkimizda(request):
     return render(request, 'website/hakkimizda.html', context)
 
 
+@public_page
 def iletisim(request):
     """İletişim sayfası"""
     context = {
@@ -345,6 +367,7 @@ def iletisim(request):
     return render(request, 'website/iletisim.html', context)
 
 
+@public_page
 def nasil_calisir(request):
     """Nasıl Çalışır? sayfası"""
     context = {
@@ -355,6 +378,7 @@ def nasil_calisir(request):
     return render(request, 'website/nasil_calisir.html', context)
 
 
+@public_page
 def sss(request):
     """Sıkça Sorulan Sorular - SEO optimize FAQPage schema ile"""
     faqs = [
@@ -418,6 +442,7 @@ def sss(request):
     return render(request, 'website/sss.html', context)
 
 
+@public_page
 def gizlilik_politikasi(request):
     """Gizlilik Politikası sayfası"""
     context = {
@@ -428,6 +453,7 @@ def gizlilik_politikasi(request):
     return render(request, 'website/gizlilik_politikasi.html', context)
 
 
+@public_page
 def kullanim_kosullari(request):
     """Kullanım Koşulları sayfası"""
     context = {
@@ -438,6 +464,8 @@ def kullanim_kosullari(request):
     return render(request, 'website/kullanim_kosullari.html', context)
 
 
+@public_page
+@read_replica
 def sehir_nakliye(request, sehir_slug):
     """
     Şehir bazlı nakliye landing page - SEO optimize
@@ -446,51 +474,11 @@ def sehir_nakliye(request, sehir_slug):
     from .models import Shipment, UserProfile
     from django.db.models import Q
 
-    # Slug'ı şehir adına çevir
-    sehir_map = {
-        'istanbul': 'İstanbul',
-        'ankara': 'Ankara',
-        'izmir': 'İzmir',
-        'gebze': 'Gebze',
-        'kocaeli': 'Kocaeli',
-        'darica': 'Darıca',
-        'bursa': 'Bursa',
-        'antalya': 'Antalya',
-        'adana': 'Adana',
-        'gaziantep': 'Gaziantep',
-        'konya': 'Konya',
-        'mersin': 'Mersin',
-        'kayseri': 'Kayseri',
-        'eskisehir': 'Eskişehir',
-        'diyarbakir': 'Diyarbakır',
-        'samsun': 'Samsun',
-        'denizli': 'Denizli',
-        'sanliurfa': 'Şanlıurfa',
-        'adapazari': 'Adapazarı',
-        'malatya': 'Malatya',
-        'kahramanmaras': 'Kahramanmaraş',
-        'erzurum': 'Erzurum',
-        'van': 'Van',
-        'batman': 'Batman',
-        'elazig': 'Elazığ',
-        'erzincan': 'Erzincan',
-        'tekirdag': 'Tekirdağ',
-        'balikesir': 'Balıkesir',
-        'aydin': 'Aydın',
-        'manisa': 'Manisa',
-        'muğla': 'Muğla',
-        'trabzon': 'Trabzon',
-        'ordu': 'Ordu',
-        'rize': 'Rize',
-        'sakarya': 'Sakarya',
-        'edirne': 'Edirne',
-    }
-
-    sehir = sehir_map.get(sehir_slug.lower())
-
-    if not sehir:
-        # 404 yerine varsayılan bir şehir gösterelim
-        sehir = sehir_slug.capitalize()
+    # Slug'ı il veya ilçe adına çevir (gazetteer); tanınmayan slug için sayfa üretilmez
+    place = gazetteer.find_by_slug(sehir_slug)
+    if place is None:
+        raise Http404("Şehir bulunamadı")
+    sehir = place.name
 
     # Şehre ait ilanlar (hem kalkış hem varış şehri)
     try:
@@ -574,6 +562,11 @@ def sehir_nakliye(request, sehir_slug):
         }
     }
 
+    # Şehirden çıkan popüler güzergahlar (RouteStats, tek indeksli sorgu)
+    routes = []
+    if place.kind == 'province':
+        routes = list(RouteStats.objects.filter(from_city=sehir, total_loads__gt=0)[:route_stats.RELATED_LIMIT])
+
     context = {
         'title': f'{sehir} Nakliye - En Uygun Taşıma Fiyatları | NAKLIYE NET',
         'description': f'{sehir} nakliye ve taşımacılık hizmetleri. Ev taşıma, ofis taşıma, yük taşıma için doğrulanmış taşıyıcılardan teklif alın. {stats["active_shipments"]} aktif ilan.',
@@ -582,18 +575,93 @@ def sehir_nakliye(request, sehir_slug):
         'sehir_slug': sehir_slug,
         'shipments': shipments,
         'stats': stats,
+        'routes': routes,
         'schema_org': json.dumps(localbusiness_schema, ensure_ascii=False),
     }
     return render(request, 'website/sehir_nakliye.html', context)
 
 
+@public_page
+@read_replica
+def rota_nakliye(request, origin, destination):
+    """
+    Güzergah landing page - SEO
+    Örnek: /nakliye/istanbul-ankara/
+    İçerik RouteStats'tan önceden oluşturulup cache'lenir (website.route_stats);
+    istek ilan ve teklif tablolarını okumaz.
+    """
+    if origin == destination:
+        return redirect('website:sehir_nakliye', sehir_slug=origin.slug, permanent=True)
+
+    from_city, to_city = origin.name, destination.name
+    page = route_stats.page(from_city, to_city)
+    slug = route_stats.route_slug(from_city, to_city)
+    url = f'{request.scheme}://{request.get_host()}/nakliye/{slug}/'
+
+    service_schema = {
+        '@context': 'https://schema.org',
+        '@type': 'Service',
+        'serviceType': 'Şehirler Arası Nakliye',
+        'name': f'{from_city} {to_city} Nakliye',
+        'provider': {
+            '@type': 'Organization',
+            'name': 'NAKLIYE NET',
+            'url': f'{request.scheme}://{request.get_host()}'
+        },
+        'areaServed': [
+            {'@type': 'City', 'name': from_city},
+            {'@type': 'City', 'name': to_city},
+        ],
+        'availableChannel': {
+            '@type': 'ServiceChannel',
+            'serviceUrl': url
+        }
+    }
+    if page['median_price'] is not None:
+        service_schema['offers'] = {
+            '@type': 'Offer',
+            'price': str(page['median_price']),
+            'priceCurrency': 'TRY',
+        }
+
+    description = f'{from_city} {to_city} nakliye: doğrulanmış taşıyıcılardan teklif alın.'
+    if page['distance_km']:
+        description += f' Yaklaşık {page["distance_km"]} km.'
+    if page['median_price'] is not None:
+        description += f' Medyan fiyat {page["median_price"]:.0f} TL.'
+    if page['active_loads']:
+        description += f' {page["active_loads"]} aktif ilan.'
+
+    context = {
+        'title': f'{from_city} {to_city} Nakliye - Fiyatlar ve Teslim Süresi | NAKLIYE NET',
+        'description': description,
+        'keywords': f'{from_city} {to_city} nakliye, {from_city} {to_city} evden eve nakliyat, {from_city} {to_city} yük taşıma',
+        'from_city': from_city,
+        'to_city': to_city,
+        'route_slug': slug,
+        'page': page,
+        'schema_org': json.dumps(service_schema, ensure_ascii=False),
+    }
+    return render(request, 'website/rota_nakliye.html', context)
+
+
+# profil formunun yazdığı alanlar; diğerleri (belge özeti, puan) başka yerlerde güncellenir
+PROFILE_FORM_FIELDS = [
+    'phone_number', 'iban', 'user_type',
+    'company_name', 'tax_id', 'billing_address',
+    'service_areas', 'working_hours', 'bio',
+    'profile_completed', 'documents_verified', 'updated_at',
+]
+
+
+@private_page
 @login_required
 def profil(request):
     """
     Kullanıcı profil sayfası
     Belge yükleme, telefon ve IBAN girişi
     """
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    profile = get_user_profile(request, create=True)
 
     # Get user documents from PostgreSQL
     documents = UserDocument.objects.filter(user_email=request.user.email).order_by('-uploaded_at')
@@ -621,6 +689,9 @@ def profil(request):
         elif iban and len(iban) != 26:
             messages.error(request, 'IBAN 26 karakter olmalıdır (TR + 24 rakam).')
         else:
+            # Önbellekteki profil eski olabilir (belge özeti, puan); güncel
+            # satır üzerinde çalış ve sadece formun alanlarını yaz
+            profile = UserProfile.objects.get(pk=profile.pk)
             profile.phone_number = phone
             profile.iban = iban
 
@@ -651,7 +722,7 @@ def profil(request):
             # Check if documents are verified
             profile.documents_verified = profile.check_documents_verified()
 
-            profile.save()
+            profile.save(update_fields=PROFILE_FORM_FIELDS)
             messages.success(request, 'Profiliniz güncellendi!')
             return redirect('website:profil')
 
@@ -675,9 +746,8 @@ def belge_yukle(request):
     if request.method != 'POST':
         return redirect('website:profil')
 
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı. Lütfen önce profilinizi oluşturun.')
         return redirect('website:profil')
 
@@ -719,9 +789,9 @@ def teklif_ver(request, tracking_number):
         return redirect('website:ilan_detay', tracking_number=tracking_number)
 
     # Get user profile
-    profile = request.user.profile
+    profile = get_user_profile(request)
 
-    if not profile.profile_completed:
+    if profile is None or not profile.profile_completed:
         messages.error(request, 'Teklif vermek için önce profilinizi tamamlamalısınız.')
         return redirect('website:profil')
 
@@ -768,6 +838,18 @@ def teklif_ver(request, tracking_number):
         messages.error(request, 'Geçersiz teklif bilgileri. Lütfen kontrol edin.')
         return redirect('website:ilan_detay', tracking_number=tracking_number)
 
+    # Teslimat süresi güzergah mesafesine göre mümkün olmalı
+    km = distances.distance_km(
+        shipment.from_address_city, shipment.to_address_city,
+        shipment.from_address_district, shipment.to_address_district,
+    )
+    if km is not None and estimated_days < distances.minimum_transit_days(km):
+        messages.error(
+            request,
+            f'Bu güzergah yaklaşık {km} km; teslimat süresi en az {distances.minimum_transit_days(km)} gün olmalıdır.'
+        )
+        return redirect('website:ilan_detay', tracking_number=tracking_number)
+
     try:
         # Determine carrier name with fallback chain
         carrier_name = (
@@ -779,7 +861,6 @@ def teklif_ver(request, tracking_number):
 
         # Create bid in PostgreSQL
         bid = Bid.objects.create(
-            bid_id=str(uuid.uuid4()),
             shipment=shipment,
             tracking_number=tracking_number,
             carrier=profile,
@@ -811,15 +892,15 @@ def teklif_ver(request, tracking_number):
     return redirect('website:ilan_detay', tracking_number=tracking_number)
 
 
+@private_page
 @login_required
 def ilanlarim(request):
     """
     İlanlarım sayfası - Sadece Yük Sahipleri için
     Oluşturduğu ilanları ve gelen teklifleri görür
     """
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı.')
         return redirect('website:profil')
 
@@ -878,15 +959,15 @@ def ilanlarim(request):
     return render(request, 'website/ilanlarim.html', context)
 
 
+@private_page
 @login_required
 def tekliflerim(request):
     """
     Tekliflerim sayfası - Sadece Taşıyıcılar için
     Verdiği teklifleri ve durumlarını görür
     """
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı.')
         return redirect('website:profil')
 
@@ -945,7 +1026,7 @@ def teklif_kabul_et(request, bid_id):
 
     try:
         from .models import Bid, Shipment
-        profile = request.user.profile
+        profile = get_user_profile(request)
 
         # PostgreSQL'den bid'i al
         try:
@@ -992,7 +1073,6 @@ def teklif_kabul_et(request, bid_id):
         carrier_amount = amount - platform_fee
 
         payment = Payment.objects.create(
-            payment_id=str(uuid.uuid4()),
             shipment=shipment,
             bid=bid,
             shipper=profile,
@@ -1030,7 +1110,7 @@ def teklif_reddet(request, bid_id):
 
     try:
         from .models import Bid
-        profile = request.user.profile
+        profile = get_user_profile(request)
 
         # PostgreSQL'den bid'i al
         try:
@@ -1063,33 +1143,24 @@ def ilan_olustur(request):
     İlan oluşturma sayfası - Tam fonksiyonlu form
     """
     from .models import Shipment, UserProfile
-    import uuid
-    from datetime import date
 
     if request.method == 'POST':
         try:
             # Ensure user profile exists and is shipper
-            if hasattr(request.user, 'profile'):
-                profile = request.user.profile
-                # Set as shipper if not already
-                if profile.user_type != 0:
-                    profile.user_type = 0
-                    profile.save()
-            else:
-                # Create shipper profile
-                profile = UserProfile.objects.create(
-                    user=request.user,
-                    user_type=0  # Yük Veren
-                )
+            profile = get_user_profile(request, create=True, user_type=0)  # Yük Veren
+            # Set as shipper if not already
+            if profile.user_type != 0:
+                profile.user_type = 0
+                # Önbellekteki profilin diğer alanları eski olabilir
+                profile.save(update_fields=['user_type', 'updated_at'])
 
             # Generate unique tracking number
-            tracking_number = f"YN-{date.today().year}-{uuid.uuid4().hex[:6].upper()}"
+            tracking_number = next_tracking_number()
 
             # Create shipment
             shipment = Shipment.objects.create(
-                shipment_id=str(uuid.uuid4()),
                 tracking_number=tracking_number,
-                shipper=request.user.profile,
+                shipper=profile,
                 shipper_email=request.user.email,
                 shipper_phone=request.POST.get('phone', ''),
 
@@ -1168,15 +1239,15 @@ def ilan_olustur(request):
     return render(request, 'website/ilan_olustur.html', context)
 
 
+@private_page
 @login_required
 def odeme_yap(request, payment_id):
     """
     Ödeme sayfası - Yük sahibi ödeme yapar
     Sanal POS entegrasyonu için hazır
     """
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı.')
         return redirect('website:profil')
 
@@ -1209,49 +1280,18 @@ def odeme_yap(request, payment_id):
             # Simulate payment processing
             # In production, this would call virtual POS API
 
-            payment.status = 'paid'
-            payment.paid_at = timezone.now()
-            payment.transaction_id = f"TXN-{uuid.uuid4().hex[:12].upper()}"
-            payment.payment_provider = 'Test Provider'  # Will be iyzico, paytr, etc
-            payment.save()
-
-            # Update shipment status
-            payment.shipment.status = 'assigned'
-            payment.shipment.save()
+            with transaction.atomic():
+                mark_payment_paid(
+                    payment,
+                    transaction_id=f"TXN-{uuid.uuid4().hex[:12].upper()}",
+                    provider='Test Provider',  # Will be iyzico, paytr, etc
+                )
 
             messages.success(request, 'Ödemeniz başarıyla alındı! Taşıyıcı bilgilendirildi.')
 
             # Send email to carrier
             try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-
-                carrier_email = payment.carrier.user.email
-                if carrier_email:
-                    subject = f'Ödeme Alındı! - {payment.shipment.tracking_number}'
-                    email_message = f'''
-Merhaba {payment.carrier.user.get_full_name() or payment.carrier.user.username},
-
-{payment.shipper.user.get_full_name()} tarafından ödeme yapıldı!
-
-Ödeme Detayları:
-- Takip No: {payment.shipment.tracking_number}
-- Tutar: {payment.amount} TL
-- Ödeme Durumu: Ödendi (Escrow'da tutuluyor)
-
-Artık yükü teslim alabilirsiniz. Her iki taraf teslim onayı verdikten sonra para hesabınıza transfer edilecektir.
-
-Saygılarımızla,
-NAKLIYE NET Ekibi
-                    '''
-
-                    send_mail(
-                        subject,
-                        email_message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [carrier_email],
-                        fail_silently=True,
-                    )
+                notify_payment_received(payment)
             except Exception as email_error:
                 print(f"Error sending payment notification: {email_error}")
 
@@ -1276,9 +1316,8 @@ def teslim_onayla(request, payment_id):
     """
     Teslim onaylama - Hem yük sahibi hem taşıyıcı onaylar
     """
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı.')
         return redirect('website:profil')
 
@@ -1338,8 +1377,6 @@ def teslim_onayla(request, payment_id):
 
                 # Notify admin
                 try:
-                    from django.core.mail import send_mail
-                    from django.conf import settings
                     from django.contrib.auth.models import User
 
                     # Get admin emails
@@ -1365,17 +1402,14 @@ Admin panelinden transfer işlemini onaylayın:
 NAKLIYE NET
                         '''
 
-                        send_mail(
-                            subject,
-                            email_message,
-                            settings.DEFAULT_FROM_EMAIL,
-                            admin_emails,
-                            fail_silently=True,
-                        )
+                        send_mail_in_background(subject, email_message, admin_emails)
                 except Exception as email_error:
                     print(f"Error sending admin notification: {email_error}")
 
-            payment.save()
+            with transaction.atomic():
+                payment.save()
+                if payment.status == 'delivered':
+                    ledger.record_delivery(payment)
 
         except Exception as e:
             print(f"Error confirming delivery: {e}")
@@ -1396,7 +1430,18 @@ NAKLIYE NET
     return render(request, 'website/teslim_onay.html', context)
 
 
+# Taşıyıcı paneli sıralama seçenekleri: (değer, etiket, order_by)
+CARRIER_PANEL_SORTS = [
+    ('yeni', 'En yeni', ['-created_at']),
+    ('mesafe_kisa', 'Mesafe (kısadan uzuna)', [F('distance_km').asc(nulls_last=True), '-created_at']),
+    ('mesafe_uzun', 'Mesafe (uzundan kısaya)', [F('distance_km').desc(nulls_last=True), '-created_at']),
+    ('km_fiyat', 'Km başına bütçe (yüksek)', [F('km_price').desc(nulls_last=True), '-created_at']),
+]
+
+
+@private_page
 @login_required
+@read_replica
 def tasiyici_panel(request):
     """
     Taşıyıcı Paneli - Sadece taşıyıcılar için
@@ -1405,9 +1450,8 @@ def tasiyici_panel(request):
     from .models import Shipment, UserProfile
     from django.db.models import Q
 
-    try:
-        profile = request.user.profile
-    except:
+    profile = get_user_profile(request)
+    if profile is None:
         messages.error(request, 'Profil bulunamadı.')
         return redirect('website:profil')
 
@@ -1419,6 +1463,10 @@ def tasiyici_panel(request):
     # Filtreler
     city_filter = request.GET.get('sehir', '').strip()
     cargo_type_filter = request.GET.get('yuk_tipi', '').strip()
+    sort = request.GET.get('sirala', 'yeni')
+    orderings = {value: ordering for value, _label, ordering in CARRIER_PANEL_SORTS}
+    if sort not in orderings:
+        sort = 'yeni'
 
     # Taşıyıcının hizmet verdiği bölgeler
     service_areas = []
@@ -1445,6 +1493,11 @@ def tasiyici_panel(request):
     if cargo_type_filter:
         shipments = shipments.filter(cargo_type=cargo_type_filter)
 
+    # Mesafe Shipment.distance_km'de saklanır; km başına bütçe sadece o sıralamada hesaplanır
+    if sort == 'km_fiyat':
+        shipments = distances.annotate_price_per_km(shipments)
+    shipments = shipments.order_by(*orderings[sort])
+
     # Pagination
     from django.core.paginator import Paginator
     paginator = Paginator(shipments, 20)  # 20 ilan per page
@@ -1460,6 +1513,8 @@ def tasiyici_panel(request):
         'cargo_types': Shipment.CARGO_TYPES,
         'city_filter': city_filter,
         'cargo_type_filter': cargo_type_filter,
+        'sort': sort,
+        'sort_options': [(value, label) for value, label, _ordering in CARRIER_PANEL_SORTS],
         'total_shipments': shipments.count(),
     }
     return render(request, 'website/tasiyici_panel.html', context)
@@ -0,0 +1,37 @@
+"""
+Webhook Views - Sanal POS ödeme bildirimleri
+"""
+import logging
+
+from django.http import Http404, HttpResponseBadRequest, HttpResponseForbidden
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .payment_providers import InvalidCallback, InvalidSignature, get_provider
+from .payment_webhooks import ingest
+
+logger = logging.getLogger(__name__)
+
+
+@csrf_exempt
+@require_POST
+def payment_webhook(request, provider):
+    """
+    Sağlayıcı bildirimi: imza doğrulanır, olay kaydedilip kuyruğa alınır.
+    Tekrar gelen olaylar da onaylanır ki sağlayıcı denemeyi bıraksın.
+    """
+    gateway = get_provider(provider)
+    if gateway is None:
+        raise Http404("Ödeme sağlayıcı bulunamadı")
+
+    try:
+        event = gateway.parse(request)
+    except InvalidSignature:
+        logger.warning(f'Payment webhook signature mismatch ({provider})')
+        return HttpResponseForbidden('Invalid signature')
+    except InvalidCallback as e:
+        logger.warning(f'Invalid payment webhook ({provider}): {e}')
+        return HttpResponseBadRequest(str(e))
+
+    ingest(gateway, event)
+    return gateway.acknowledge()